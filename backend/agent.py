@@ -20,13 +20,44 @@ except ImportError:
     def refine_with_evaluations(*args, **kwargs): return {}
 
 
-def run_agents(state, run_evals: bool = False, refine_outputs: bool = False):
+def prefetch_contexts(state):
+    """RAG contexts for the communication and confidence agents in one batched retrieval.
+
+    The personality prompt has no RAG context, so nothing is fetched for it.
+
+    Args:
+        state (dict): Pipeline state with `transcript` and `audio_features`.
+
+    Returns:
+        dict: {"communication": str, "confidence": str} to store as
+              `state["rag_contexts"]`; empty if RAG is unavailable
+              (each agent then retrieves its own context).
+    """
+    try:
+        from rag.retriever import get_retriever
+        features = state.get("audio_features", {})
+        return get_retriever().retrieve_many({
+            "communication": ("communication", features),
+            "confidence": ("confidence", features),
+        })
+    except Exception as e:
+        print(f"⚠️ RAG prefetch failed: {e}")
+        return {}
+
+
+def _run_directly(stage, fn, *args):
+    return fn(*args)
+
+
+def run_agents(state, run_evals: bool = False, refine_outputs: bool = False, run_stage=None):
     """Run communication, confidence, and personality agents in sequence.
 
     Args:
         state (dict): Pipeline output with `transcript` and `audio_features` keys.
         run_evals (bool): Whether to run LangChain evaluations on agent outputs.
         refine_outputs (bool): Whether to refine outputs based on evaluations.
+        run_stage (callable): Optional `run_stage(name, fn, *args)` hook used to
+              call each agent, e.g. `StageRunner.run` to reuse stored outputs.
 
     Returns:
         dict: Combined results with keys `communication_analysis`,
@@ -36,9 +67,10 @@ def run_agents(state, run_evals: bool = False, refine_outputs: bool = False):
     """
     try:
         evaluations = {} if run_evals and EVALS_AVAILABLE else None
+        run_stage = run_stage or _run_directly
         
         # Communication analysis (needs transcript + audio features)
-        comm_res = communication_agent(state)
+        comm_res = run_stage("communication", communication_agent, state)
         comm = comm_res.get("communication_analysis") if isinstance(comm_res, dict) else None
         
         if evaluations is not None and comm:
@@ -54,7 +86,7 @@ def run_agents(state, run_evals: bool = False, refine_outputs: bool = False):
             state_with_comm["communication_analysis"] = comm
 
         # Confidence & emotion analysis
-        conf_res = confidence_agent(state_with_comm)
+        conf_res = run_stage("confidence", confidence_agent, state_with_comm)
         conf = conf_res.get("confidence_emotion_analysis") if isinstance(conf_res, dict) else None
         
         if evaluations is not None and conf:
@@ -70,7 +102,7 @@ def run_agents(state, run_evals: bool = False, refine_outputs: bool = False):
             state_with_comm_conf["confidence_emotion_analysis"] = conf
 
         # Personality mapping
-        person_res = personality_agent(state_with_comm_conf)
+        person_res = run_stage("personality", personality_agent, state_with_comm_conf)
         person = person_res.get("personality_analysis") if isinstance(person_res, dict) else None
         
         if evaluations is not None and person:
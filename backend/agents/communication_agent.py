@@ -2,6 +2,7 @@ from llm_helper import llm
 from llm1.prompt_templates import COMMUNICATION_PROMPT
 from utils.parser import safe_parse
 from utils.feature_scoring import communication_score
+from rag.context_assembler import track_prompt
 
 try:
     from rag.retriever import get_retriever
@@ -16,6 +17,10 @@ except ImportError:
 
 
 def _get_communication_context(state):
+    # Prefetched for all agents in one batch by the pipeline (prefetch_contexts)
+    prefetched = state.get("rag_contexts", {}).get("communication")
+    if prefetched is not None:
+        return prefetched
     if not RAG_AVAILABLE:
         return ""
     try:
@@ -27,7 +32,9 @@ def _get_communication_context(state):
 
 
 def communication_agent(state):
-    transcript = state.get("transcript", "").strip()
+    # Long recordings pass a one-line-per-chunk digest instead, kept whole
+    digest = state.get("chunk_digest")
+    transcript = digest if digest else state.get("transcript", "").strip()[:500]
     f = state.get("audio_features", {})
 
     score = communication_score(f)
@@ -35,13 +42,14 @@ def communication_agent(state):
 
     prompt = COMMUNICATION_PROMPT.format(
         rag_context=f"EXPERT KNOWLEDGE:\n{rag_context}\n" if rag_context else "",
-        transcript=transcript[:500],
+        transcript=transcript,
         speech_rate=f.get("speech_rate"),
         pause_ratio=f.get("pause_ratio"),
         communication_score=score
     )
 
-    response = llm.invoke(prompt)
+    with track_prompt("communication_agent", prompt, rag_context):
+        response = llm.invoke(prompt)
     parsed = safe_parse(response)
     validated = validate_agent_response(parsed, "communication_agent")
 
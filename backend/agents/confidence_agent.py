@@ -2,6 +2,7 @@ from llm_helper import llm
 from llm1.prompt_templates import CONFIDENCE_PROMPT
 from utils.parser import safe_parse
 from utils.feature_scoring import confidence_score
+from rag.context_assembler import track_prompt
 
 try:
     from rag.retriever import get_retriever
@@ -16,6 +17,10 @@ except ImportError:
 
 
 def _get_confidence_context(state):
+    # Prefetched for all agents in one batch by the pipeline (prefetch_contexts)
+    prefetched = state.get("rag_contexts", {}).get("confidence")
+    if prefetched is not None:
+        return prefetched
     if not RAG_AVAILABLE:
         return ""
     try:
@@ -38,7 +43,8 @@ def confidence_agent(state):
         confidence_score=score
     )
 
-    response = llm.invoke(prompt)
+    with track_prompt("confidence_agent", prompt, rag_context):
+        response = llm.invoke(prompt)
     parsed = safe_parse(response)
     validated = validate_agent_response(parsed, "confidence_agent")
 
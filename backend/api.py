@@ -22,13 +22,215 @@ os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 # backend/api.py
 
+from typing import Literal, Optional
 from fastapi import UploadFile, File
 from record_audio import record_audio
 from link import run_pipeline
 
+def _upload_paths():
+    """Per-request upload and decoded WAV paths (concurrent requests don't collide)."""
+    request_id = uuid.uuid4().hex
+    return (os.path.join(UPLOAD_DIR, f"{request_id}.wav"),
+            os.path.join(UPLOAD_DIR, f"{request_id}.webm"))
+
+
+def _remove_files(*paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+# Sync handler: FastAPI runs it in its threadpool, so concurrent uploads are
+# processed side by side and show up in the Whisper tier policy's queue depth.
 @app.post("/analyze")
-async def analyze_audio(file: UploadFile = File(...)):
-    audio_path = record_audio(file)
-    result = run_pipeline(audio_path)
+def analyze_audio(
+    file: UploadFile = File(...),
+    latency_target: Optional[float] = None,
+    cascade: bool = False,
+    feature_backend: Optional[Literal["opensmile", "lite"]] = None,
+    timeline: bool = False,
+):
+    raw_path, temp_path = _upload_paths()
+    try:
+        audio_path = record_audio(file, raw_path=raw_path, temp_path=temp_path)
+        result = run_pipeline(
+            audio_path,
+            latency_target=latency_target,
+            cascade=cascade,
+            feature_backend=feature_backend,
+            timeline=timeline,
+        )
+    finally:
+        _remove_files(raw_path, temp_path)
     return result
 
+
+# ---------------------------
+# Streaming report
+# ---------------------------
+import json
+from fastapi.responses import StreamingResponse
+from fastapi.encoders import jsonable_encoder
+from rag.rag_pipeline import stream_rag_enhanced_report
+
+
+@app.post("/analyze/stream")
+def analyze_audio_stream(
+    file: UploadFile = File(...),
+    latency_target: Optional[float] = None,
+    cascade: bool = False,
+    feature_backend: Optional[Literal["opensmile", "lite"]] = None,
+):
+    """
+    Same analysis as /analyze, with the final report streamed as it is
+    generated (newline-delimited JSON). Each report sentence passes the
+    guardrails before it is sent.
+
+    Events: `analysis` (everything but the report), `report` chunks, `done`.
+    """
+    raw_path, temp_path = _upload_paths()
+    try:
+        audio_path = record_audio(file, raw_path=raw_path, temp_path=temp_path)
+        result = run_pipeline(
+            audio_path,
+            latency_target=latency_target,
+            cascade=cascade,
+            feature_backend=feature_backend,
+            stream_report=True,
+        )
+    finally:
+        # The report streams from the agent results; the audio is no longer needed
+        _remove_files(raw_path, temp_path)
+    final_report = result.pop("final_report", None)
+
+    def events():
+        yield json.dumps({"type": "analysis", "result": jsonable_encoder(result)}) + "\n"
+        # Insufficient / reduced / long audio already have their (short) report
+        chunks = (
+            [final_report] if final_report is not None
+            else stream_rag_enhanced_report(result["agent_results"])
+        )
+        for chunk in chunks:
+            yield json.dumps({"type": "report", "text": chunk}) + "\n"
+        yield json.dumps({"type": "done"}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+# ---------------------------
+# Reanalysis from stored artifacts
+# ---------------------------
+from typing import Annotated, List
+from pydantic import BaseModel, Field, StringConstraints
+from artifact_store import AUDIO_HASH_LENGTH, AUDIO_HASH_PATTERN
+from reanalyze import REANALYZE_MAX_HASHES, reanalyze_all
+
+AudioHash = Annotated[str, StringConstraints(
+    pattern=AUDIO_HASH_PATTERN, min_length=AUDIO_HASH_LENGTH, max_length=AUDIO_HASH_LENGTH
+)]
+
+
+class ReanalyzeRequest(BaseModel):
+    # Explicit sha256 hashes only; reanalyze everything with `python reanalyze.py`
+    audio_hashes: List[AudioHash] = Field(min_length=1, max_length=REANALYZE_MAX_HASHES)
+
+
+@app.post("/reanalyze")
+def reanalyze_audio(request: ReanalyzeRequest):
+    """Rerun agents + report over stored transcripts and features (no Whisper)."""
+    return reanalyze_all(request.audio_hashes)
+
+
+# ---------------------------
+# RAG knowledge hot reload
+# ---------------------------
+from rag.retriever import get_retriever, reload_retriever
+
+
+@app.post("/rag/reload")
+def reload_knowledge():
+    """Re-ingest rag/documents + the built-in knowledge and swap the index in place."""
+    return reload_retriever()
+
+
+@app.get("/rag/stats")
+def rag_stats():
+    """Query embedding cache hit rate and context table counters."""
+    return get_retriever().stats()
+
+
+# ---------------------------
+# Guardrails warm-up
+# ---------------------------
+from guardrails_config import get_guardrails
+
+
+@app.on_event("startup")
+def load_guardrails():
+    """Start loading the Guardrails Hub validators in the background."""
+    get_guardrails()
+
+
+@app.get("/guardrails/stats")
+def guardrails_stats():
+    """Per-validator latency and validation cache hit rate."""
+    return get_guardrails().stats()
+
+
+
+# ---------------------------
+# Live analysis (WebSocket)
+# ---------------------------
+import asyncio
+import json
+from fastapi import WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
+from live_analysis import LiveSession
+
+@app.websocket("/ws/live")
+async def live_analysis(websocket: WebSocket, format: str = "pcm16"):
+    """
+    Stream audio while speaking; receive transcripts and rolling metrics.
+
+    Client → server: binary frames of 16 kHz mono audio (`format` = pcm16,
+    float32 or opus), then a text frame `{"type": "stop"}`.
+    Server → client: `transcript` / `metrics` events, then a final `report`.
+    """
+    await websocket.accept()
+    try:
+        session = await asyncio.to_thread(LiveSession, format)
+    except ValueError as e:
+        await websocket.send_json({"type": "error", "error": str(e)})
+        await websocket.close()
+        return
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+
+            if message.get("bytes"):
+                events = await asyncio.to_thread(session.feed, message["bytes"])
+                for event in events:
+                    await websocket.send_json(event)
+            elif message.get("text"):
+                command = json.loads(message["text"])
+                if command.get("type") == "stop":
+                    break
+
+        for event in await asyncio.to_thread(session.stop):
+            await websocket.send_json(event)
+
+        await websocket.send_json({"type": "status", "status": "analyzing"})
+        report = await asyncio.to_thread(session.finish)
+        await websocket.send_json({"type": "report", "result": jsonable_encoder(report)})
+        await websocket.close()
+
+    except WebSocketDisconnect:
+        pass
+    finally:
+        # Any exit (disconnect, bad frame, pipeline error) removes the recording
+        session.close()
@@ -0,0 +1,217 @@
+# backend/artifact_store.py
+"""
+Versioned stage artifacts for the analysis pipeline.
+
+Every pipeline stage (decode, transcript, features, each agent, report)
+stores its output under the audio file's content hash, keyed by a chain
+hash of (previous stage key, stage name, stage config). Re-running a
+recording therefore reuses every stage up to the first one whose config
+changed (or whose upstream changed), and recomputes from there on.
+
+Layout:
+    artifacts/<audio_hash>/<stage>-<key>.json   one artifact
+    artifacts/<audio_hash>/index.jsonl          append-only history
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+
+ARTIFACT_DIR = os.environ.get(
+    "ARTIFACT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts")
+)
+ARTIFACTS_ENABLED = os.environ.get("ARTIFACTS_ENABLED", "1") != "0"
+ARTIFACT_FORMAT_VERSION = 1
+
+# Audio hashes are hash_file digests; anything else never reaches the filesystem.
+# `$` also matches before a trailing newline, so checks use fullmatch (and the
+# API bounds the length as well).
+AUDIO_HASH_LENGTH = 64
+AUDIO_HASH_PATTERN = r"^[0-9a-f]{64}$"
+_AUDIO_HASH = re.compile(AUDIO_HASH_PATTERN)
+
+
+# ---------------------------
+# Hashing
+# ---------------------------
+def hash_file(path, chunk_size=1 << 20):
+    """sha256 of a file's content, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _json_default(obj):
+    if hasattr(obj, "to_list"):
+        return obj.to_list()
+    if hasattr(obj, "item"):
+        return obj.item()
+    return str(obj)
+
+
+def config_hash(config):
+    """Short stable hash of any JSON-serializable config."""
+    payload = json.dumps(config, sort_keys=True, default=_json_default)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def file_fingerprint(*paths):
+    """
+    Hash of file contents (directories: every file inside, sorted), used to
+    version stages by their prompts, code or knowledge documents.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(
+                os.path.join(root, name)
+                for root, _, names in os.walk(path)
+                for name in names
+                if not name.endswith(".pyc")
+            )
+        else:
+            files = [path] if os.path.exists(path) else []
+        for name in files:
+            digest.update(os.path.relpath(name, os.path.dirname(path)).encode("utf-8"))
+            with open(name, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+# ---------------------------
+# Store
+# ---------------------------
+class ArtifactStore:
+    """JSON artifacts on disk, one directory per audio hash."""
+
+    def __init__(self, root=ARTIFACT_DIR):
+        self.root = root
+
+    def _dir(self, audio_hash):
+        if not isinstance(audio_hash, str) or not _AUDIO_HASH.fullmatch(audio_hash):
+            raise ValueError(f"Invalid audio hash: {audio_hash!r}")
+        return os.path.join(self.root, audio_hash)
+
+    def _path(self, audio_hash, stage, key):
+        return os.path.join(self._dir(audio_hash), f"{stage}-{key}.json")
+
+    def load(self, audio_hash, stage, key):
+        """Stored artifact dict, or None if this stage/key was never computed."""
+        path = self._path(audio_hash, stage, key)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            artifact = json.load(f)
+        if artifact.get("format") != ARTIFACT_FORMAT_VERSION:
+            return None
+        return artifact
+
+    def save(self, audio_hash, stage, key, parent, config, output):
+        os.makedirs(self._dir(audio_hash), exist_ok=True)
+        artifact = {
+            "format": ARTIFACT_FORMAT_VERSION,
+            "stage": stage,
+            "key": key,
+            "parent": parent,
+            "config": config,
+            "created": time.time(),
+            "output": output,
+        }
+        path = self._path(audio_hash, stage, key)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(artifact, f, default=_json_default)
+        os.replace(tmp, path)
+
+        with open(os.path.join(self._dir(audio_hash), "index.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "stage": stage, "key": key, "parent": parent, "created": artifact["created"]
+            }) + "\n")
+        return artifact
+
+    def history(self, audio_hash):
+        path = os.path.join(self._dir(audio_hash), "index.jsonl")
+        if not os.path.exists(path):
+            return []
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def latest(self, audio_hash, stage):
+        """Most recently written artifact of a stage, or None."""
+        for entry in reversed(self.history(audio_hash)):
+            if entry["stage"] == stage:
+                return self.load(audio_hash, stage, entry["key"])
+        return None
+
+    def audio_hashes(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if _AUDIO_HASH.fullmatch(name) and os.path.isdir(os.path.join(self.root, name))
+        )
+
+
+def _is_failure(output):
+    """True for {"status": "failed"} outputs, also one level down (agent results)."""
+    if not isinstance(output, dict):
+        return False
+    candidates = [output] + [v for v in output.values() if isinstance(v, dict)]
+    return any(c.get("status") in ("failed", "parse_failed") for c in candidates)
+
+
+class StageRunner:
+    """
+    Runs the stages of one recording against the store.
+
+    Usage:
+        runner = StageRunner(store, audio_hash, configs)
+        data = runner.run("transcript", transcribe_audio, audio_file)
+        agent_results = run_agents(state, run_stage=runner.run)
+
+    `configs` maps stage name → config dict; a stage's key also covers every
+    stage before it, so changing one config invalidates everything after it.
+    Failed outputs ({"status": "failed"}) are returned but never stored, and
+    nothing after a failed stage is loaded or stored either.
+    """
+
+    def __init__(self, store, audio_hash, configs=None, parent_key=None):
+        self.store = store
+        self.audio_hash = audio_hash
+        self.configs = configs or {}
+        self.key = parent_key or audio_hash
+        self.resumed = []
+        self.computed = []
+        self._failed = False
+
+    def run(self, stage, fn, *args, encode=None, decode=None):
+        config = self.configs.get(stage, {})
+        key = config_hash({"parent": self.key, "stage": stage, "config": config})
+        parent, self.key = self.key, key
+
+        use_store = self.store is not None and not self._failed
+        artifact = self.store.load(self.audio_hash, stage, key) if use_store else None
+        if artifact is not None:
+            self.resumed.append(stage)
+            output = artifact["output"]
+            return decode(output) if decode else output
+
+        result = fn(*args)
+        self.computed.append(stage)
+        if _is_failure(result):
+            self._failed = True
+        elif use_store:
+            self.store.save(self.audio_hash, stage, key, parent, config,
+                            encode(result) if encode else result)
+        return result
+
+    def summary(self):
+        return {
+            "audio_hash": self.audio_hash,
+            "resumed": self.resumed,
+            "computed": self.computed,
+        }
@@ -0,0 +1,218 @@
+# backend/audio_io.py
+"""
+Bounded-memory audio reading.
+
+AudioReader memory-maps PCM / float WAV files (no decode, the OS pages data
+in on demand) and falls back to block-wise decoding through soundfile for
+other formats. Formats libsndfile can't open (m4a, webm, ...) are decoded
+once by ffmpeg into a temporary 16-bit WAV, which is then memory-mapped. Stages ask for windows or iterate fixed-size blocks, so peak
+memory depends on the block size, not on the recording length.
+"""
+
+import os
+import struct
+import subprocess
+import tempfile
+
+import numpy as np
+import soundfile as sf
+
+SAMPLE_RATE = 16000
+BLOCK_SEC = 60          # Default block size for streaming stages
+
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+_PCM_DTYPES = {
+    (_WAVE_FORMAT_PCM, 16): ("<i2", 32768.0),
+    (_WAVE_FORMAT_PCM, 32): ("<i4", 2147483648.0),
+    (_WAVE_FORMAT_FLOAT, 32): ("<f4", 1.0),
+}
+
+
+def _wav_layout(path):
+    """
+    Parse RIFF/WAVE chunks and return (dtype, scale, channels, data_offset, frames),
+    or None when the file can't be memory-mapped (compressed, 24-bit, not WAV).
+    """
+    with open(path, "rb") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            return None
+
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                return None
+            chunk_id, size = struct.unpack("<4sI", chunk)
+
+            if chunk_id == b"fmt ":
+                body = f.read(size)
+                tag, channels, _, _, block_align, bits = struct.unpack("<HHIIHH", body[:16])
+                if tag == _WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                    tag = struct.unpack("<H", body[24:26])[0]
+                fmt = (tag, channels, block_align, bits)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    return None
+                tag, channels, block_align, bits = fmt
+                if (tag, bits) not in _PCM_DTYPES:
+                    return None
+                dtype, scale = _PCM_DTYPES[(tag, bits)]
+                return dtype, scale, channels, f.tell(), size // block_align
+            else:
+                f.seek(size + (size & 1), 1)
+
+
+def decode_to_wav(path, target_sr):
+    """Decode any ffmpeg-readable file to a temporary mono 16-bit WAV; returns its path."""
+    fd, wav_path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    try:
+        subprocess.run(
+            ["ffmpeg", "-nostdin", "-y", "-v", "error", "-i", path,
+             "-ac", "1", "-ar", str(target_sr), "-acodec", "pcm_s16le", wav_path],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        os.remove(wav_path)
+        detail = e.stderr.decode(errors="replace").strip() if getattr(e, "stderr", None) else e
+        raise RuntimeError(f"Cannot decode {path}: {detail}") from e
+    return wav_path
+
+
+class AudioReader:
+    """
+    Windowed access to an audio file.
+
+    Usage:
+        reader = AudioReader("talk.wav")
+        for offset, block in reader.blocks():
+            ...
+        window = reader.read(start_sample, stop_sample)
+
+    All returned audio is mono float32 at `target_sr` (16 kHz by default).
+    """
+
+    def __init__(self, path, target_sr=SAMPLE_RATE):
+        self.path = path
+        self.target_sr = target_sr
+
+        # File actually read: `path`, or its ffmpeg decode (removed on close)
+        self._source = path
+        self._decoded = None
+        try:
+            info = sf.info(path)
+        except RuntimeError:
+            # libsndfile can't open it (m4a, webm, ...): decode once with ffmpeg
+            self._decoded = self._source = decode_to_wav(path, target_sr)
+            info = sf.info(self._source)
+        self.native_sr = info.samplerate
+        self.channels = info.channels
+        self.native_frames = info.frames
+
+        self._mmap = None
+        self._scale = 1.0
+        layout = _wav_layout(self._source)
+        if layout is not None:
+            dtype, self._scale, channels, offset, frames = layout
+            self._mmap = np.memmap(self._source, dtype=dtype, mode="r", offset=offset,
+                                   shape=(frames, channels))
+            self.native_frames = frames
+
+    @property
+    def memory_mapped(self):
+        return self._mmap is not None
+
+    @property
+    def duration(self):
+        return self.native_frames / self.native_sr
+
+    @property
+    def frames(self):
+        """Length in samples at `target_sr`."""
+        return int(round(self.duration * self.target_sr))
+
+    def _to_mono_float(self, data):
+        data = np.asarray(data, dtype=np.float32)
+        if self._mmap is not None and self._scale != 1.0:
+            data = data / np.float32(self._scale)
+        if data.ndim == 2:
+            data = data.mean(axis=1) if data.shape[1] > 1 else data[:, 0]
+        return data
+
+    def _resample(self, data):
+        if self.native_sr == self.target_sr or len(data) == 0:
+            return data
+        import librosa
+        return librosa.resample(data, orig_sr=self.native_sr, target_sr=self.target_sr)
+
+    def _read_native(self, start, stop):
+        start = max(0, start)
+        stop = min(stop, self.native_frames)
+        if stop <= start:
+            return np.zeros(0, dtype=np.float32)
+        if self._mmap is not None:
+            # Copy the window out so nothing keeps a view into the mapping
+            return self._to_mono_float(np.array(self._mmap[start:stop]))
+        data, _ = sf.read(self._source, start=start, stop=stop, dtype="float32", always_2d=True)
+        return self._to_mono_float(data)
+
+    def read(self, start, stop):
+        """Samples [start, stop) at `target_sr`; only this window is materialized."""
+        ratio = self.native_sr / self.target_sr
+        return self._resample(self._read_native(int(start * ratio), int(stop * ratio)))
+
+    def read_seconds(self, start_sec, end_sec):
+        return self.read(int(start_sec * self.target_sr), int(end_sec * self.target_sr))
+
+    def blocks(self, block_sec=BLOCK_SEC):
+        """Yield (offset_in_target_samples, mono float32 block) pairs."""
+        native_block = int(block_sec * self.native_sr)
+        ratio = self.target_sr / self.native_sr
+        for native_start in range(0, self.native_frames, native_block):
+            block = self._resample(self._read_native(native_start, native_start + native_block))
+            yield int(round(native_start * ratio)), block
+
+    def close(self):
+        if self._mmap is not None:
+            mm = getattr(self._mmap, "_mmap", None)
+            self._mmap = None
+            if mm is not None:
+                mm.close()
+        if self._decoded is not None:
+            try:
+                os.remove(self._decoded)
+            except FileNotFoundError:
+                pass
+            self._decoded = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_blocks(source, block_sec=BLOCK_SEC, target_sr=SAMPLE_RATE):
+    """
+    Normalize a stage input to an iterator of mono float32 blocks.
+
+    `source` may be a path, an AudioReader, or any iterable of 1-D arrays
+    (or of (offset, array) pairs as produced by AudioReader.blocks()).
+    """
+    if isinstance(source, str):
+        with AudioReader(source, target_sr=target_sr) as reader:
+            for _, block in reader.blocks(block_sec):
+                yield block
+        return
+
+    if isinstance(source, AudioReader):
+        source = source.blocks(block_sec)
+
+    for item in source:
+        if isinstance(item, tuple):
+            item = item[1]
+        yield np.asarray(item, dtype=np.float32)
@@ -0,0 +1,148 @@
+# backend/audio_quality.py
+"""
+Cheap audio quality gate, run before any model.
+
+One block-wise NumPy pass over the decoded audio measures duration, RMS
+level, clipping and a rough energy-based speech fraction. The pipeline uses
+the verdict to stop early ("insufficient") or to skip the LLM stages
+("reduced") when the acoustic analysis would not be meaningful.
+"""
+
+import numpy as np
+
+from audio_io import AudioReader
+
+# ---------------------------
+# Configuration
+# ---------------------------
+MIN_DURATION_SEC = 1.0
+SILENCE_RMS = 1e-3               # ≈ -60 dBFS: treat as silence
+CLIP_LEVEL = 0.999               # |sample| at or above this counts as clipped
+CLIPPED_WARN_FRACTION = 0.01     # Flag, keep going
+CLIPPED_REDUCED_FRACTION = 0.10  # Acoustic features unreliable → reduced pipeline
+MIN_SPEECH_FRACTION = 0.05       # Below this there is nothing to analyze
+REDUCED_SPEECH_FRACTION = 0.15   # Too little speech for the LLM agents
+
+# Energy VAD: frame is "speech" when its RMS is well above the noise floor.
+# The threshold is capped at half the loud-frame level so continuous speech
+# with no quiet frames still counts (the gate should not reject real speech).
+VAD_FRAME_SEC = 0.03
+VAD_FLOOR_PERCENTILE = 10
+VAD_LOUD_PERCENTILE = 95
+VAD_FLOOR_RATIO = 3.0
+VAD_MIN_RMS = 0.005
+
+
+def _frame_rms(block, frame_len):
+    n = len(block) // frame_len
+    if n == 0:
+        return np.zeros(0)
+    frames = block[:n * frame_len].reshape(n, frame_len).astype(np.float64)
+    return np.sqrt(np.mean(np.square(frames), axis=1))
+
+
+def measure_audio(audio_file):
+    """
+    Duration, RMS, peak, clipping fraction and energy-VAD speech fraction.
+
+    Reads the file block by block; only per-frame RMS values (one float per
+    30 ms) are kept for the speech-fraction estimate.
+    """
+    sq_sum = 0.0
+    clipped = 0
+    peak = 0.0
+    total = 0
+    frame_rms = []
+
+    with AudioReader(audio_file) as reader:
+        sr = reader.target_sr
+        duration = reader.duration
+        frame_len = int(VAD_FRAME_SEC * sr)
+
+        for _, block in reader.blocks():
+            if len(block) == 0:
+                continue
+            mags = np.abs(block)
+            sq_sum += float(np.dot(block, block))
+            clipped += int(np.count_nonzero(mags >= CLIP_LEVEL))
+            peak = max(peak, float(mags.max()))
+            total += len(block)
+            frame_rms.append(_frame_rms(block, frame_len))
+
+    rms = float(np.sqrt(sq_sum / total)) if total else 0.0
+    frame_rms = np.concatenate(frame_rms) if frame_rms else np.zeros(0)
+
+    if len(frame_rms):
+        floor, loud = np.percentile(frame_rms, [VAD_FLOOR_PERCENTILE, VAD_LOUD_PERCENTILE])
+        threshold = max(VAD_MIN_RMS, min(floor * VAD_FLOOR_RATIO, 0.5 * loud))
+        speech_fraction = float(np.mean(frame_rms > threshold))
+    else:
+        speech_fraction = 0.0
+
+    return {
+        "duration": round(duration, 2),
+        "rms": round(rms, 5),
+        "rms_dbfs": round(20 * np.log10(rms), 1) if rms > 0 else None,
+        "peak": round(peak, 4),
+        "clipped_fraction": round(clipped / total, 4) if total else 0.0,
+        "speech_fraction": round(speech_fraction, 3),
+    }
+
+
+def assess_audio(audio_file):
+    """
+    Quality verdict for an upload.
+
+    Returns:
+        measure_audio() fields plus "status" ("ok", "reduced" or
+        "insufficient") and "issues": [{"code", "message"}, ...]
+    """
+    quality = measure_audio(audio_file)
+    issues = []
+    status = "ok"
+
+    def flag(code, message, level):
+        nonlocal status
+        issues.append({"code": code, "message": message})
+        order = ("ok", "reduced", "insufficient")
+        if order.index(level) > order.index(status):
+            status = level
+
+    if quality["duration"] < MIN_DURATION_SEC:
+        flag("too_short", f"Recording is {quality['duration']:.2f}s; at least {MIN_DURATION_SEC:.0f}s is needed.",
+             "insufficient")
+    if quality["rms"] < SILENCE_RMS:
+        flag("silent", "Recording is silent or nearly silent.", "insufficient")
+    elif quality["speech_fraction"] < MIN_SPEECH_FRACTION:
+        flag("no_speech", "No speech was detected in the recording.", "insufficient")
+    elif quality["speech_fraction"] < REDUCED_SPEECH_FRACTION:
+        flag("little_speech",
+             f"Only {quality['speech_fraction']:.0%} of the recording contains speech.", "reduced")
+
+    if quality["clipped_fraction"] >= CLIPPED_REDUCED_FRACTION:
+        flag("clipped", f"{quality['clipped_fraction']:.0%} of samples are clipped; "
+                        "lower the input gain and record again.", "reduced")
+    elif quality["clipped_fraction"] >= CLIPPED_WARN_FRACTION:
+        issues.append({
+            "code": "some_clipping",
+            "message": f"{quality['clipped_fraction']:.1%} of samples are clipped."
+        })
+
+    quality["status"] = status
+    quality["issues"] = issues
+    return quality
+
+
+def insufficient_audio_response(quality):
+    """Structured early response in the run_pipeline result shape."""
+    message = " ".join(issue["message"] for issue in quality["issues"])
+    return {
+        "status": "insufficient_audio",
+        "audio_quality": quality,
+        "transcript": "",
+        "speech_metrics": {},
+        "confidence_score": 0,
+        "confidence_label": "Insufficient Audio",
+        "agent_results": {},
+        "final_report": f"Analysis skipped: {message} Please record again.",
+    }
@@ -0,0 +1,340 @@
+# backend/batch_extract.py
+"""
+Bulk offline feature extraction for archives of recordings.
+
+Fans files out across a process pool (each worker loads Whisper, Silero and
+openSMILE once) and writes columnar shards:
+- recordings: one row per file (transcript, STT info, speech metrics)
+- words: one row per word (file path, word, start, end)
+
+Shards are Parquet when pyarrow is installed, NPZ otherwise. Every shard is
+recorded in checkpoint.jsonl after it is written, so an interrupted run
+resumes where it stopped; failed files go to failures.jsonl.
+
+Usage:
+    python batch_extract.py recordings/ --out features/
+    python batch_extract.py manifest.txt --out features/ --workers 4 --format npz
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# ---------------------------
+# Configuration
+# ---------------------------
+AUDIO_EXTENSIONS = (".wav", ".flac", ".mp3", ".m4a", ".ogg", ".webm")
+BATCH_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
+BATCH_TIER = "base"        # Whisper tier used inside workers
+SHARD_SIZE = 50            # Files per output shard (and per checkpoint)
+
+CHECKPOINT_FILE = "checkpoint.jsonl"
+FAILURES_FILE = "failures.jsonl"
+REPORT_FILE = "report.json"
+
+
+# ---------------------------
+# Inputs
+# ---------------------------
+def list_inputs(source):
+    """
+    Audio paths from a directory (recursive) or a manifest file.
+
+    Manifests are plain text (one path per line) or JSONL with a "path" key.
+    Relative manifest paths are resolved against the manifest's directory.
+    """
+    if os.path.isdir(source):
+        paths = []
+        for root, _, files in os.walk(source):
+            paths.extend(
+                os.path.join(root, f) for f in files
+                if f.lower().endswith(AUDIO_EXTENSIONS)
+            )
+        return sorted(paths)
+
+    base = os.path.dirname(os.path.abspath(source))
+    paths = []
+    with open(source, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            path = json.loads(line)["path"] if line.startswith("{") else line
+            paths.append(path if os.path.isabs(path) else os.path.join(base, path))
+    return paths
+
+
+# ---------------------------
+# Checkpointing
+# ---------------------------
+def _read_jsonl(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _append_jsonl(path, entries):
+    with open(path, "a", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+
+
+def load_checkpoint(out_dir):
+    """
+    Paths already extracted and the next shard number.
+
+    Shard files that are not referenced by the checkpoint (written right
+    before a crash) are removed so their rows are not duplicated.
+    """
+    entries = _read_jsonl(os.path.join(out_dir, CHECKPOINT_FILE))
+    done = {path for entry in entries for path in entry["paths"]}
+    shards = {name for entry in entries for name in entry["files"]}
+
+    for name in os.listdir(out_dir):
+        if name.startswith(("recordings-", "words-")) and name not in shards:
+            os.remove(os.path.join(out_dir, name))
+
+    return done, len(entries)
+
+
+# ---------------------------
+# Output shards
+# ---------------------------
+def _columns(rows):
+    """List of flat dicts → dict of columns (missing keys become None)."""
+    keys = []
+    for row in rows:
+        keys.extend(k for k in row if k not in keys)
+    return {k: [row.get(k) for row in rows] for k in keys}
+
+
+def write_shard(out_dir, index, records, fmt):
+    """Write one recordings shard and one words shard; return their file names."""
+    recordings = [r["record"] for r in records]
+    timings = [r["words"] for r in records]
+    words = {
+        "path": [r["record"]["path"] for r in records for _ in range(len(r["words"]))],
+        "word": [w for t in timings for w in t.words],
+        "start": np.concatenate([t.start for t in timings]) if timings else np.zeros(0, np.float32),
+        "end": np.concatenate([t.end for t in timings]) if timings else np.zeros(0, np.float32),
+    }
+
+    names = [f"recordings-{index:05d}.{fmt}", f"words-{index:05d}.{fmt}"]
+    if fmt == "parquet":
+        pq.write_table(pa.table(_columns(recordings)), os.path.join(out_dir, names[0]))
+        pq.write_table(pa.table(words), os.path.join(out_dir, names[1]))
+    else:
+        rec_cols = {}
+        for key, values in _columns(recordings).items():
+            if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+                rec_cols[key] = np.array(values, dtype=np.float64)
+            else:
+                rec_cols[key] = np.array(["" if v is None else str(v) for v in values])
+        np.savez_compressed(os.path.join(out_dir, names[0]), **rec_cols)
+        np.savez_compressed(
+            os.path.join(out_dir, names[1]),
+            path=np.array(words["path"]),
+            word=np.array(words["word"]),
+            start=words["start"],
+            end=words["end"],
+        )
+    return names
+
+
+# ---------------------------
+# Workers
+# ---------------------------
+def _init_worker(model_tier):
+    """Load Whisper, Silero and openSMILE once per worker process."""
+    import speech_features  # noqa: F401  (loads Silero + openSMILE at import)
+    from whisper_policy import get_whisper_model
+    get_whisper_model(model_tier)
+
+
+def extract_file(path, model_tier=BATCH_TIER, feature_backend=None):
+    """Transcribe and analyze one file; returns a flat record plus its words."""
+    import soundfile as sf
+    from audio_io import SAMPLE_RATE, decode_to_wav
+    from speech_to_text import transcribe_audio
+    from speech_features import analyze_speech
+
+    # m4a / webm (and anything else libsndfile can't open) are decoded to a
+    # temporary WAV first; the record keeps the original path
+    decoded = None
+    try:
+        sf.info(path)
+    except RuntimeError:
+        decoded = decode_to_wav(path, SAMPLE_RATE)
+
+    try:
+        audio_path = decoded or path
+        stt = transcribe_audio(audio_path, model_tier=model_tier)
+        results, score, label, _, _ = analyze_speech(
+            audio_path, stt["word_segments"], feature_backend=feature_backend
+        )
+    finally:
+        if decoded:
+            os.remove(decoded)
+
+    record = {
+        "path": path,
+        "transcript": stt["transcript"],
+        "model_tier": stt["stt"]["model_tier"],
+        "audio_duration": stt["stt"]["audio_duration"],
+        "transcription_time": stt["stt"]["transcription_time"],
+        "confidence_score": score,
+        "confidence_label": label,
+    }
+    record.update(results)
+    return {"record": record, "words": stt["word_segments"]}
+
+
+# ---------------------------
+# Driver
+# ---------------------------
+def run_batch(source, out_dir, workers=BATCH_WORKERS, model_tier=BATCH_TIER,
+              feature_backend=None, fmt=None, shard_size=SHARD_SIZE):
+    """
+    Extract every input not already in the checkpoint.
+
+    Returns:
+        Throughput / failure report (also written to report.json)
+    """
+    fmt = fmt or ("parquet" if PARQUET_AVAILABLE else "npz")
+    if fmt == "parquet" and not PARQUET_AVAILABLE:
+        raise RuntimeError("Parquet output needs pyarrow (pip install pyarrow) or use --format npz")
+
+    os.makedirs(out_dir, exist_ok=True)
+    paths = list_inputs(source)
+    done, shard_index = load_checkpoint(out_dir)
+    todo = [p for p in paths if p not in done]
+
+    print(f"📦 {len(paths)} files, {len(done)} already done, {len(todo)} to extract "
+          f"({workers} workers, {fmt})")
+
+    pending, failures = [], []
+    processed = 0
+    audio_sec = 0.0
+    started = time.perf_counter()
+
+    def flush():
+        nonlocal pending, shard_index
+        if not pending:
+            return
+        files = write_shard(out_dir, shard_index, pending, fmt)
+        _append_jsonl(os.path.join(out_dir, CHECKPOINT_FILE), [{
+            "shard": shard_index,
+            "files": files,
+            "paths": [r["record"]["path"] for r in pending],
+        }])
+        shard_index += 1
+        pending = []
+
+    ctx = multiprocessing.get_context("spawn")
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(model_tier,)
+        ) as pool:
+            futures = {
+                pool.submit(extract_file, path, model_tier, feature_backend): path
+                for path in todo
+            }
+            try:
+                for future in as_completed(futures):
+                    path = futures[future]
+                    processed += 1
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        failure = {
+                            "path": path,
+                            "error": f"{type(e).__name__}: {e}",
+                            "traceback": traceback.format_exc(),
+                        }
+                        failures.append(failure)
+                        _append_jsonl(os.path.join(out_dir, FAILURES_FILE), [failure])
+                        print(f"   ❌ {path}: {failure['error']}")
+                        continue
+
+                    pending.append(result)
+                    audio_sec += result["record"]["audio_duration"] or 0.0
+                    if len(pending) >= shard_size:
+                        flush()
+
+                    if processed % 10 == 0 or processed == len(todo):
+                        elapsed = time.perf_counter() - started
+                        print(f"   ✅ {processed}/{len(todo)} "
+                              f"({processed / elapsed:.2f} files/s, {audio_sec / elapsed:.1f}x realtime)")
+            except KeyboardInterrupt:
+                # Leaving the block would wait for every queued file: cancel
+                # them and write out what finished before re-raising
+                pool.shutdown(wait=False, cancel_futures=True)
+                flush()
+                raise
+    finally:
+        # Keep whatever finished, even if a shard write or the pool failed
+        flush()
+
+    elapsed = time.perf_counter() - started
+    report = {
+        "inputs": len(paths),
+        "skipped": len(done),
+        "processed": processed,
+        "succeeded": processed - len(failures),
+        "failed": len(failures),
+        "wall_time_sec": round(elapsed, 2),
+        "audio_sec": round(audio_sec, 2),
+        "files_per_sec": round(processed / elapsed, 3) if elapsed else None,
+        "realtime_factor": round(audio_sec / elapsed, 2) if elapsed else None,
+        "workers": workers,
+        "model_tier": model_tier,
+        "format": fmt,
+    }
+    with open(os.path.join(out_dir, REPORT_FILE), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch transcription + feature extraction")
+    parser.add_argument("source", help="Directory of recordings or manifest file")
+    parser.add_argument("--out", required=True, help="Output directory (shards + checkpoint)")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS)
+    parser.add_argument("--tier", default=BATCH_TIER, help="Whisper model tier")
+    parser.add_argument("--feature-backend", default=None, help="opensmile or lite")
+    parser.add_argument("--format", choices=("parquet", "npz"), default=None)
+    parser.add_argument("--shard-size", type=int, default=SHARD_SIZE)
+    args = parser.parse_args()
+
+    report = run_batch(
+        args.source,
+        args.out,
+        workers=args.workers,
+        model_tier=args.tier,
+        feature_backend=args.feature_backend,
+        fmt=args.format,
+        shard_size=args.shard_size,
+    )
+
+    print("\n📊 Batch summary")
+    for key, value in report.items():
+        print(f"   {key}: {value}")
+    if report["failed"]:
+        print(f"   ⚠️ See {os.path.join(args.out, FAILURES_FILE)}")
@@ -0,0 +1,123 @@
+# benchmarks/__init__.py
+"""
+Performance benchmarks for the speech analysis pipeline.
+
+Each module is a standalone script:
+    python -m benchmarks.<module_name>
+
+Results are written under `benchmarks/results/` as JSON so runs can be
+compared over time.
+"""
+
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(__file__)
+CORPUS_DIR = os.path.join(BENCH_DIR, "corpus")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+
+def load_corpus(corpus_dir=CORPUS_DIR):
+    """
+    List (audio_path, reference_text) pairs from the local corpus.
+
+    Layout: `corpus/<name>.wav` with an optional `corpus/<name>.txt`
+    holding the reference transcript.
+    """
+    if not os.path.isdir(corpus_dir):
+        return []
+
+    items = []
+    for name in sorted(os.listdir(corpus_dir)):
+        if not name.endswith(".wav"):
+            continue
+        audio_path = os.path.join(corpus_dir, name)
+        ref_path = os.path.splitext(audio_path)[0] + ".txt"
+        reference = None
+        if os.path.exists(ref_path):
+            with open(ref_path, encoding="utf-8") as f:
+                reference = f.read().strip()
+        items.append((audio_path, reference))
+    return items
+
+
+# Formants F1-F3 (Hz) and bandwidths for the synthetic vowels
+VOWEL_FORMANTS = {
+    "a": (730, 1090, 2440), "i": (270, 2290, 3010), "u": (300, 870, 2240),
+    "e": (530, 1840, 2480), "o": (570, 840, 2410),
+}
+FORMANT_BANDWIDTHS = (90, 110, 170)
+SYLLABLE_SEC = 0.2
+
+
+def synthetic_speech(seconds, amplitude=0.1, f0=130.0, pause_fraction=0.2, seed=0, sr=16000):
+    """
+    Deterministic speech-like signal for checks that need no corpus.
+
+    A harmonic source (1/k rolloff, drifting F0) through one vowel's formants
+    per syllable, a syllable envelope, pauses between three-syllable words
+    and noise bursts at some onsets. Scaled so the RMS while speaking is
+    `amplitude`.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(seconds * sr)
+    t = np.arange(n) / sr
+    f0_t = f0 * (1 + 0.12 * np.sin(2 * np.pi * 0.5 * t + rng.uniform(0, 2 * np.pi))
+                 - 0.05 * (t % 2.0) / 2.0)
+    phase = 2 * np.pi * np.cumsum(f0_t) / sr
+
+    syl = int(SYLLABLE_SEC * sr)
+    names = list(VOWEL_FORMANTS)
+    vowels = rng.integers(0, len(names), n // syl + 1)
+    formants = np.array([VOWEL_FORMANTS[names[v]] for v in vowels], dtype=np.float64)
+    formants = formants.repeat(syl, axis=0)[:n]
+
+    y = np.zeros(n)
+    for k in range(1, int(4000 / f0) + 1):
+        fk = k * f0_t
+        gain = 1.0 / k
+        for i, bw in enumerate(FORMANT_BANDWIDTHS):
+            F = formants[:, i]
+            gain = gain * F ** 2 / np.sqrt((F ** 2 - fk ** 2) ** 2 + (bw * fk) ** 2)
+        y += gain * np.sin(k * phase) * (fk < sr / 2 - 200)
+
+    env = np.sin(np.pi * (np.arange(n) % syl) / syl) ** 0.7
+    env *= (rng.random(n // (3 * syl) + 1) >= pause_fraction).repeat(3 * syl)[:n]
+    noise = np.diff(rng.standard_normal(n + 1)) * 0.05
+    onset = ((np.arange(n) % syl) < 0.04 * sr) * (rng.random(n // syl + 1) < 0.4).repeat(syl)[:n]
+    y = y * env + noise * onset * env.max()
+
+    y /= np.sqrt(np.mean(y[env > 0.1] ** 2)) + 1e-12
+    return (amplitude * y).astype(np.float32)
+
+
+def write_synthetic_corpus(out_dir, seconds=6.0, sr=16000):
+    """
+    Write a grid of synthetic_speech clips (8 levels x 3 voices) as WAVs and
+    return (audio_path, None) pairs like load_corpus.
+    """
+    import soundfile as sf
+
+    os.makedirs(out_dir, exist_ok=True)
+    items = []
+    voices = ((110, 0.1), (200, 0.3), (150, 0.2))
+    for i, amplitude in enumerate((0.01, 0.02, 0.04, 0.07, 0.1, 0.15, 0.2, 0.3)):
+        for j, (f0, pause_fraction) in enumerate(voices):
+            y = synthetic_speech(seconds, amplitude, f0, pause_fraction, seed=i * len(voices) + j, sr=sr)
+            path = os.path.join(out_dir, f"synthetic-{amplitude:.2f}-{f0}.wav")
+            sf.write(path, y, sr, subtype="FLOAT")
+            items.append((path, None))
+    return items
+
+
+def write_results(name, payload):
+    """Write a timestamped JSON result file and return its path."""
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(RESULTS_DIR, f"{name}-{stamp}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    return path
@@ -0,0 +1,106 @@
+# benchmarks/bench_bm25.py
+"""
+BM25 inverted index vs the old substring-scan keyword fallback.
+
+Run: python -m benchmarks.bench_bm25 [--sizes 1000 10000 100000] [--queries 50]
+
+Builds synthetic corpora (Zipf-distributed vocabulary, four categories) of
+increasing size and reports, per size, the BM25 build time and the
+p50/p99 query latency of both scorers, unfiltered and with a category
+filter. The substring scan grows with corpus size × text length; BM25 only
+touches the postings of the query terms.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks import write_results
+from rag.bm25 import KeywordIndex
+
+CATEGORIES = ("communication", "confidence", "personality", "improvement")
+VOCAB_SIZE = 20_000
+DOC_WORDS = 80
+QUERY_WORDS = 6
+
+
+def synthetic_corpus(n, seed=0):
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"term{i}" for i in range(VOCAB_SIZE)])
+    ranks = np.minimum(rng.zipf(1.3, size=(n, DOC_WORDS)), VOCAB_SIZE) - 1
+    return [
+        {"id": f"doc_{i}", "category": CATEGORIES[i % len(CATEGORIES)],
+         "content": " ".join(vocab[ranks[i]])}
+        for i in range(n)
+    ]
+
+
+def synthetic_queries(n, seed=1):
+    rng = np.random.default_rng(seed)
+    ranks = np.minimum(rng.zipf(1.3, size=(n, QUERY_WORDS)), VOCAB_SIZE) - 1
+    return [" ".join(f"term{r}" for r in row) for row in ranks]
+
+
+def _substring_retrieve(documents, query, top_k, category=None):
+    """The previous fallback: substring `in` over every document."""
+    if category:
+        documents = [d for d in documents if d["category"] == category]
+    words = query.lower().split()
+    scored = []
+    for doc in documents:
+        content = doc["content"].lower()
+        score = sum(1 for word in words if word in content)
+        if score > 0:
+            scored.append((score, doc))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return scored[:top_k]
+
+
+def _latency(fn, queries):
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        times.append(time.perf_counter() - start)
+    times = np.array(times) * 1000
+    return {"p50_ms": round(float(np.percentile(times, 50)), 4),
+            "p99_ms": round(float(np.percentile(times, 99)), 4)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    queries = synthetic_queries(args.queries)
+    report = {}
+    for size in args.sizes:
+        documents = synthetic_corpus(size)
+
+        start = time.perf_counter()
+        index = KeywordIndex(documents)
+        build_sec = time.perf_counter() - start
+
+        # The substring scan is slow on big corpora: time it on fewer queries
+        scan_queries = queries[:max(5, len(queries) // (size // 1_000 or 1))]
+        report[size] = {
+            "bm25_build_sec": round(build_sec, 3),
+            "bm25": _latency(lambda q: index.search(q, 3), queries),
+            "bm25_category": _latency(lambda q: index.search(q, 3, "confidence"), queries),
+            "substring": _latency(lambda q: _substring_retrieve(documents, q, 3), scan_queries),
+            "substring_category": _latency(
+                lambda q: _substring_retrieve(documents, q, 3, "confidence"), scan_queries),
+        }
+        r = report[size]
+        print(f"   {size:>8} docs | build {r['bm25_build_sec']:7.3f} s | "
+              f"bm25 p50 {r['bm25']['p50_ms']:8.3f} ms | "
+              f"substring p50 {r['substring']['p50_ms']:9.3f} ms")
+
+    path = write_results("bm25", report)
+    print(f"\n✅ Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
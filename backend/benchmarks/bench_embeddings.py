@@ -0,0 +1,105 @@
+# benchmarks/bench_embeddings.py
+"""
+Embedding backends: throughput, query latency and retrieval agreement.
+
+Run: python -m benchmarks.bench_embeddings [--backends onnx onnx-int8] [--docs 1000]
+     RAG_ONNX_THREADS=2 python -m benchmarks.bench_embeddings   # thread count
+
+For each installed backend (rag/embeddings.py) reports:
+    docs_per_sec    batched encoding of `--docs` knowledge chunks
+    query p50/p99   single-query encoding latency
+    recall@k        overlap of top-k documents with the fp32 reference
+                    backend, over every bucketed analysis query
+                    (rag/context_table.py), with the category filter
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks import write_results
+from rag.config import ONNX_THREADS, TOP_K_RESULTS
+from rag.context_table import build_query, key_space
+from rag.embeddings import BACKENDS, get_embedding_function
+from rag.knowledge_base import KnowledgeBase
+
+
+def _top_k(doc_vectors, categories, query_vector, category, k):
+    scores = doc_vectors @ query_vector
+    scores[categories != category] = -np.inf
+    return set(np.argsort(-scores)[:k].tolist())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS))
+    parser.add_argument("--reference", default="onnx",
+                        help="fp32 backend recall is measured against (falls back to chroma)")
+    parser.add_argument("--docs", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=TOP_K_RESULTS)
+    args = parser.parse_args()
+
+    documents = KnowledgeBase().get_all_documents()
+    texts = [d["content"] for d in documents]
+    categories = np.array([d["category"] for d in documents])
+    corpus = (texts * (args.docs // len(texts) + 1))[:args.docs]
+    queries = [(build_query(t, b), t) for t, b in key_space()]
+
+    reference = get_embedding_function(args.reference) or get_embedding_function("chroma")
+    if reference is None:
+        print("⚠️ No fp32 reference backend installed; recall@k is skipped")
+    else:
+        ref_docs = reference(texts)
+        ref_queries = reference([q for q, _ in queries])
+
+    report = {"onnx_threads": ONNX_THREADS, "docs": args.docs, "k": args.k,
+              "reference": reference.name if reference else None, "backends": {}}
+
+    for name in args.backends:
+        embed = get_embedding_function(name)
+        if embed is None or embed.name != name:
+            print(f"   {name:<22} not installed")
+            continue
+
+        embed(corpus[:8])  # warm up (session init, allocations)
+        start = time.perf_counter()
+        embed(corpus)
+        docs_per_sec = len(corpus) / (time.perf_counter() - start)
+
+        latencies = []
+        for query, _ in queries:
+            start = time.perf_counter()
+            embed([query])
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        result = {
+            "model": embed.model,
+            "docs_per_sec": round(docs_per_sec, 1),
+            "query_p50_ms": round(float(np.percentile(latencies, 50)), 3),
+            "query_p99_ms": round(float(np.percentile(latencies, 99)), 3),
+        }
+
+        if reference is not None:
+            doc_vectors = embed(texts)
+            query_vectors = embed([q for q, _ in queries])
+            hits = [
+                len(_top_k(doc_vectors, categories, qv, cat, args.k) &
+                    _top_k(ref_docs, categories, rv, cat, args.k))
+                / min(args.k, int((categories == cat).sum()))
+                for (_, cat), qv, rv in zip(queries, query_vectors, ref_queries)
+            ]
+            result[f"recall@{args.k}"] = round(float(np.mean(hits)), 4)
+            result["mean_cosine_to_reference"] = round(float((query_vectors * ref_queries).sum(1).mean()), 4)
+
+        report["backends"][name] = result
+        print(f"   {name:<22} {result['docs_per_sec']:9.1f} docs/s | "
+              f"query p50 {result['query_p50_ms']:7.3f} ms | "
+              f"recall@{args.k} {result.get(f'recall@{args.k}', float('nan')):.3f}")
+
+    path = write_results("embeddings", report)
+    print(f"\n✅ Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
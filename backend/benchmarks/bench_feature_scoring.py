@@ -0,0 +1,81 @@
+# benchmarks/bench_feature_scoring.py
+"""
+Batch vs scalar feature scoring.
+
+Run: python -m benchmarks.bench_feature_scoring [--rows 1000000]
+
+Scores synthetic feature rows with the vectorized `score_batch` path and
+with the per-dict scalar functions (timed on a sample and extrapolated),
+checks both agree, and reports rows/sec for each.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks import write_results
+from utils.feature_scoring import communication_score, confidence_score, score_batch
+
+ENERGY_LEVELS = np.array(["low", "medium", "medium-high", "high"])
+SCALAR_SAMPLE = 50_000
+
+
+def synthetic_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "speech_rate": rng.uniform(60, 220, n),
+        "pause_ratio": rng.uniform(0.0, 0.6, n),
+        "pitch_variance": rng.uniform(0, 60, n),
+        "energy_level": ENERGY_LEVELS[rng.integers(0, len(ENERGY_LEVELS), n)],
+    }
+
+
+def _time(fn, repeat=3):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    columns = synthetic_rows(args.rows)
+    print(f"🔬 Scoring {args.rows:,} rows")
+
+    report = {"rows": args.rows}
+    for model, scalar in (("communication", communication_score), ("confidence", confidence_score)):
+        batch_sec, batch = _time(lambda: score_batch(columns, model))
+
+        sample = min(SCALAR_SAMPLE, args.rows)
+        dicts = [
+            {key: values[i].item() for key, values in columns.items()}
+            for i in range(sample)
+        ]
+        scalar_sec, scalar_scores = _time(lambda: [scalar(f) for f in dicts], repeat=1)
+        scalar_total = scalar_sec * args.rows / sample
+
+        mismatches = int(np.sum(batch[:sample] != np.array(scalar_scores)))
+        report[model] = {
+            "batch_sec": round(batch_sec, 4),
+            "batch_rows_per_sec": round(args.rows / batch_sec),
+            "scalar_sec_extrapolated": round(scalar_total, 2),
+            "scalar_rows_per_sec": round(sample / scalar_sec),
+            "speedup": round(scalar_total / batch_sec, 1),
+            "mismatches_in_sample": mismatches,
+        }
+        print(f"   {model:<14} batch {batch_sec * 1000:8.1f} ms | scalar ~{scalar_total:6.1f} s "
+              f"| {scalar_total / batch_sec:6.0f}x | mismatches {mismatches}/{sample}")
+
+    path = write_results("feature_scoring", report)
+    print(f"\n✅ Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+# benchmarks/bench_lite_features.py
+"""
+Validate the lite NumPy feature backend against openSMILE and compare cost.
+
+Run: python -m benchmarks.bench_lite_features [--synthetic]
+
+For each corpus clip, computes the five functionals analyze_speech reads
+with both backends. Reports per-feature error and correlation, energy label
+agreement, a fitted `lite_features.LOUDNESS_GAIN` / `LOUDNESS_EXPONENT`,
+wall time and peak memory. Each backend runs in its own process so peak RSS
+is not shared between them. `--synthetic` runs on generated speech-like
+clips instead of benchmarks/corpus/.
+"""
+
+import argparse
+import multiprocessing
+import resource
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks import load_corpus, write_results, write_synthetic_corpus
+
+FEATURES = [
+    "loudness_sma3_amean",
+    "F0semitoneFrom27.5Hz_sma3nz_amean",
+    "F0semitoneFrom27.5Hz_sma3nz_stddevNorm",
+    "jitterLocal_sma3nz_amean",
+    "shimmerLocaldB_sma3nz_amean",
+]
+
+
+def _peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run_backend(backend, paths, out):
+    """Child process: extract features for every clip, report time and peak RSS."""
+    from audio_io import AudioReader
+
+    if backend == "opensmile":
+        import opensmile
+        smile = opensmile.Smile(
+            feature_set=opensmile.FeatureSet.eGeMAPSv02,
+            feature_level=opensmile.FeatureLevel.Functionals,
+        )
+
+        def extract(reader):
+            df = smile.process_signal(reader.read(0, reader.frames), reader.target_sr)
+            return {name: float(df[name].iloc[0]) for name in FEATURES}
+    else:
+        from lite_features import lite_functionals
+
+        def extract(reader):
+            return lite_functionals(reader)
+
+    baseline = _peak_rss_mb()
+    rows, elapsed = [], 0.0
+    for path in paths:
+        with AudioReader(path) as reader:
+            start = time.perf_counter()
+            rows.append(extract(reader))
+            elapsed += time.perf_counter() - start
+
+    out.put({
+        "rows": rows,
+        "seconds": elapsed,
+        "peak_rss_mb": _peak_rss_mb(),
+        "extra_rss_mb": _peak_rss_mb() - baseline,
+    })
+
+
+def run_isolated(backend, paths):
+    ctx = multiprocessing.get_context("spawn")
+    out = ctx.Queue()
+    proc = ctx.Process(target=_run_backend, args=(backend, paths, out))
+    proc.start()
+    result = out.get()
+    proc.join()
+    return result
+
+
+def compare(reference, candidate):
+    report = {}
+    for name in FEATURES:
+        ref = np.array([r[name] for r in reference])
+        cand = np.array([c[name] for c in candidate])
+        corr = float(np.corrcoef(ref, cand)[0, 1]) if len(ref) > 1 and ref.std() and cand.std() else None
+        report[name] = {
+            "mean_abs_error": round(float(np.mean(np.abs(ref - cand))), 4),
+            "mean_rel_error": round(float(np.mean(np.abs(ref - cand) / np.maximum(np.abs(ref), 1e-9))), 4),
+            "pearson_r": round(corr, 3) if corr is not None else None,
+        }
+    return report
+
+
+def energy_label_agreement(reference, candidate):
+    """Share of clips where both backends give the same map_energy_level label."""
+    from utils.feature_scoring import map_energy_level
+
+    same = [
+        map_energy_level(r["loudness_sma3_amean"]) == map_energy_level(c["loudness_sma3_amean"])
+        for r, c in zip(reference, candidate)
+    ]
+    return round(sum(same) / len(same), 3) if same else None
+
+
+def fitted_loudness_model(reference, paths, exponents=np.arange(0.40, 1.01, 0.05)):
+    """
+    Fit lite_features.LOUDNESS_GAIN and LOUDNESS_EXPONENT to openSMILE.
+
+    For each exponent, the gain is fitted in log space (mean log ratio), so
+    quiet and loud clips weigh the same; the exponent with the smallest
+    mean |log ratio| wins.
+    """
+    from audio_io import iter_blocks
+    from lite_features import frame_rms
+
+    ref = np.array([r["loudness_sma3_amean"] for r in reference])
+    clip_rms = [np.concatenate([frame_rms(block) for block in iter_blocks(path)]) for path in paths]
+
+    best = None
+    for exponent in exponents:
+        cand = np.array([np.mean(rms ** exponent) for rms in clip_rms])
+        usable = (ref > 0) & (cand > 0)
+        if not usable.any():
+            continue
+        log_ratio = np.log(ref[usable]) - np.log(cand[usable])
+        gain = float(np.exp(np.mean(log_ratio)))
+        error = float(np.mean(np.abs(log_ratio - np.log(gain))))
+        if best is None or error < best["mean_abs_log_ratio"]:
+            best = {
+                "gain": round(gain, 2),
+                "exponent": round(float(exponent), 2),
+                "mean_abs_log_ratio": round(error, 3),
+            }
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--synthetic", action="store_true",
+                        help="use generated speech-like clips instead of benchmarks/corpus/")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory() if args.synthetic else None
+    corpus = write_synthetic_corpus(tmp.name) if tmp else load_corpus()
+    if not corpus:
+        print("⚠️ No corpus found. Add <name>.wav files to benchmarks/corpus/ or pass --synthetic")
+        return
+    paths = [path for path, _ in corpus]
+
+    print(f"🔬 Comparing feature backends on {len(paths)} clips")
+    smile_res = run_isolated("opensmile", paths)
+    lite_res = run_isolated("lite", paths)
+
+    accuracy = compare(smile_res["rows"], lite_res["rows"])
+    speedup = smile_res["seconds"] / lite_res["seconds"] if lite_res["seconds"] else None
+
+    print("\n📊 Agreement with openSMILE")
+    for name, row in accuracy.items():
+        print(f"   {name:<42} MAE={row['mean_abs_error']:<8} rel={row['mean_rel_error']:<8} r={row['pearson_r']}")
+
+    print("\n⏱  Cost")
+    for label, res in (("opensmile", smile_res), ("lite", lite_res)):
+        print(f"   {label:<10} {res['seconds']:.2f}s  peak RSS {res['peak_rss_mb']:.0f} MB "
+              f"(+{res['extra_rss_mb']:.0f} MB while extracting)")
+    if speedup:
+        print(f"   speedup: {speedup:.1f}x")
+
+    agreement = energy_label_agreement(smile_res["rows"], lite_res["rows"])
+    print(f"\n🏷  Energy label agreement: {agreement:.1%}")
+
+    model = fitted_loudness_model(smile_res["rows"], paths)
+    if tmp:
+        tmp.cleanup()
+    if model:
+        print(f"🎚  Suggested lite_features.LOUDNESS_GAIN = {model['gain']}, "
+              f"LOUDNESS_EXPONENT = {model['exponent']} "
+              f"(mean |log ratio| {model['mean_abs_log_ratio']})")
+
+    path = write_results("lite_features", {
+        "clips": len(paths),
+        "synthetic": args.synthetic,
+        "accuracy": accuracy,
+        "energy_label_agreement": agreement,
+        "opensmile": {k: v for k, v in smile_res.items() if k != "rows"},
+        "lite": {k: v for k, v in lite_res.items() if k != "rows"},
+        "speedup": round(speedup, 2) if speedup else None,
+        "suggested_loudness_model": model,
+    })
+    print(f"\n✅ Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
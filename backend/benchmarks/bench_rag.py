@@ -0,0 +1,290 @@
+# benchmarks/bench_rag.py
+"""
+Retrieval quality and latency of every RAG backend.
+
+Run: python -m benchmarks.bench_rag [--backends numpy bm25 ...] [--k 3] [--repeat 3]
+
+Runs a labelled query set (one query per bucket combination of every
+get_context_for_analysis analysis type, rag/context_table.py) with the
+same category filter the retriever uses, against:
+    chroma-memory      in-memory ChromaDB client (the original setup)
+    chroma-persistent  PersistentClient, built then reopened from disk
+    numpy              NumpyVectorIndex (memory-mapped)
+    bm25               KeywordIndex (the fallback retriever)
+    hybrid             numpy + bm25 fused with reciprocal rank fusion
+
+Each backend runs in a fresh process against a temporary index, so the
+real indexes are untouched and memory is measured in isolation. Reports
+recall@k, MRR, p50/p99 query latency, index build time and resident
+memory, and writes them as JSON under benchmarks/results/ (or --out).
+
+Relevance labels come from `relevant_ids`; markdown chunks are labelled by
+file ("md:<stem>"), since their ids change with their content.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks import write_results
+from rag.config import TOP_K_RESULTS
+from rag.context_table import build_query, key_space
+
+BACKENDS = ("chroma-memory", "chroma-persistent", "numpy", "bm25", "hybrid")
+
+
+# ---------------------------
+# Labelled queries
+# ---------------------------
+def relevant_ids(analysis_type, buckets):
+    """Documents an analysis query should retrieve, from its buckets."""
+    b = dict(buckets)
+    relevant = set()
+
+    if analysis_type == "communication":
+        if b["rate"]:
+            relevant |= {"comm_001", "md:communication_rules"}
+        if b["pause"] == "high":
+            relevant |= {"comm_002"}
+        elif b["pause"] == "low":
+            relevant |= {"comm_002", "md:communication_rules"}
+        if b["transcript"]:
+            relevant |= {"comm_003"}
+        relevant = relevant or {"comm_002", "comm_003"}
+
+    elif analysis_type == "confidence":
+        if b["energy"]:
+            relevant |= {"conf_003"}
+        if b["pitch"]:
+            relevant |= {"conf_001"}
+        if b["pitch"] == "normal" or b["energy"] in ("medium", "medium-high"):
+            relevant |= {"md:confidence_psychology"}
+        if b["pause"]:
+            relevant |= {"conf_002"}
+        relevant = relevant or {"conf_001"}
+
+    elif analysis_type == "personality":
+        if b["fluency"]:
+            relevant |= {"pers_003"}
+        if b["confidence"]:
+            relevant |= {"pers_002"}
+        relevant = relevant or {"pers_001", "md:personality_traits"}
+
+    elif analysis_type == "improvement":
+        areas = set(b["areas"])
+        if areas & {"clarity", "speech structure", "fluency"}:
+            relevant |= {"improve_003"}
+        if "fluency" in areas:
+            relevant |= {"improve_001"}
+        if areas & {"confidence", "nervousness reduction", "assertiveness"}:
+            relevant |= {"improve_002"}
+        relevant = relevant or {"improve_002", "improve_003"}
+
+    return relevant
+
+
+def labelled_queries():
+    return [
+        {"query": build_query(t, b), "category": t, "relevant": sorted(relevant_ids(t, b))}
+        for t, b in key_space()
+    ]
+
+
+def _matches(doc_id, label):
+    return doc_id == label or doc_id.startswith(label + ":")
+
+
+def score_ranking(ranked_ids, relevant, k):
+    """(recall@k, reciprocal rank) of one ranked id list."""
+    found = {label for label in relevant for doc_id in ranked_ids[:k] if _matches(doc_id, label)}
+    rank = next(
+        (i for i, doc_id in enumerate(ranked_ids, 1) if any(_matches(doc_id, l) for l in relevant)),
+        None
+    )
+    return len(found) / len(relevant), (1.0 / rank if rank else 0.0)
+
+
+# ---------------------------
+# Backends (each returns build_sec and a search(query, category, k) → ids)
+# ---------------------------
+def _numpy_backend(documents, workdir):
+    from rag.embeddings import get_embedding_function
+    from rag.ingest import embed_documents
+    from rag.vector_index import NumpyVectorIndex
+
+    embed = get_embedding_function()
+    if embed is None:
+        raise ImportError("no embedding backend installed")
+    start = time.perf_counter()
+    NumpyVectorIndex.write(embed_documents(documents, embed), documents, {}, embed.model, path=workdir)
+    index = NumpyVectorIndex.load(workdir)
+    build_sec = time.perf_counter() - start
+
+    def search(query, category, k):
+        return [index.ids[row] for row, _ in index.search(embed([query])[0], k, category)]
+    return build_sec, search
+
+
+def _bm25_backend(documents, workdir):
+    from rag.bm25 import KeywordIndex
+
+    start = time.perf_counter()
+    index = KeywordIndex(documents)
+    build_sec = time.perf_counter() - start
+
+    def search(query, category, k):
+        return [doc["id"] for doc, _ in index.search(query, k, category)]
+    return build_sec, search
+
+
+def _hybrid_backend(documents, workdir):
+    from rag.bm25 import reciprocal_rank_fusion
+    from rag.config import HYBRID_CANDIDATES
+
+    vector_sec, vector_search = _numpy_backend(documents, workdir)
+    keyword_sec, keyword_search = _bm25_backend(documents, workdir)
+
+    def search(query, category, k):
+        n = max(k, HYBRID_CANDIDATES)
+        fused = reciprocal_rank_fusion([vector_search(query, category, n),
+                                        keyword_search(query, category, n)])
+        return fused[:k]
+    return vector_sec + keyword_sec, search
+
+
+def _chroma_backend(documents, workdir, persistent):
+    import chromadb
+
+    start = time.perf_counter()
+    client = chromadb.PersistentClient(path=workdir) if persistent else chromadb.Client()
+    collection = client.get_or_create_collection(name="bench")
+    collection.add(
+        ids=[d["id"] for d in documents],
+        documents=[d["content"] for d in documents],
+        metadatas=[{"category": d["category"]} for d in documents],
+    )
+    if persistent:
+        collection = chromadb.PersistentClient(path=workdir).get_collection(name="bench")
+    build_sec = time.perf_counter() - start
+
+    def search(query, category, k):
+        results = collection.query(query_texts=[query], n_results=k, where={"category": category})
+        return results["ids"][0]
+    return build_sec, search
+
+
+SETUPS = {
+    "chroma-memory": lambda docs, d: _chroma_backend(docs, d, persistent=False),
+    "chroma-persistent": lambda docs, d: _chroma_backend(docs, d, persistent=True),
+    "numpy": _numpy_backend,
+    "bm25": _bm25_backend,
+    "hybrid": _hybrid_backend,
+}
+
+
+# ---------------------------
+# Runner
+# ---------------------------
+def _rss_mb():
+    """Current resident memory (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if platform.system() == "Darwin" else peak / 1024
+
+
+def _run_backend(name, queries, k, repeat, out):
+    try:
+        from rag.knowledge_base import KnowledgeBase
+        documents = KnowledgeBase().get_all_documents()
+
+        with tempfile.TemporaryDirectory() as workdir:
+            rss_before = _rss_mb()
+            build_sec, search = SETUPS[name](documents, workdir)
+            rss_after = _rss_mb()
+
+            search(queries[0]["query"], queries[0]["category"], k)  # warm up
+            recalls, reciprocal_ranks, latencies = [], [], []
+            for _ in range(repeat):
+                for q in queries:
+                    start = time.perf_counter()
+                    ranked = search(q["query"], q["category"], k)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    recall, rr = score_ranking(ranked, q["relevant"], k)
+                    recalls.append(recall)
+                    reciprocal_ranks.append(rr)
+
+        out.put({
+            f"recall@{k}": round(float(np.mean(recalls)), 4),
+            "mrr": round(float(np.mean(reciprocal_ranks)), 4),
+            "p50_ms": round(float(np.percentile(latencies, 50)), 4),
+            "p99_ms": round(float(np.percentile(latencies, 99)), 4),
+            "build_sec": round(build_sec, 4),
+            "index_memory_mb": round(rss_after - rss_before, 2),
+            "process_memory_mb": round(_rss_mb(), 2),
+            "documents": len(documents),
+        })
+    except Exception as e:
+        out.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def _run(name, queries, k, repeat):
+    ctx = multiprocessing.get_context("spawn")
+    out = ctx.Queue()
+    proc = ctx.Process(target=_run_backend, args=(name, queries, k, repeat, out))
+    proc.start()
+    result = out.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--k", type=int, default=TOP_K_RESULTS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="Also write the JSON report to this path")
+    args = parser.parse_args()
+
+    queries = labelled_queries()
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "k": args.k,
+        "queries": len(queries),
+        "query_types": sorted({q["category"] for q in queries}),
+        "embedding_backend": os.environ.get("RAG_EMBEDDING_BACKEND") or "auto",
+        "backends": {},
+    }
+
+    for name in args.backends:
+        result = _run(name, queries, args.k, args.repeat)
+        report["backends"][name] = result
+        if "error" in result:
+            print(f"   {name:<18} skipped ({result['error']})")
+            continue
+        print(f"   {name:<18} recall@{args.k} {result[f'recall@{args.k}']:.3f} | "
+              f"MRR {result['mrr']:.3f} | p50 {result['p50_ms']:8.3f} ms | "
+              f"p99 {result['p99_ms']:8.3f} ms | build {result['build_sec']:7.3f} s | "
+              f"+{result['index_memory_mb']:.1f} MB")
+
+    path = write_results("rag", report)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(f"\n✅ Results written to {args.out or path}")
+
+
+if __name__ == "__main__":
+    main()
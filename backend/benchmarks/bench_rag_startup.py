@@ -0,0 +1,85 @@
+# benchmarks/bench_rag_startup.py
+"""
+Cold start of the RAG retriever.
+
+Run: python -m benchmarks.bench_rag_startup [--runs 3]
+
+Each run starts a fresh process and times RAGRetriever() construction and
+the first query, first against the persistent runtime index (VECTOR_BACKEND,
+built once up front), then with the old behaviour of embedding every document into an
+in-memory client.
+"""
+
+import argparse
+import multiprocessing
+import time
+
+from benchmarks import write_results
+
+QUERY = "speech rate confidence pitch"
+
+
+def _persistent(out):
+    started = time.perf_counter()
+    from rag.retriever import RAGRetriever
+    retriever = RAGRetriever()
+    ready = time.perf_counter()
+    retriever.retrieve(QUERY)
+    out.put({"startup_sec": ready - started, "first_query_sec": time.perf_counter() - ready})
+
+
+def _in_memory(out):
+    started = time.perf_counter()
+    import chromadb
+    from rag.config import COLLECTION_NAME
+    from rag.knowledge_base import KnowledgeBase
+
+    docs = KnowledgeBase().get_all_documents()
+    collection = chromadb.Client().get_or_create_collection(name=COLLECTION_NAME)
+    collection.add(
+        ids=[d["id"] for d in docs],
+        documents=[d["content"] for d in docs],
+        metadatas=[{"category": d["category"]} for d in docs],
+    )
+    ready = time.perf_counter()
+    collection.query(query_texts=[QUERY], n_results=3)
+    out.put({"startup_sec": ready - started, "first_query_sec": time.perf_counter() - ready})
+
+
+def _run(target):
+    ctx = multiprocessing.get_context("spawn")
+    out = ctx.Queue()
+    proc = ctx.Process(target=target, args=(out,))
+    proc.start()
+    result = out.get()
+    proc.join()
+    return result
+
+
+def _summary(runs):
+    return {
+        key: round(sorted(r[key] for r in runs)[len(runs) // 2], 4)
+        for key in ("startup_sec", "first_query_sec")
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    from rag.build_index import build_runtime_index
+    build_runtime_index()
+
+    report = {}
+    for name, target in (("persistent", _persistent), ("in_memory", _in_memory)):
+        report[name] = _summary([_run(target) for _ in range(args.runs)])
+        print(f"   {name:<11} startup {report[name]['startup_sec'] * 1000:8.1f} ms | "
+              f"first query {report[name]['first_query_sec'] * 1000:8.1f} ms")
+
+    path = write_results("rag_startup", report)
+    print(f"\n✅ Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/bench_vector_index.py
+"""
+Query latency: in-process NumPy index vs ChromaDB.
+
+Run: python -m benchmarks.bench_vector_index [--repeat 20]
+
+Builds both indexes, then runs every bucketed analysis query
+(rag/context_table.py) with its category filter and reports p50/p99 for:
+    numpy_search   NumpyVectorIndex.search on a precomputed query vector
+    numpy_query    query embedding + search (RAGRetriever numpy path)
+    chroma_query   collection.query(query_texts=..., where=...)
+and how often both return the same top-k ids.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks import write_results
+from rag.config import CHROMA_PERSIST_DIR, COLLECTION_NAME, TOP_K_RESULTS
+from rag.context_table import build_query, key_space
+
+
+def _queries():
+    return [(build_query(analysis_type, b), analysis_type) for analysis_type, b in key_space()]
+
+
+def _latencies(fn, items, repeat):
+    times = []
+    for _ in range(repeat):
+        for item in items:
+            start = time.perf_counter()
+            fn(item)
+            times.append(time.perf_counter() - start)
+    times = np.array(times) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(times, 50)), 4),
+        "p99_ms": round(float(np.percentile(times, 99)), 4),
+        "queries": len(times),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    from rag.build_index import build_chroma_index, build_numpy_index
+    from rag.embeddings import get_embedding_function
+    from rag.vector_index import NumpyVectorIndex
+
+    build_numpy_index()
+    index = NumpyVectorIndex.load()
+    embed = get_embedding_function()
+    queries = _queries()
+    vectors = embed([q for q, _ in queries])
+    searches = list(zip(vectors, (c for _, c in queries)))
+
+    report = {
+        "documents": len(index),
+        "numpy_search": _latencies(
+            lambda item: index.search(item[0], TOP_K_RESULTS, item[1]), searches, args.repeat),
+        "numpy_query": _latencies(
+            lambda item: index.search(embed([item[0]])[0], TOP_K_RESULTS, item[1]),
+            queries, max(1, args.repeat // 10)),
+    }
+
+    try:
+        import chromadb
+    except ImportError:
+        chromadb = None
+        print("⚠️ ChromaDB not installed, skipping the Chroma comparison")
+
+    if chromadb is not None:
+        build_chroma_index()
+        collection = chromadb.PersistentClient(path=CHROMA_PERSIST_DIR).get_collection(COLLECTION_NAME)
+
+        def chroma(item):
+            return collection.query(query_texts=[item[0]], n_results=TOP_K_RESULTS,
+                                    where={"category": item[1]})
+
+        report["chroma_query"] = _latencies(chroma, queries, max(1, args.repeat // 10))
+
+        same = 0
+        for (query, category), vector in zip(queries, vectors):
+            ours = [index.ids[row] for row, _ in index.search(vector, TOP_K_RESULTS, category)]
+            same += ours == chroma((query, category))["ids"][0]
+        report["same_top_k"] = round(same / len(queries), 4)
+
+    for name in ("numpy_search", "numpy_query", "chroma_query"):
+        if name in report:
+            print(f"   {name:<13} p50 {report[name]['p50_ms']:8.4f} ms | "
+                  f"p99 {report[name]['p99_ms']:8.4f} ms")
+    if "same_top_k" in report:
+        print(f"   identical top-{TOP_K_RESULTS}: {report['same_top_k']:.1%}")
+
+    path = write_results("vector_index", report)
+    print(f"\n✅ Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# benchmarks/bench_whisper_tiers.py
+"""
+Quality / latency tradeoff of the Whisper tiers on the local corpus.
+
+Run: python -m benchmarks.bench_whisper_tiers [--tiers tiny base small medium]
+
+For every tier, transcribes each corpus clip, measures wall time and
+real-time factor (RTF), and computes word error rate (WER) against the
+reference transcript when one is present. Writes JSON results and a chart
+(PNG if matplotlib is installed, otherwise a text chart on stdout).
+The measured RTFs are what `whisper_policy.TIER_RTF` should be tuned to.
+"""
+
+import argparse
+import os
+import re
+import time
+
+from benchmarks import load_corpus, write_results, RESULTS_DIR
+from whisper_policy import WHISPER_TIERS, audio_duration, get_whisper_model
+
+
+def _words(text):
+    return re.findall(r"[a-z0-9']+", text.lower())
+
+
+def word_error_rate(reference, hypothesis):
+    """Levenshtein distance over words, normalised by reference length."""
+    ref, hyp = _words(reference), _words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, 1):
+            cur[j] = min(
+                prev[j] + 1,
+                cur[j - 1] + 1,
+                prev[j - 1] + (r != h),
+            )
+        prev = cur
+    return prev[-1] / len(ref)
+
+
+def bench_tier(tier, corpus):
+    load_start = time.perf_counter()
+    model = get_whisper_model(tier)
+    load_time = time.perf_counter() - load_start
+
+    total_audio, total_time, wers = 0.0, 0.0, []
+    for audio_path, reference in corpus:
+        duration = audio_duration(audio_path)
+        start = time.perf_counter()
+        segments, _ = model.transcribe(audio_path, language="en")
+        text = " ".join(seg.text for seg in segments)
+        elapsed = time.perf_counter() - start
+
+        total_audio += duration
+        total_time += elapsed
+        if reference:
+            wers.append(word_error_rate(reference, text))
+
+    return {
+        "tier": tier,
+        "load_time": round(load_time, 2),
+        "audio_sec": round(total_audio, 2),
+        "wall_sec": round(total_time, 2),
+        "rtf": round(total_time / total_audio, 4) if total_audio else None,
+        "wer": round(sum(wers) / len(wers), 4) if wers else None,
+    }
+
+
+def plot(rows, out_path):
+    """Scatter WER against RTF per tier."""
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("\nRTF (lower is faster)")
+        scale = max((r["rtf"] or 0) for r in rows) or 1
+        for r in rows:
+            bar = "█" * int(40 * (r["rtf"] or 0) / scale)
+            print(f"  {r['tier']:>6} {bar} {r['rtf']}  WER={r['wer']}")
+        return None
+
+    fig, ax = plt.subplots(figsize=(6, 4))
+    for r in rows:
+        if r["rtf"] is None or r["wer"] is None:
+            continue
+        ax.scatter(r["rtf"], r["wer"])
+        ax.annotate(r["tier"], (r["rtf"], r["wer"]))
+    ax.set_xlabel("Real-time factor (lower is faster)")
+    ax.set_ylabel("Word error rate")
+    ax.set_title("Whisper tier quality / latency")
+    fig.tight_layout()
+    fig.savefig(out_path)
+    return out_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tiers", nargs="+", default=WHISPER_TIERS, choices=WHISPER_TIERS)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    if not corpus:
+        print("⚠️ No corpus found. Add <name>.wav (+ <name>.txt) files to benchmarks/corpus/")
+        return
+
+    print(f"🎧 Benchmarking {len(args.tiers)} tiers on {len(corpus)} clips")
+    rows = []
+    for tier in args.tiers:
+        row = bench_tier(tier, corpus)
+        print(f"   {tier:>6}: RTF={row['rtf']}  WER={row['wer']}  load={row['load_time']}s")
+        rows.append(row)
+
+    path = write_results("whisper_tiers", {"clips": len(corpus), "tiers": rows})
+    print(f"\n✅ Results written to {path}")
+
+    chart = plot(rows, os.path.join(RESULTS_DIR, "whisper_tiers.png"))
+    if chart:
+        print(f"📈 Chart saved to {chart}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+# backend/feature_timeline.py
+"""
+Frame-level feature timelines.
+
+analyze_speech reports whole-clip scalars; this module keeps the time axis
+so the frontend can show where the speaker rushed, paused or went flat:
+- pitch and loudness from frame-level LLDs (openSMILE LowLevelDescriptors
+  or lite_features.extract_lld), binned into fixed windows with bincount
+- WPM from word timestamps, smoothed over a sliding window
+- pause density from Silero VAD speech segments
+
+Every series is then downsampled with LTTB (Largest-Triangle-Three-Buckets)
+to TIMELINE_POINTS, so the payload is the same size for 30 s or 2 h.
+"""
+
+import numpy as np
+
+from audio_io import AudioReader
+from lite_features import HOP_SEC, extract_lld
+from word_timings import WordTimings
+
+# ---------------------------
+# Configuration
+# ---------------------------
+TIMELINE_RESOLUTION_SEC = 1.0    # Window size before downsampling
+TIMELINE_POINTS = 200            # Point budget per series in the response
+WPM_SMOOTHING_SEC = 10           # Sliding window for the speaking-rate curve
+PAUSE_SMOOTHING_SEC = 5          # Sliding window for the pause-density curve
+
+
+# ---------------------------
+# Downsampling
+# ---------------------------
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points and, from each of `n_out - 2` buckets,
+    the point forming the largest triangle with the previously kept point
+    and the mean of the next bucket. Non-finite values are dropped first.
+
+    Returns:
+        Tuple of (x, y) arrays with at most `n_out` points
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    finite = np.isfinite(y)
+    x, y = x[finite], y[finite]
+
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    kept = np.empty(n_out, dtype=int)
+    kept[0], kept[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+
+    return x[kept], y[kept]
+
+
+def _moving_average(values, width):
+    width = max(1, int(width))
+    if width == 1 or len(values) == 0:
+        return values
+    kernel = np.ones(width)
+    # Normalize by the in-range count so the edges are not pulled to zero
+    counts = np.convolve(np.ones(len(values)), kernel, mode="same")
+    return np.convolve(values, kernel, mode="same") / counts
+
+
+# ---------------------------
+# Frame-level descriptors
+# ---------------------------
+def _block_llds(reader, feature_backend):
+    """Yield (time_sec, loudness, f0_semitone) frame arrays for each block."""
+    sr = reader.target_sr
+    for offset, block in reader.blocks():
+        if len(block) == 0:
+            continue
+        base = offset / sr
+
+        if feature_backend == "lite":
+            lld = extract_lld(block, sr)
+            yield base + lld["time"], lld["loudness"], lld["f0_semitone"]
+        else:
+            from speech_features import lld_frames, smile_lld
+
+            yield lld_frames(smile_lld.process_signal(block, sr), base)
+
+
+def _window_means(llds, n, resolution):
+    """Mean loudness and voiced pitch per window (NaN where a window has none)."""
+    # One bincount per block into the global windows
+    loud_sum = np.zeros(n)
+    loud_n = np.zeros(n)
+    f0_sum = np.zeros(n)
+    f0_n = np.zeros(n)
+    for times, loudness, f0 in llds:
+        bins = np.minimum((times / resolution).astype(int), n - 1)
+        loud_sum += np.bincount(bins, weights=loudness, minlength=n)
+        loud_n += np.bincount(bins, minlength=n)
+        voiced = f0 > 0
+        f0_sum += np.bincount(bins[voiced], weights=f0[voiced], minlength=n)
+        f0_n += np.bincount(bins[voiced], minlength=n)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        loudness = np.where(loud_n > 0, loud_sum / loud_n, np.nan)
+        pitch = np.where(f0_n > 0, f0_sum / f0_n, np.nan)
+    return loudness, pitch
+
+
+def _speech_mask(segments, n_frames):
+    """Boolean per-HOP_SEC-frame speech indicator from (start, end) segments."""
+    if not segments:
+        return np.zeros(n_frames, dtype=bool)
+    bounds = np.asarray(segments, dtype=np.float64) / HOP_SEC
+    starts = np.clip(bounds[:, 0].astype(int), 0, n_frames)
+    ends = np.clip(np.ceil(bounds[:, 1]).astype(int), 0, n_frames)
+
+    delta = np.zeros(n_frames + 1, dtype=np.int32)
+    np.add.at(delta, starts, 1)
+    np.add.at(delta, ends, -1)
+    return np.cumsum(delta[:-1]) > 0
+
+
+def _series(t, values, points, digits):
+    x, y = lttb(t, values, points)
+    return {
+        "t": np.round(x, 2).tolist(),
+        "v": np.round(y, digits).tolist(),
+    }
+
+
+# ---------------------------
+# MAIN FUNCTION
+# ---------------------------
+def compute_timeline(audio_file, word_segments, feature_backend=None,
+                     resolution=TIMELINE_RESOLUTION_SEC, points=TIMELINE_POINTS, frames=None):
+    """
+    Per-window pitch, loudness, WPM and pause density, LTTB-downsampled.
+
+    `frames` is the dict filled by speech_features.analyze_speech; when
+    given, its VAD segments and LLD frames are used instead of reading the
+    audio again.
+
+    Returns:
+        Dict with "resolution_sec", "points", "duration" and "series":
+        {name: {"t": [...], "v": [...]}} for pitch (semitones; unvoiced
+        windows omitted), loudness, wpm and pause_density (0-1)
+    """
+    from speech_features import DEFAULT_FEATURE_BACKEND, OPENSMILE_AVAILABLE, speech_segments
+
+    if frames:
+        duration = frames["duration"]
+        feature_backend = frames["feature_backend"]
+        segments = frames["segments"]
+        n = max(1, int(np.ceil(duration / resolution)))
+        loudness, pitch = _window_means(frames["lld"], n, resolution)
+    else:
+        feature_backend = feature_backend or DEFAULT_FEATURE_BACKEND
+        if feature_backend == "opensmile" and not OPENSMILE_AVAILABLE:
+            feature_backend = "lite"
+
+        with AudioReader(audio_file) as reader:
+            duration = reader.duration
+            n = max(1, int(np.ceil(duration / resolution)))
+            loudness, pitch = _window_means(_block_llds(reader, feature_backend), n, resolution)
+            segments, _ = speech_segments(reader)
+
+    # Speaking rate: words per window (by midpoint), smoothed
+    words = WordTimings.from_list(word_segments).window_counts(resolution, n)
+    wpm_width = WPM_SMOOTHING_SEC / resolution
+    wpm = _moving_average(words, wpm_width) * (60.0 / resolution)
+
+    # Pause density: non-speech fraction of each window, smoothed
+    n_frames = int(np.ceil(duration / HOP_SEC))
+    speech = _speech_mask(segments, n_frames)
+    frame_bins = np.minimum((np.arange(n_frames) * HOP_SEC / resolution).astype(int), n - 1)
+    speech_frac = np.bincount(frame_bins, weights=speech, minlength=n) / np.maximum(
+        np.bincount(frame_bins, minlength=n), 1
+    )
+    pause = np.clip(_moving_average(1.0 - speech_frac, PAUSE_SMOOTHING_SEC / resolution), 0.0, 1.0)
+
+    t = (np.arange(n) + 0.5) * resolution
+    t = np.minimum(t, duration)
+
+    return {
+        "resolution_sec": resolution,
+        "points": points,
+        "duration": round(duration, 2),
+        "feature_backend": feature_backend,
+        "series": {
+            "pitch": _series(t, pitch, points, 2),
+            "loudness": _series(t, loudness, points, 3),
+            "wpm": _series(t, wpm, points, 1),
+            "pause_density": _series(t, pause, points, 3),
+        }
+    }
@@ -5,6 +5,12 @@ GuardrailsAI Configuration for Speech Analysis Pipeline
 This module provides input/output validation using GuardrailsAI Hub validators.
 All validators are pre-built from the Guardrails Hub - no custom validators needed.
 
+The Hub validators are slow to load and run, so they sit behind a cheap tier
+(regex PII + profanity wordlist, `cheap_check`) and load in a background
+thread started at API startup. They only run on texts the cheap tier flags,
+plus a GUARDRAILS_SAMPLE_RATE fraction of the rest. Each validator runs in
+its own Guard on a thread pool, and results are cached by content hash.
+
 Hub Validators Used:
 - ToxicLanguage: Detects toxic/harmful language
 - ProfanityFree: Checks for profanity
@@ -24,9 +30,18 @@ Installation:
     guardrails hub install hub://guardrails/sensitive_topics
 """
 
-import json
+import hashlib
 import logging
-from typing import Any, Dict, Optional, Tuple
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from llm1 import prompt_templates
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -51,138 +66,468 @@ except ImportError as e:
     logger.warning("Install with: pip install guardrails-ai && guardrails configure")
 
 
+# Fraction of texts the cheap tier did not flag that still go through the
+# Hub validators (catches what regexes and wordlists miss, e.g. names)
+SAMPLE_RATE = float(os.environ.get("GUARDRAILS_SAMPLE_RATE", "0.1"))
+# How long a validation that needs the Hub validators waits for them to load
+# (0 = don't wait: use the cheap tier's result until they are ready)
+INIT_WAIT_SEC = float(os.environ.get("GUARDRAILS_INIT_WAIT_SEC", "0"))
+# Threads running Hub validators concurrently, and cached validation results
+WORKERS = int(os.environ.get("GUARDRAILS_WORKERS", "4"))
+CACHE_SIZE = int(os.environ.get("GUARDRAILS_CACHE_SIZE", "2048"))
+
+
+# ==============================
+# Cheap tier: regexes and wordlists
+# ==============================
+
+PII_PATTERNS = {
+    "EMAIL_ADDRESS": re.compile(r"\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+\b"),
+    "URL": re.compile(r"\bhttps?://\S+|\bwww\.\S+", re.IGNORECASE),
+    # 13-19 digits, contiguous or in groups of 4 then 3-6 (4111 1111 ..., 3782 822463 10005)
+    "CREDIT_CARD": re.compile(r"\b(?:\d{13,19}|\d{4}(?:[ -]\d{3,6}){2,4})\b"),
+    "US_SSN": re.compile(r"\b\d{3}-\d{2}-\d{4}\b"),
+    "PHONE_NUMBER": re.compile(r"(?<![\w.])(?:\+\d{1,3}[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}\b"),
+    "IP_ADDRESS": re.compile(r"\b(?:\d{1,3}\.){3}\d{1,3}\b"),
+}
+
+
+def _luhn_valid(number: str) -> bool:
+    """Luhn checksum of a card number candidate (separators ignored)."""
+    digits = [int(d) for d in number if d.isdigit()]
+    if not 13 <= len(digits) <= 19:
+        return False
+    total = 0
+    for i, d in enumerate(reversed(digits)):
+        if i % 2:
+            d = d * 2 - 9 if d > 4 else d * 2
+        total += d
+    return total % 10 == 0
+
+
+def _bare_digits(number: str) -> bool:
+    """A phone candidate with no +, brackets or separators (a score, an ID...)."""
+    return number.isdigit()
+
+
+# Extra check a pattern match must pass to count as that entity
+PII_CHECKS = {"CREDIT_CARD": _luhn_valid}
+
+# Matches that are as often not PII (site names, bare 10-digit numbers):
+# when the predicate holds they flag the text for the Hub validators but are
+# left in place
+PII_FLAG_ONLY = {"URL": bool, "PHONE_NUMBER": _bare_digits}
+
+# Unambiguous words only: names and everyday words ("Dick", "prick a finger")
+# are left out
+PROFANITY = frozenset("""
+fuck fucks fucked fucking fucker motherfucker shit shits shitty bullshit
+bitch bitches bastard asshole assholes cunt crap damn
+goddamn wanker twat slut whore
+""".split())
+_PROFANITY = re.compile(r"\b(?:" + "|".join(sorted(PROFANITY)) + r")\b", re.IGNORECASE)
+
+
+def cheap_check(text: str) -> Tuple[str, Dict[str, int]]:
+    """
+    Redact regex-detectable PII (as <ENTITY>, like DetectPII) and mask
+    wordlist profanity. PII_FLAG_ONLY matches are counted but not redacted.
+
+    Returns:
+        Tuple of (redacted_text, {flag: count}); no flags = nothing found
+    """
+    flags = {}
+    for entity, pattern in PII_PATTERNS.items():
+        check = PII_CHECKS.get(entity)
+        keep = PII_FLAG_ONLY.get(entity)
+        hits = []
+
+        def redact(match, entity=entity, check=check, keep=keep, hits=hits):
+            if check is not None and not check(match.group()):
+                return match.group()
+            hits.append(match)
+            if keep is not None and keep(match.group()):
+                return match.group()
+            return f"<{entity}>"
+
+        text = pattern.sub(redact, text)
+        if hits:
+            flags[entity] = len(hits)
+    text, n = _PROFANITY.subn(lambda m: "*" * len(m.group()), text)
+    if n:
+        flags["PROFANITY"] = n
+    return text, flags
+
+
+def _enum_fields(module) -> Dict[str, set]:
+    """Fields whose prompt template lists the allowed values ("Low | Medium | High")."""
+    fields = {}
+    for template in vars(module).values():
+        if isinstance(template, str):
+            for field, values in re.findall(r'"(\w+)":\s*"([^"]+\|[^"]+)"', template):
+                fields.setdefault(field, set()).update(v.strip().lower() for v in values.split("|"))
+    return fields
+
+
+# e.g. {"clarity_level": {"low", "medium", "high"}, ...}
+ENUM_FIELDS = _enum_fields(prompt_templates)
+
+
+def is_enum_only(output: Any) -> bool:
+    """True if every field is a number, boolean or one of its template's enumerated values."""
+    if not isinstance(output, dict):
+        return False
+    for field, value in output.items():
+        if value is None or isinstance(value, (bool, int, float)):
+            continue
+        if not (isinstance(value, str) and value.strip().lower() in ENUM_FIELDS.get(field, ())):
+            return False
+    return True
+
+
+def _free_text(output: Any) -> List[str]:
+    """Strings of an agent output that are not enumerated labels."""
+    if isinstance(output, str):
+        return [output]
+    if isinstance(output, list):
+        return [s for v in output for s in _free_text(v)]
+    if isinstance(output, dict):
+        return [
+            s for field, v in output.items()
+            if not (isinstance(v, str) and v.strip().lower() in ENUM_FIELDS.get(field, ()))
+            for s in _free_text(v)
+        ]
+    return []
+
+
+def _map_strings(obj: Any, fn):
+    """Apply fn to every string in a JSON-like structure."""
+    if isinstance(obj, str):
+        return fn(obj)
+    if isinstance(obj, dict):
+        return {k: _map_strings(v, fn) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_map_strings(v, fn) for v in obj]
+    return obj
+
+
+class ValidationCache:
+    """LRU of Hub validation results keyed on (guard, SHA-256 of the text)."""
+
+    def __init__(self, max_entries=CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(kind: str, text: str) -> Tuple[str, str]:
+        return kind, hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
 class GuardrailsWrapper:
     """
     Wrapper class for GuardrailsAI validation.
     Uses pre-built Hub validators for comprehensive input/output validation.
+
+    Validation is tiered: every text first goes through `cheap_check`
+    (regex PII, profanity wordlist). The Hub validators, loaded in a
+    background thread by `start_loading`, only run when the cheap tier
+    flags something or the text is sampled (SAMPLE_RATE). Agent outputs
+    made only of enumerated values skip them entirely.
+
+    Each Hub validator has its own Guard, so the validators of a guard run
+    concurrently in a thread pool; results are cached by content hash.
     """
     
     def __init__(self):
-        self._input_guard = None
-        self._output_guard = None
-        self._report_guard = None
+        # kind ("input" / "output" / "report") → [(validator name, on_fail, Guard)]
+        self._guards = {}
+        self._ready = threading.Event()
+        self._loader = None
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="guardrails")
+        self.cache = ValidationCache()
+        self._latency = {}
+        self._latency_lock = threading.Lock()
         
-        if GUARDRAILS_AVAILABLE:
+        if not GUARDRAILS_AVAILABLE:
+            self._ready.set()
+    
+    def start_loading(self):
+        """Load the Hub validators in a background thread (once)."""
+        with self._lock:
+            if self._loader is None and not self._ready.is_set():
+                self._loader = threading.Thread(
+                    target=self._load, name="guardrails-init", daemon=True
+                )
+                self._loader.start()
+    
+    def _load(self):
+        try:
             self._initialize_guards()
+        finally:
+            self._ready.set()
+    
+    @property
+    def ready(self) -> bool:
+        """True once the Hub validators have loaded (or failed to)."""
+        return self._ready.is_set()
+    
+    def _heavy_guards(self, kind: str):
+        """The Hub validators of a guard, or None if unavailable / still loading."""
+        if not GUARDRAILS_AVAILABLE:
+            return None
+        self.start_loading()
+        if not self._ready.wait(INIT_WAIT_SEC):
+            return None
+        return self._guards.get(kind)
+    
+    @staticmethod
+    def _escalate(flags: Dict[str, int]) -> bool:
+        return bool(flags) or random.random() < SAMPLE_RATE
     
     def _initialize_guards(self):
-        """Initialize all guards with Hub validators"""
+        """Initialize all guards with Hub validators (one Guard per validator)"""
         try:
-            # Input validation guard (for transcripts/user inputs)
-            # Checks for toxic language, profanity, and gibberish
-            self._input_guard = Guard().use_many(
-                ToxicLanguage(on_fail="noop"),  # Don't block, just flag
-                ProfanityFree(on_fail="noop"),
-                GibberishText(on_fail="noop"),
-            )
-            logger.info("✅ Input guard initialized")
-            
-            # Output validation guard (for agent JSON responses)
-            # Validates JSON structure and checks for PII leakage
-            self._output_guard = Guard().use_many(
-                DetectPII(on_fail="fix"),  # Redact PII if found
-            )
-            logger.info("✅ Output guard initialized")
-            
-            # Report validation guard (for final reports)
-            # Comprehensive validation for user-facing content
-            self._report_guard = Guard().use_many(
-                ToxicLanguage(on_fail="noop"),
-                ProfanityFree(on_fail="fix"),  # Remove profanity from reports
-                DetectPII(on_fail="fix"),  # Redact PII from reports
-                SensitiveTopics(on_fail="noop"),
-            )
-            logger.info("✅ Report guard initialized")
+            specs = {
+                # Input validation (for transcripts/user inputs)
+                # Checks for toxic language, profanity, and gibberish
+                "input": [
+                    (ToxicLanguage, "noop"),  # Don't block, just flag
+                    (ProfanityFree, "noop"),
+                    (GibberishText, "noop"),
+                ],
+                # Output validation (for agent responses): PII leakage
+                "output": [
+                    (DetectPII, "fix"),  # Redact PII if found
+                ],
+                # Report validation (for final reports)
+                # Comprehensive validation for user-facing content
+                "report": [
+                    (ToxicLanguage, "noop"),
+                    (ProfanityFree, "fix"),  # Remove profanity from reports
+                    (DetectPII, "fix"),  # Redact PII from reports
+                    (SensitiveTopics, "noop"),
+                ],
+            }
+            self._guards = {
+                kind: [
+                    (validator.__name__, on_fail, Guard().use(validator(on_fail=on_fail)))
+                    for validator, on_fail in validators
+                ]
+                for kind, validators in specs.items()
+            }
+            logger.info(f"✅ Guards initialized: {', '.join(self._guards)}")
             
         except Exception as e:
             logger.error(f"❌ Failed to initialize guards: {e}")
-            self._input_guard = None
-            self._output_guard = None
-            self._report_guard = None
+            self._guards = {}
+    
+    # ---------------------------
+    # Hub validators: parallel, cached
+    # ---------------------------
+    def _timed_validate(self, kind: str, name: str, guard, text: str):
+        start = time.perf_counter()
+        try:
+            return guard.validate(text)
+        finally:
+            self._record_latency(f"{kind}.{name}", time.perf_counter() - start)
     
+    def _record_latency(self, validator: str, seconds: float):
+        with self._latency_lock:
+            s = self._latency.setdefault(validator, {"calls": 0, "total_sec": 0.0, "max_sec": 0.0})
+            s["calls"] += 1
+            s["total_sec"] += seconds
+            s["max_sec"] = max(s["max_sec"], seconds)
+    
+    def _run_validators(self, kind: str, guards, texts: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Run every validator of a guard on every text, concurrently.
+        
+        Returns:
+            {text: {"text": validated_text, "validation_passed": bool, "failed": [names]}}
+        """
+        results = {}
+        pending = {}
+        for text in dict.fromkeys(texts):
+            cached = self.cache.get(ValidationCache.key(kind, text))
+            if cached is not None:
+                results[text] = cached
+            else:
+                pending[text] = [
+                    (name, on_fail, guard, self._pool.submit(self._timed_validate, kind, name, guard, text))
+                    for name, on_fail, guard in guards
+                ]
+        
+        for text, jobs in pending.items():
+            merged = text
+            failed = []
+            for name, on_fail, guard, future in jobs:
+                outcome = future.result()
+                if not outcome.validation_passed:
+                    failed.append(name)
+                fixed = outcome.validated_output
+                if on_fail != "fix" or not fixed or fixed == text:
+                    continue
+                # Each fix was computed on the original text; when more than
+                # one validator changed it, reapply this one to the merged text
+                if merged != text:
+                    fixed = self._timed_validate(kind, name, guard, merged).validated_output or merged
+                merged = fixed
+            results[text] = {"text": merged, "validation_passed": not failed, "failed": failed}
+            self.cache.put(ValidationCache.key(kind, text), results[text])
+        return results
+    
+    def stats(self) -> Dict[str, Any]:
+        """Per-validator latency and validation cache counters"""
+        with self._latency_lock:
+            validators = {
+                name: {
+                    "calls": s["calls"],
+                    "mean_ms": round(1000 * s["total_sec"] / s["calls"], 2),
+                    "max_ms": round(1000 * s["max_sec"], 2),
+                }
+                for name, s in self._latency.items()
+            }
+        return {"ready": self.ready, "validators": validators, "cache": self.cache.stats()}
+    
+    # ---------------------------
+    # Validation entry points
+    # ---------------------------
     def validate_input(self, text: str) -> Tuple[str, Dict[str, Any]]:
         """
         Validate input text (transcripts, user inputs).
         
+        Input validation only flags (its Hub validators are all
+        on_fail="noop"), so the text comes back unchanged.
+        
         Args:
             text: Input text to validate
             
         Returns:
-            Tuple of (validated_text, validation_metadata)
+            Tuple of (text, validation_metadata)
         """
-        if not GUARDRAILS_AVAILABLE or not self._input_guard:
-            return text, {"guardrails": "unavailable"}
+        _, flags = cheap_check(text)
+        guards = self._heavy_guards("input") if self._escalate(flags) else None
+        if not guards:
+            return text, {"tier": "cheap", "validation_passed": not flags, "flags": flags}
         
         try:
-            result = self._input_guard.validate(text)
+            result = self._run_validators("input", guards, [text])[text]
             metadata = {
-                "validation_passed": result.validation_passed,
-                "validated_output": result.validated_output,
+                "tier": "hub",
+                "flags": flags,
+                "validation_passed": result["validation_passed"],
+                "failed": result["failed"],
             }
-            return result.validated_output or text, metadata
+            return text, metadata
         except Exception as e:
             logger.warning(f"Input validation error: {e}")
             return text, {"error": str(e)}
     
-    def validate_agent_output(self, output: str, agent_name: str = "agent") -> Tuple[str, Dict[str, Any]]:
+    def validate_agent_output(self, output: Any, agent_name: str = "agent") -> Tuple[Any, Dict[str, Any]]:
         """
-        Validate agent JSON output.
+        Validate agent output field by field.
+        
+        Only free-text strings (observations, suggestions, ...) are
+        validated; enumerated labels and numbers are left alone.
         
         Args:
-            output: Agent output (JSON string or dict)
+            output: Agent output (dict, list or string)
             agent_name: Name of the agent for logging
             
         Returns:
             Tuple of (validated_output, validation_metadata)
         """
-        if not GUARDRAILS_AVAILABLE or not self._output_guard:
-            return output, {"guardrails": "unavailable"}
+        # Only labels like "Medium" or scores: nothing for the validators to find
+        if is_enum_only(output):
+            return output, {"agent": agent_name, "tier": "enum", "validation_passed": True}
+        
+        flags = {}
+        def check(text):
+            text, found = cheap_check(text)
+            for flag, n in found.items():
+                flags[flag] = flags.get(flag, 0) + n
+            return text
+        output = _map_strings(output, check) if isinstance(output, (dict, list)) else check(str(output))
+        
+        guards = self._heavy_guards("output") if self._escalate(flags) else None
+        if not guards:
+            return output, {"agent": agent_name, "tier": "cheap",
+                            "validation_passed": not flags, "flags": flags}
         
         try:
-            # Convert dict to string if needed
-            text_output = json.dumps(output) if isinstance(output, dict) else str(output)
-            
-            result = self._output_guard.validate(text_output)
+            results = self._run_validators("output", guards, _free_text(output))
+            failed = sorted({name for r in results.values() for name in r["failed"]})
             metadata = {
                 "agent": agent_name,
-                "validation_passed": result.validation_passed,
+                "tier": "hub",
+                "flags": flags,
+                "validation_passed": not failed,
+                "failed": failed,
+                "fields_checked": len(results),
             }
-            
-            validated = result.validated_output or text_output
-            
-            # Try to parse back to dict if original was dict
-            if isinstance(output, dict):
-                try:
-                    return json.loads(validated), metadata
-                except json.JSONDecodeError:
-                    return output, metadata
-            
-            return validated, metadata
+            return _map_strings(output, lambda s: results[s]["text"] if s in results else s), metadata
             
         except Exception as e:
             logger.warning(f"{agent_name} output validation error: {e}")
             return output, {"error": str(e)}
     
-    def validate_report(self, report: str) -> Tuple[str, Dict[str, Any]]:
+    def validate_report(self, report: str, sampled: Optional[bool] = None) -> Tuple[str, Dict[str, Any]]:
         """
         Validate final report before presenting to user.
         
         Args:
-            report: Final report text
+            report: Final report text (or one sentence of a streamed report)
+            sampled: Run the Hub validators even if the cheap tier finds
+                nothing (default: decided by SAMPLE_RATE)
             
         Returns:
             Tuple of (validated_report, validation_metadata)
         """
-        if not GUARDRAILS_AVAILABLE or not self._report_guard:
-            return report, {"guardrails": "unavailable"}
+        report, flags = cheap_check(report)
+        escalate = flags or (sampled if sampled is not None else self._escalate(flags))
+        guards = self._heavy_guards("report") if escalate else None
+        if not guards:
+            return report, {"tier": "cheap", "validation_passed": not flags, "flags": flags}
         
         try:
-            result = self._report_guard.validate(report)
+            result = self._run_validators("report", guards, [report])[report]
             metadata = {
-                "validation_passed": result.validation_passed,
-                "validated_output": result.validated_output is not None,
+                "tier": "hub",
+                "flags": flags,
+                "validation_passed": result["validation_passed"],
+                "failed": result["failed"],
             }
-            return result.validated_output or report, metadata
+            return result["text"], metadata
         except Exception as e:
             logger.warning(f"Report validation error: {e}")
             return report, {"error": str(e)}
@@ -190,21 +535,130 @@ class GuardrailsWrapper:
 
 # Singleton instance
 _guardrails_wrapper = None
+_guardrails_lock = threading.Lock()
 
 
 def get_guardrails() -> GuardrailsWrapper:
-    """Get the singleton GuardrailsWrapper instance."""
+    """Get the singleton GuardrailsWrapper instance (Hub validators load in the background)."""
     global _guardrails_wrapper
-    if _guardrails_wrapper is None:
-        _guardrails_wrapper = GuardrailsWrapper()
+    with _guardrails_lock:
+        if _guardrails_wrapper is None:
+            _guardrails_wrapper = GuardrailsWrapper()
+            _guardrails_wrapper.start_loading()
     return _guardrails_wrapper
 
 
+# ==============================
+# Streaming report validation
+# ==============================
+
+# A sentence ends at . ! ? (plus closing quotes/brackets) followed by
+# whitespace, or at a line break
+_SENTENCE_END = re.compile(r"[.!?][\"')\]]*\s+|\n")
+# Longest text held back without a sentence end before it is checked anyway
+MAX_PENDING_CHARS = 500
+# Digit groups at the end of the text (a card / phone / SSN number that may
+# still be growing): a forced check never cuts inside them
+_NUMBER_TAIL = re.compile(r"(?:[+(]?\d[\d()]*[ .\-/]+)+$")
+
+
+def _safe_cut(text: str) -> int:
+    """
+    Where a forced check may split `text` without splitting PII.
+
+    Cuts at the last space, then moves back before any trailing digit
+    groups and before any PII match the cut would fall inside.
+    Returns 0 if no part of the text is safe to release yet.
+    """
+    cut = text.rfind(" ") + 1
+    tail = _NUMBER_TAIL.search(text, 0, cut)
+    if tail:
+        cut = tail.start()
+    for pattern in PII_PATTERNS.values():
+        for match in pattern.finditer(text):
+            if match.start() < cut < match.end():
+                cut = match.start()
+    return cut
+
+
+class StreamingReportGuard:
+    """
+    Validates a report sentence by sentence while it is generated.
+
+    `feed` takes LLM tokens and returns the sentences completed so far,
+    already checked (PII and profanity redacted inline); only the sentence
+    still being written is held back. Whether the Hub validators run on
+    unflagged sentences is sampled once per report, as for a whole report.
+    """
+
+    def __init__(self, wrapper: Optional["GuardrailsWrapper"] = None):
+        self.wrapper = wrapper or get_guardrails()
+        self.sampled = random.random() < SAMPLE_RATE
+        self.flags = {}
+        self.failed = set()
+        self.sentences = 0
+        self._pending = ""
+
+    def feed(self, token: str) -> List[str]:
+        """Add a token; returns the validated sentences it completed."""
+        self._pending += token
+        ready = []
+        while True:
+            match = _SENTENCE_END.search(self._pending)
+            if match is None:
+                break
+            ready.append(self._check(self._pending[:match.end()]))
+            self._pending = self._pending[match.end():]
+
+        if len(self._pending) > MAX_PENDING_CHARS:
+            # No sentence end in sight: check up to the last word boundary
+            # that doesn't split a (possibly unfinished) PII match
+            cut = _safe_cut(self._pending)
+            if not cut and len(self._pending) > 2 * MAX_PENDING_CHARS:
+                cut = len(self._pending)
+            if cut:
+                ready.append(self._check(self._pending[:cut]))
+                self._pending = self._pending[cut:]
+        return ready
+
+    def finish(self) -> List[str]:
+        """Validate whatever is left once generation ends."""
+        rest, self._pending = self._pending, ""
+        ready = [self._check(rest)] if rest else []
+        if self.flags or self.failed:
+            logger.info("⚠️ Streamed report validation flagged issues")
+        return ready
+
+    def _check(self, sentence: str) -> str:
+        text = sentence.rstrip()
+        if not text.strip():
+            return sentence
+        self.sentences += 1
+        validated, metadata = self.wrapper.validate_report(text, sampled=self.sampled)
+        for flag, n in metadata.get("flags", {}).items():
+            self.flags[flag] = self.flags.get(flag, 0) + n
+        self.failed.update(metadata.get("failed", ()))
+        # Keep the whitespace / line break that ended the sentence
+        return validated + sentence[len(text):]
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return {
+            "sentences": self.sentences,
+            "sampled": self.sampled,
+            "flags": self.flags,
+            "failed": sorted(self.failed),
+            "validation_passed": not self.flags and not self.failed,
+        }
+
+
 # Convenience functions for direct use
 def validate_transcript(transcript: str) -> str:
-    """Validate transcript text and return cleaned version."""
+    """Validate transcript text; issues are only flagged, the text is returned as is."""
     wrapper = get_guardrails()
-    validated, _ = wrapper.validate_input(transcript)
+    validated, metadata = wrapper.validate_input(transcript)
+    if not metadata.get("validation_passed", True):
+        logger.info(f"⚠️ Transcript validation flagged: {metadata.get('flags', {})}")
     return validated
 
 
@@ -226,6 +680,15 @@ def validate_final_report(report: str) -> str:
     return validated
 
 
+def validate_report_stream(tokens: Iterable[str]) -> Iterator[str]:
+    """Validate a streamed report; yields checked text a sentence at a time."""
+    guard = StreamingReportGuard()
+    for token in tokens:
+        yield from guard.feed(token)
+    yield from guard.finish()
+
+
 def is_guardrails_available() -> bool:
-    """Check if GuardrailsAI is available and configured."""
-    return GUARDRAILS_AVAILABLE and get_guardrails()._input_guard is not None
+    """Check if GuardrailsAI is available and its Hub validators have loaded."""
+    wrapper = get_guardrails()
+    return GUARDRAILS_AVAILABLE and wrapper.ready and bool(wrapper._guards.get("input"))
@@ -1,22 +1,89 @@
 # backend/pipeline.py
 
+import os
+
 from speech_to_text import transcribe_audio
-from speech_features import analyze_speech
-from agent import run_agents
+from speech_features import FEATURE_BACKENDS, analyze_speech
+from agent import prefetch_contexts, run_agents
 from rag.rag_pipeline import rag_enhanced_report
+from whisper_policy import audio_duration, select_model_tier, track_request, transcript_config
+from long_audio import LONG_AUDIO_THRESHOLD_SEC, run_long_pipeline
+from feature_timeline import compute_timeline
+from audio_quality import assess_audio, insufficient_audio_response
+from artifact_store import (
+    ARTIFACTS_ENABLED,
+    ArtifactStore,
+    StageRunner,
+    file_fingerprint,
+    hash_file,
+)
+from word_timings import WordTimings
 
-def run_pipeline(audio_file: str):
-    # STEP 3: Speech-to-text
-    data = transcribe_audio(audio_file)
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _source(*names):
+    return file_fingerprint(*(os.path.join(BACKEND_DIR, n) for n in names))
+
+
+def stage_configs(cascade: bool = False, feature_backend: str = None, model_tier: str = None):
+    """
+    What each stage's output depends on. Editing a prompt, the scoring
+    weights, the knowledge documents, the LLM settings or the Whisper tier
+    changes the matching config, so only that stage and the ones after it
+    rerun.
+    """
+    from llm1.llm_config import LLM_MODEL_NAME, TEMPERATURE, MAX_TOKENS
+    from utils.feature_scoring import WEIGHTS
+
+    llm = {"model": LLM_MODEL_NAME, "temperature": TEMPERATURE, "max_tokens": MAX_TOKENS}
+    knowledge = _source("rag/documents", "rag/knowledge_base.py")
+    prompts = _source("llm1/prompt_templates.py")
+
+    return {
+        "decode": {"source": _source("audio_quality.py")},
+        "transcript": transcript_config(model_tier, cascade),
+        "features": {
+            "feature_backend": feature_backend,
+            "source": _source("speech_features.py", "lite_features.py"),
+        },
+        "communication": {
+            "source": _source("agents/communication_agent.py"), "prompts": prompts,
+            "weights": WEIGHTS["communication"], "llm": llm, "knowledge": knowledge,
+        },
+        "confidence": {
+            "source": _source("agents/confidence_agent.py"), "prompts": prompts,
+            "weights": WEIGHTS["confidence"], "llm": llm, "knowledge": knowledge,
+        },
+        "personality": {
+            "source": _source("agents/personality_agent.py"), "prompts": prompts,
+            "llm": llm, "knowledge": knowledge,
+        },
+        "report": {
+            "source": _source("rag/rag_pipeline.py"), "prompts": prompts,
+            "llm": llm, "knowledge": knowledge,
+        },
+    }
+
+
+def _encode_transcript(data):
+    return dict(data, word_segments=data["word_segments"].to_list())
 
-    # STEP 4: Feature extraction
-    results, score, label, wpm, avg_pause = analyze_speech(
-        audio_file,
-        data["word_segments"]
-    )
 
+def _decode_transcript(data):
+    return dict(data, word_segments=WordTimings.from_list(data["word_segments"]))
+
+
+def run_report_stages(runner: StageRunner, transcript: str, results: dict, wpm, quality: dict,
+                      stream_report: bool = False):
+    """
+    Agents + final report (the stages `reanalyze` reruns).
+
+    With `stream_report`, the report stage is left to the caller
+    (`stream_rag_enhanced_report`) and the returned report is None.
+    """
     pipeline_state = {
-        "transcript": data["transcript"],
+        "transcript": transcript,
         "audio_features": {
             "speech_rate": results.get("speech_rate", round(wpm)),
             "pitch_variance": results.get("Pitch Variance"),
@@ -25,17 +92,97 @@ def run_pipeline(audio_file: str):
         }
     }
 
-    # STEP 4: Agents
-    agent_results = run_agents(pipeline_state)
+    if quality["status"] == "reduced":
+        # Clipped or mostly non-speech audio: metrics only, no LLM stages
+        final_report = (
+            "Reduced analysis: " + " ".join(issue["message"] for issue in quality["issues"]) +
+            " Speech metrics are shown, but the AI report was skipped."
+        )
+        return {}, final_report
+
+    # STEP 4: Agents (their RAG contexts retrieved together, up front)
+    pipeline_state["rag_contexts"] = prefetch_contexts(pipeline_state)
+    agent_results = run_agents(pipeline_state, run_stage=runner.run)
+    if stream_report:
+        return agent_results, None
 
     # STEP 5: Final report (RAG + LLM)
-    final_report = rag_enhanced_report(agent_results)
+    final_report = runner.run("report", rag_enhanced_report, agent_results)
+    return agent_results, final_report
 
-    return {
+
+def run_pipeline(audio_file: str, latency_target: float = None, cascade: bool = False,
+                 feature_backend: str = None, timeline: bool = False, stream_report: bool = False):
+    # Fail before any model runs (analyze_speech would only notice after Whisper)
+    if feature_backend is not None and feature_backend not in FEATURE_BACKENDS:
+        raise ValueError(f"Unknown feature backend: {feature_backend}")
+
+    # Stage outputs are stored per audio hash, so a rerun only recomputes
+    # the stages whose config changed
+    store = ArtifactStore() if ARTIFACTS_ENABLED else None
+    runner = StageRunner(
+        store,
+        hash_file(audio_file),
+        stage_configs(cascade=cascade, feature_backend=feature_backend)
+    )
+
+    # Quality gate: silent / too short / no speech stops here, before any model
+    quality = runner.run("decode", assess_audio, audio_file)
+    if quality["status"] == "insufficient":
+        print(f"⚠️ Insufficient audio: {[issue['code'] for issue in quality['issues']]}")
+        return insufficient_audio_response(quality)
+
+    # Hour-long recordings go through the chunked map-reduce path
+    if audio_duration(audio_file) > LONG_AUDIO_THRESHOLD_SEC:
+        result = run_long_pipeline(audio_file, feature_backend=feature_backend, timeline=timeline)
+        result["audio_quality"] = quality
+        return result
+
+    # STEP 3: Speech-to-text (tier picked from duration, load and latency target,
+    # or fast-then-slow cascade over low-confidence segments). The tier is
+    # picked before the stage runs so it is part of the transcript's key.
+    with track_request():
+        model_tier, tier_reason = (
+            (None, "cascade") if cascade else
+            select_model_tier(audio_duration(audio_file), latency_target=latency_target)
+        )
+        runner.configs["transcript"] = transcript_config(model_tier, cascade)
+        data = runner.run(
+            "transcript", transcribe_audio,
+            audio_file, model_tier, latency_target, cascade, tier_reason,
+            encode=_encode_transcript, decode=_decode_transcript
+        )
+
+    # STEP 4: Feature extraction (keeping its VAD segments and LLD frames
+    # for the timeline; stays empty when the stage is resumed from the store)
+    frames = {} if timeline else None
+    results, score, label, wpm, avg_pause = runner.run(
+        "features", analyze_speech,
+        audio_file, data["word_segments"], feature_backend, frames
+    )
+
+    # Optional per-window contours (downsampled to a fixed point budget)
+    feature_timeline = (
+        compute_timeline(audio_file, data["word_segments"], feature_backend, frames=frames)
+        if timeline else None
+    )
+
+    agent_results, final_report = run_report_stages(
+        runner, data["transcript"], results, wpm, quality, stream_report=stream_report
+    )
+
+    result = {
+        "status": "reduced" if quality["status"] == "reduced" else "ok",
+        "audio_quality": quality,
         "transcript": data["transcript"],
+        "stt": data["stt"],
         "speech_metrics": results,
         "confidence_score": score,
         "confidence_label": label,
         "agent_results": agent_results,
-        "final_report": final_report
+        "final_report": final_report,
+        "artifacts": runner.summary()
     }
+    if feature_timeline is not None:
+        result["timeline"] = feature_timeline
+    return result
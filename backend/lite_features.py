@@ -0,0 +1,222 @@
+# backend/lite_features.py
+"""
+Lightweight acoustic feature engine (pure NumPy).
+
+analyze_speech only reads five eGeMAPS functionals: mean loudness, F0 mean
+and stddevNorm (semitones from 27.5 Hz), jitter and shimmer. This module
+computes just those, vectorized over frames:
+- loudness: framed RMS mapped to openSMILE's loudness scale
+- F0: YIN (cumulative mean normalized difference, FFT-based)
+- jitter / shimmer: frame-to-frame pitch period and peak amplitude changes
+
+Validate against openSMILE with `python -m benchmarks.bench_lite_features`.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from audio_io import iter_blocks
+
+SAMPLE_RATE = 16000
+
+# Framing
+HOP_SEC = 0.010
+LOUDNESS_FRAME_SEC = 0.020
+YIN_WINDOW_SEC = 0.025          # integration window
+
+# Pitch search range
+F0_MIN = 60.0
+F0_MAX = 500.0
+YIN_THRESHOLD = 0.15
+VOICING_RMS_MIN = 0.01          # frames quieter than this are unvoiced
+YIN_BATCH_FRAMES = 512          # frames per batched FFT
+
+# loudness ≈ GAIN * rms ** EXPONENT (Stevens' power law on intensity).
+# Fitted to openSMILE with `bench_lite_features --synthetic` (24 speech-like
+# clips, RMS 0.01-0.3): mean |log ratio| 0.063, energy labels agree on
+# 24/24 clips. RMS ignores spectral weighting, so pure tones don't match.
+LOUDNESS_GAIN = 4.2
+LOUDNESS_EXPONENT = 0.7
+
+
+def _frames(y, frame_len, hop):
+    if len(y) < frame_len:
+        return np.zeros((0, frame_len), dtype=np.float32)
+    return sliding_window_view(y, frame_len)[::hop]
+
+
+def frame_rms(y, sr=SAMPLE_RATE):
+    """Per-frame RMS over LOUDNESS_FRAME_SEC windows."""
+    frames = _frames(y, int(LOUDNESS_FRAME_SEC * sr), int(HOP_SEC * sr))
+    return np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1))
+
+
+def frame_loudness(y, sr=SAMPLE_RATE):
+    """Per-frame loudness on openSMILE's scale."""
+    return LOUDNESS_GAIN * frame_rms(y, sr) ** LOUDNESS_EXPONENT
+
+
+def _yin_batch(frames, w, tau_min, tau_max, sr):
+    n = len(frames)
+
+    # d(tau) = e(0) + e(tau) - 2 * r(tau), with r from one batched FFT
+    nfft = 1 << int(np.ceil(np.log2(2 * (w + tau_max))))
+    spec_full = np.fft.rfft(frames, nfft, axis=1)
+    spec_head = np.fft.rfft(frames[:, :w], nfft, axis=1)
+    r = np.fft.irfft(np.conj(spec_head) * spec_full, nfft, axis=1)[:, :tau_max + 1]
+
+    energy = np.concatenate([np.zeros((n, 1)), np.cumsum(np.square(frames), axis=1)], axis=1)
+    taus = np.arange(tau_max + 1)
+    e_tau = energy[:, taus + w] - energy[:, taus]
+    diff = np.maximum(e_tau[:, :1] + e_tau - 2 * r, 0.0)
+
+    # Cumulative mean normalized difference
+    cmnd = np.ones_like(diff)
+    cum = np.cumsum(diff[:, 1:], axis=1)
+    cmnd[:, 1:] = diff[:, 1:] * taus[1:] / np.maximum(cum, 1e-12)
+
+    search = cmnd[:, tau_min:tau_max]
+    below = search < YIN_THRESHOLD
+    has_dip = below.any(axis=1)
+    idx = np.where(has_dip, below.argmax(axis=1), search.argmin(axis=1))
+
+    # Walk each first dip down to its local minimum
+    rows = np.arange(n)
+    while True:
+        nxt = np.minimum(idx + 1, search.shape[1] - 1)
+        move = search[rows, nxt] < search[rows, idx]
+        if not move.any():
+            break
+        idx = np.where(move, nxt, idx)
+
+    # Parabolic interpolation around the minimum
+    left = search[rows, np.maximum(idx - 1, 0)]
+    mid = search[rows, idx]
+    right = search[rows, np.minimum(idx + 1, search.shape[1] - 1)]
+    denom = left - 2 * mid + right
+    safe = np.where(np.abs(denom) > 1e-12, denom, 1.0)
+    shift = np.where(np.abs(denom) > 1e-12, 0.5 * (left - right) / safe, 0.0)
+    period = idx + tau_min + np.clip(shift, -1, 1)
+
+    head = frames[:, :w]
+    rms = np.sqrt(np.mean(np.square(head), axis=1))
+    voiced = has_dip & (rms >= VOICING_RMS_MIN)
+
+    f0 = np.where(voiced, sr / period, 0.0)
+    peak = np.max(np.abs(head), axis=1)
+    return f0, peak
+
+
+def yin_f0(y, sr=SAMPLE_RATE):
+    """
+    Frame-wise YIN pitch tracker.
+
+    Frames are processed YIN_BATCH_FRAMES at a time to bound the FFT
+    working set.
+
+    Returns:
+        Tuple of (f0_hz, peak_amplitude) arrays; f0 is 0 on unvoiced frames
+    """
+    hop = int(HOP_SEC * sr)
+    w = int(YIN_WINDOW_SEC * sr)
+    tau_min = int(sr / F0_MAX)
+    tau_max = int(sr / F0_MIN)
+
+    frames = _frames(y, w + tau_max, hop)
+    if len(frames) == 0:
+        return np.zeros(0), np.zeros(0)
+
+    f0_parts, peak_parts = [], []
+    for i in range(0, len(frames), YIN_BATCH_FRAMES):
+        batch = frames[i:i + YIN_BATCH_FRAMES].astype(np.float64)
+        f0, peak = _yin_batch(batch, w, tau_min, tau_max, sr)
+        f0_parts.append(f0)
+        peak_parts.append(peak)
+    return np.concatenate(f0_parts), np.concatenate(peak_parts)
+
+
+def extract_lld(y, sr=SAMPLE_RATE):
+    """
+    Frame-level descriptors with a shared 10 ms hop.
+
+    Returns:
+        Dict of equal-length arrays: time (sec), loudness, f0_semitone (0 when
+        unvoiced), jitter and shimmer_db (0 where undefined)
+    """
+    y = np.asarray(y, dtype=np.float32)
+    loudness = frame_loudness(y, sr)
+    f0, peak = yin_f0(y, sr)
+
+    n = min(len(loudness), len(f0))
+    loudness, f0, peak = loudness[:n], f0[:n], peak[:n]
+
+    voiced = f0 > 0
+    semitone = np.zeros(n)
+    semitone[voiced] = 12 * np.log2(f0[voiced] / 27.5)
+
+    # Period / amplitude perturbation between consecutive voiced frames
+    jitter = np.zeros(n)
+    shimmer = np.zeros(n)
+    if n > 1:
+        pair = voiced[1:] & voiced[:-1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            period = np.where(voiced, 1.0 / np.where(voiced, f0, 1.0), 0.0)
+            jit = np.abs(np.diff(period)) / ((period[1:] + period[:-1]) / 2)
+            shim = np.abs(20 * np.log10(peak[1:] / peak[:-1]))
+        jitter[1:] = np.where(pair & np.isfinite(jit), jit, 0.0)
+        shimmer[1:] = np.where(pair & np.isfinite(shim), shim, 0.0)
+
+    return {
+        "time": np.arange(n) * HOP_SEC,
+        "loudness": loudness,
+        "f0_semitone": semitone,
+        "jitter": jitter,
+        "shimmer_db": shimmer,
+    }
+
+
+def lite_functionals(source, sampling_rate=SAMPLE_RATE, frames=None):
+    """
+    Same keys as speech_features.extract_lld_functionals, computed block by
+    block from `extract_lld` with running sums.
+
+    If `frames` is a list, each block's (time_sec, loudness, f0_semitone)
+    frame arrays are appended to it.
+    """
+    loud_sum = loud_n = 0.0
+    f0_sum = f0_sq = f0_n = 0.0
+    jit_sum = jit_n = shim_sum = shim_n = 0.0
+    offset = 0
+
+    for block in iter_blocks(source, target_sr=sampling_rate):
+        lld = extract_lld(block, sampling_rate)
+        if frames is not None:
+            frames.append((offset / sampling_rate + lld["time"], lld["loudness"], lld["f0_semitone"]))
+        offset += len(block)
+
+        loud_sum += lld["loudness"].sum()
+        loud_n += len(lld["loudness"])
+
+        f0 = lld["f0_semitone"][lld["f0_semitone"] > 0]
+        f0_sum += f0.sum()
+        f0_sq += np.square(f0).sum()
+        f0_n += len(f0)
+
+        jit = lld["jitter"][lld["jitter"] > 0]
+        jit_sum += jit.sum()
+        jit_n += len(jit)
+
+        shim = lld["shimmer_db"][lld["shimmer_db"] > 0]
+        shim_sum += shim.sum()
+        shim_n += len(shim)
+
+    f0_mean = f0_sum / f0_n if f0_n else 0.0
+    f0_std = np.sqrt(max(f0_sq / f0_n - f0_mean ** 2, 0.0)) if f0_n else 0.0
+
+    return {
+        "loudness_sma3_amean": float(loud_sum / loud_n) if loud_n else 0.0,
+        "F0semitoneFrom27.5Hz_sma3nz_amean": float(f0_mean),
+        "F0semitoneFrom27.5Hz_sma3nz_stddevNorm": float(f0_std / f0_mean) if f0_mean else 0.0,
+        "jitterLocal_sma3nz_amean": float(jit_sum / jit_n) if jit_n else 0.0,
+        "shimmerLocaldB_sma3nz_amean": float(shim_sum / shim_n) if shim_n else 0.0,
+    }
@@ -0,0 +1,327 @@
+# backend/live_analysis.py
+"""
+Live (streaming) speech analysis.
+
+A LiveSession receives audio chunks while the user is still speaking:
+- keeps the most recent audio in a fixed-size ring buffer
+- runs Silero VAD incrementally with VADIterator (512-sample windows)
+- transcribes each finished utterance with a fast Whisper tier
+- emits rolling metrics (WPM, pause ratio, energy)
+
+Everything received is also spooled to a WAV file on disk, so the full
+pipeline report can run over the whole recording when the client stops.
+"""
+
+import os
+import queue
+import subprocess
+import tempfile
+import threading
+import time
+
+import numpy as np
+import soundfile as sf
+
+from speech_features import load_silero_vad
+from whisper_policy import get_whisper_model
+
+# ---------------------------
+# Configuration
+# ---------------------------
+SAMPLE_RATE = 16000
+VAD_WINDOW = 512                 # Silero VAD window at 16 kHz
+RING_SECONDS = 60                # Audio kept in memory for utterance transcription
+MAX_UTTERANCE_SEC = 15           # Force-transcribe long utterances in pieces
+METRICS_INTERVAL_SEC = 1.0       # How often rolling metrics are pushed
+ENERGY_WINDOW_SEC = 3.0          # Window for rolling energy
+LIVE_MODEL_TIER = "base"         # Fast tier for incremental transcripts
+
+SUPPORTED_FORMATS = ("pcm16", "float32", "opus")
+
+
+class RingBuffer:
+    """Fixed-capacity float32 ring buffer addressed by absolute sample index."""
+
+    def __init__(self, capacity):
+        self.capacity = int(capacity)
+        self._data = np.zeros(self.capacity, dtype=np.float32)
+        self.total = 0  # samples written since the start of the stream
+
+    def write(self, samples):
+        n = len(samples)
+        if n > self.capacity:
+            # Only the newest `capacity` samples can be held
+            self.total += n - self.capacity
+            samples = samples[-self.capacity:]
+            n = self.capacity
+
+        pos = self.total % self.capacity
+        first = min(n, self.capacity - pos)
+        self._data[pos:pos + first] = samples[:first]
+        self._data[:n - first] = samples[first:]
+        self.total += n
+
+    def read(self, start, end):
+        """Copy samples [start, end) if still held; older samples are clipped off."""
+        start = max(start, self.total - self.capacity, 0)
+        end = min(end, self.total)
+        if end <= start:
+            return np.zeros(0, dtype=np.float32)
+
+        idx = np.arange(start, end) % self.capacity
+        return self._data[idx]
+
+    def tail(self, n):
+        return self.read(self.total - n, self.total)
+
+
+class _FfmpegDecoder:
+    """Decode a streamed opus (webm/ogg) container to 16 kHz mono int16 via ffmpeg."""
+
+    def __init__(self, sample_rate=SAMPLE_RATE):
+        self._proc = subprocess.Popen(
+            [
+                "ffmpeg", "-loglevel", "quiet",
+                "-i", "pipe:0",
+                "-f", "s16le",
+                "-ac", "1",
+                "-ar", str(sample_rate),
+                "pipe:1"
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        self._out = queue.Queue()
+        self._reader = threading.Thread(target=self._drain, daemon=True)
+        self._reader.start()
+
+    def _drain(self):
+        while True:
+            data = self._proc.stdout.read1(65536)
+            if not data:
+                break
+            self._out.put(data)
+        self._out.put(None)
+
+    def _collect(self, block=False):
+        parts = []
+        while True:
+            try:
+                data = self._out.get(block=block)
+            except queue.Empty:
+                break
+            if data is None:
+                break
+            parts.append(data)
+        return b"".join(parts)
+
+    def decode(self, payload):
+        self._proc.stdin.write(payload)
+        self._proc.stdin.flush()
+        return self._collect()
+
+    def flush(self):
+        self._proc.stdin.close()
+        data = self._collect(block=True)
+        self._proc.wait()
+        return data
+
+
+class LiveSession:
+    """State for one live analysis stream."""
+
+    def __init__(self, fmt="pcm16", sample_rate=SAMPLE_RATE, model_tier=LIVE_MODEL_TIER):
+        if fmt not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported format '{fmt}', expected one of {SUPPORTED_FORMATS}")
+
+        self.fmt = fmt
+        self.sample_rate = sample_rate
+        self.model_tier = model_tier
+
+        self.ring = RingBuffer(RING_SECONDS * sample_rate)
+        self._pending = np.zeros(0, dtype=np.float32)   # < one VAD window
+        self._carry = b""                               # partial PCM sample bytes
+        self._decoder = _FfmpegDecoder(sample_rate) if fmt == "opus" else None
+
+        # Each session gets its own VAD model: Silero keeps recurrent state
+        vad_model, vad_utils = load_silero_vad()
+        VADIterator = vad_utils[3]
+        self._vad = VADIterator(vad_model, sampling_rate=sample_rate)
+
+        self._utterance_start = None
+        self._speech_samples = 0
+        self._last_metrics = 0.0
+        self._stopped = False
+
+        self.transcript_parts = []
+        self.word_count = 0
+
+        fd, self.recording_path = tempfile.mkstemp(prefix="live_", suffix=".wav")
+        os.close(fd)
+        self._recording = sf.SoundFile(
+            self.recording_path, "w",
+            samplerate=sample_rate, channels=1, subtype="PCM_16"
+        )
+
+    # -----------------------
+    # Input
+    # -----------------------
+    def _to_float(self, payload):
+        if self.fmt == "float32":
+            data = self._carry + payload
+            usable = len(data) - len(data) % 4
+            self._carry = data[usable:]
+            return np.frombuffer(data[:usable], dtype=np.float32)
+
+        if self.fmt == "opus":
+            payload = self._decoder.decode(payload)
+
+        data = self._carry + payload
+        usable = len(data) - len(data) % 2
+        self._carry = data[usable:]
+        return np.frombuffer(data[:usable], dtype=np.int16).astype(np.float32) / 32768.0
+
+    def feed(self, payload):
+        """Consume one audio chunk and return the events it produced."""
+        return self._process(self._to_float(payload))
+
+    def _process(self, samples):
+        events = []
+        if len(samples) == 0:
+            return events
+
+        self._recording.write(samples)
+        self.ring.write(samples)
+
+        audio = np.concatenate([self._pending, samples])
+        n_windows = len(audio) // VAD_WINDOW
+        window_start = self.ring.total - len(audio)
+
+        for i in range(n_windows):
+            window = audio[i * VAD_WINDOW:(i + 1) * VAD_WINDOW]
+            speech = self._vad(window, return_seconds=False)
+
+            if self._utterance_start is not None:
+                self._speech_samples += VAD_WINDOW
+
+            if speech and "start" in speech:
+                self._utterance_start = speech["start"]
+            elif speech and "end" in speech and self._utterance_start is not None:
+                events.extend(self._transcribe(self._utterance_start, speech["end"]))
+                self._utterance_start = None
+
+            # Cut very long utterances so transcripts keep flowing
+            if self._utterance_start is not None:
+                current = window_start + (i + 1) * VAD_WINDOW
+                if current - self._utterance_start >= MAX_UTTERANCE_SEC * self.sample_rate:
+                    events.extend(self._transcribe(self._utterance_start, current))
+                    self._utterance_start = current
+
+        self._pending = audio[n_windows * VAD_WINDOW:]
+
+        now = time.monotonic()
+        if now - self._last_metrics >= METRICS_INTERVAL_SEC:
+            self._last_metrics = now
+            events.append(self.metrics())
+
+        return events
+
+    # -----------------------
+    # Transcription & metrics
+    # -----------------------
+    def _transcribe(self, start, end):
+        clip = self.ring.read(start, end)
+        if len(clip) < VAD_WINDOW:
+            return []
+
+        segments, _ = get_whisper_model(self.model_tier).transcribe(clip, language="en")
+        text = " ".join(seg.text.strip() for seg in segments).strip()
+        if not text:
+            return []
+
+        self.transcript_parts.append(text)
+        self.word_count += len(text.split())
+        return [{
+            "type": "transcript",
+            "text": text,
+            "start": round(start / self.sample_rate, 2),
+            "end": round(end / self.sample_rate, 2)
+        }]
+
+    def metrics(self):
+        """Rolling metrics over everything received so far."""
+        elapsed = self.ring.total / self.sample_rate
+        wpm = (self.word_count / elapsed) * 60 if elapsed > 0 else 0.0
+        pause_ratio = 1 - (self._speech_samples / self.ring.total) if self.ring.total else 1.0
+
+        recent = self.ring.tail(int(ENERGY_WINDOW_SEC * self.sample_rate))
+        rms = float(np.sqrt(np.mean(recent ** 2))) if len(recent) else 0.0
+        energy_db = 20 * np.log10(rms) if rms > 0 else -100.0
+
+        return {
+            "type": "metrics",
+            "elapsed": round(elapsed, 2),
+            "speaking": self._utterance_start is not None,
+            "words": self.word_count,
+            "wpm": round(wpm, 1),
+            "pause_ratio": round(min(max(pause_ratio, 0.0), 1.0), 2),
+            "energy_rms": round(rms, 4),
+            "energy_db": round(float(energy_db), 1)
+        }
+
+    # -----------------------
+    # Stop
+    # -----------------------
+    def stop(self):
+        """
+        Flush buffered audio, transcribe any open utterance, close the recording.
+
+        Safe to call more than once; later calls return no events.
+        """
+        if self._stopped:
+            return []
+        self._stopped = True
+
+        events = []
+        if self._decoder is not None:
+            tail = self._carry + self._decoder.flush()
+            self._carry = b""
+            self._decoder = None
+            usable = len(tail) - len(tail) % 2
+            events.extend(self._process(
+                np.frombuffer(tail[:usable], dtype=np.int16).astype(np.float32) / 32768.0
+            ))
+
+        if self._utterance_start is not None:
+            events.extend(self._transcribe(self._utterance_start, self.ring.total))
+            self._utterance_start = None
+
+        self._vad.reset_states()
+        if not self._recording.closed:
+            self._recording.close()
+        events.append(self.metrics())
+        return events
+
+    def finish(self):
+        """Stop the stream and run the full pipeline over the whole recording."""
+        from link import run_pipeline
+
+        self.stop()   # no-op if the caller already stopped the stream
+        try:
+            result = run_pipeline(self.recording_path)
+            result["live_transcript"] = " ".join(self.transcript_parts)
+            return result
+        finally:
+            self.close()
+
+    def close(self):
+        if self._decoder is not None:
+            try:
+                self._decoder.flush()
+            except Exception:
+                pass
+            self._decoder = None
+        if not self._recording.closed:
+            self._recording.close()
+        if os.path.exists(self.recording_path):
+            os.remove(self.recording_path)
@@ -0,0 +1,71 @@
+# backend/live_client.py
+"""
+Replay a local audio file to the live analysis WebSocket in real time.
+
+Usage:
+    python live_client.py clean_audio.wav
+    python live_client.py talk.wav --speed 4 --url ws://127.0.0.1:8000/ws/live
+"""
+
+import argparse
+import asyncio
+import json
+
+import numpy as np
+import soundfile as sf
+import websockets
+
+SAMPLE_RATE = 16000
+CHUNK_MS = 100
+
+
+async def _send_audio(ws, audio_file, speed):
+    chunk = int(SAMPLE_RATE * CHUNK_MS / 1000)
+    info = sf.info(audio_file)
+    if info.samplerate != SAMPLE_RATE:
+        raise SystemExit(f"❌ Expected {SAMPLE_RATE} Hz audio, got {info.samplerate} Hz")
+
+    for block in sf.blocks(audio_file, blocksize=chunk, dtype="float32", always_2d=True):
+        mono = block.mean(axis=1)
+        pcm = (np.clip(mono, -1.0, 1.0) * 32767).astype("<i2")
+        await ws.send(pcm.tobytes())
+        await asyncio.sleep(CHUNK_MS / 1000 / speed)
+
+    await ws.send(json.dumps({"type": "stop"}))
+
+
+async def _receive(ws):
+    async for message in ws:
+        event = json.loads(message)
+        kind = event.get("type")
+
+        if kind == "transcript":
+            print(f"📝 [{event['start']:>6.1f}s] {event['text']}")
+        elif kind == "metrics":
+            print(
+                f"📊 {event['elapsed']:>6.1f}s  WPM={event['wpm']:<6} "
+                f"pause={event['pause_ratio']:<5} energy={event['energy_db']} dB"
+            )
+        elif kind == "report":
+            print("\n✨ FINAL REPORT\n")
+            print(json.dumps(event["result"], indent=2))
+            return
+        else:
+            print(f"ℹ️  {event}")
+
+
+async def replay(audio_file, url, speed):
+    async with websockets.connect(f"{url}?format=pcm16", max_size=None) as ws:
+        sender = asyncio.create_task(_send_audio(ws, audio_file, speed))
+        await _receive(ws)
+        await sender
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay an audio file to /ws/live")
+    parser.add_argument("audio_file")
+    parser.add_argument("--url", default="ws://127.0.0.1:8000/ws/live")
+    parser.add_argument("--speed", type=float, default=1.0, help="Playback speed multiplier")
+    args = parser.parse_args()
+
+    asyncio.run(replay(args.audio_file, args.url, args.speed))
@@ -11,6 +11,7 @@ Both produce the same output and can be used interchangeably.
 
 from llm1.local_llm import get_llm
 from llm1.prompt_templates import REPORT_PROMPT
+from rag.context_assembler import track_prompt, track_stream
 
 # Import RAG system for context augmentation
 try:
@@ -22,11 +23,12 @@ except ImportError:
 
 # Import GuardrailsAI for report validation
 try:
-    from guardrails_config import validate_final_report
+    from guardrails_config import validate_final_report, validate_report_stream
     GUARDRAILS_AVAILABLE = True
 except ImportError:
     GUARDRAILS_AVAILABLE = False
     def validate_final_report(x): return x
+    def validate_report_stream(tokens): return tokens
 
 
 def _get_rag_context(agent_outputs: dict) -> str:
@@ -103,9 +105,32 @@ def generate_final_report(agent_outputs: dict):
         agent_outputs=agent_outputs
     )
 
-    report = llm.invoke(prompt)
+    with track_prompt("report", prompt, rag_context):
+        report = llm.invoke(prompt)
     
     # Validate final report with guardrails
     validated_report = validate_final_report(report)
     
     return validated_report
+
+
+def stream_final_report(agent_outputs: dict):
+    """
+    Streaming variant of `generate_final_report`: yields the report as it is
+    generated, each sentence checked by the guardrails first.
+    """
+    llm = get_llm()
+    rag_context = _get_rag_context(agent_outputs)
+    
+    prompt = REPORT_PROMPT.format(
+        rag_context=rag_context if rag_context else "No specific recommendations available.",
+        agent_outputs=agent_outputs
+    )
+
+    # Only generation is timed, not the time the client takes to read
+    if hasattr(llm, "stream"):
+        tokens = track_stream("report", prompt, llm.stream(prompt), rag_context)
+    else:
+        with track_prompt("report", prompt, rag_context):
+            tokens = [llm.invoke(prompt)]
+    yield from validate_report_stream(tokens)
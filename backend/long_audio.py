@@ -0,0 +1,333 @@
+# backend/long_audio.py
+"""
+Long-recording analysis (meetings, lectures).
+
+Map-reduce over the recording instead of one Whisper pass:
+1. Scan the file block by block with Silero VAD and cut it into chunks at
+   silences close to CHUNK_TARGET_SEC.
+2. Map: worker processes (each loading Whisper / Silero / openSMILE once)
+   transcribe and extract features for one chunk at a time; the parent runs
+   the communication agent on each chunk as soon as it is ready.
+3. Reduce: duration-weighted global metrics plus the per-chunk summaries
+   feed the usual agents and final report.
+
+The file is read through a memory-mapped AudioReader: only one block (scan)
+or one chunk per worker (map) is ever materialized, so peak memory does not
+grow with the recording length.
+"""
+
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import soundfile as sf
+
+from audio_io import AudioReader
+
+# ---------------------------
+# Configuration
+# ---------------------------
+SAMPLE_RATE = 16000
+LONG_AUDIO_THRESHOLD_SEC = 600   # Recordings longer than this use the long-audio mode
+VAD_BLOCK_SEC = 30               # Block size for the boundary scan
+MIN_SILENCE_SEC = 0.3            # Gaps shorter than this are not cut candidates
+CHUNK_TARGET_SEC = 120
+CHUNK_MIN_SEC = 60
+CHUNK_MAX_SEC = 180
+LONG_AUDIO_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
+LONG_AUDIO_TIER = "base"         # Whisper tier used inside workers
+
+
+def _fmt_time(sec):
+    return f"{int(sec // 60):02d}:{int(sec % 60):02d}"
+
+
+# ---------------------------
+# Chunking
+# ---------------------------
+def find_silences(audio_file, block_sec=VAD_BLOCK_SEC):
+    """Midpoints (sec) of non-speech gaps, found block by block with Silero VAD."""
+    import torch
+    from speech_features import load_silero_vad
+
+    vad_model, vad_utils = load_silero_vad()
+    get_speech_timestamps = vad_utils[0]
+
+    silences = []
+    prev_end = 0.0
+
+    with AudioReader(audio_file, target_sr=SAMPLE_RATE) as reader:
+        for offset, block in reader.blocks(block_sec):
+            base = offset / SAMPLE_RATE
+            for seg in get_speech_timestamps(torch.from_numpy(block), vad_model, sampling_rate=SAMPLE_RATE):
+                start = base + seg["start"] / SAMPLE_RATE
+                if start - prev_end >= MIN_SILENCE_SEC:
+                    silences.append((prev_end + start) / 2)
+                prev_end = base + seg["end"] / SAMPLE_RATE
+
+    return silences
+
+
+def plan_chunks(silences, duration, target=CHUNK_TARGET_SEC,
+                min_len=CHUNK_MIN_SEC, max_len=CHUNK_MAX_SEC):
+    """
+    Pick cut points at silences nearest to `target` seconds after the previous
+    cut, never shorter than `min_len` or longer than `max_len` (hard cut).
+
+    Returns:
+        List of (start_sec, end_sec) tuples covering the whole recording
+    """
+    cuts = [0.0]
+    while duration - cuts[-1] > max_len:
+        last = cuts[-1]
+        window = [s for s in silences if last + min_len <= s <= last + max_len]
+        if window:
+            cut = min(window, key=lambda s: abs(s - (last + target)))
+        else:
+            cut = last + max_len
+        cuts.append(cut)
+    cuts.append(duration)
+    return list(zip(cuts[:-1], cuts[1:]))
+
+
+# ---------------------------
+# Map (worker processes)
+# ---------------------------
+def _init_worker(model_tier):
+    """Load Whisper, Silero and openSMILE once per worker process."""
+    import speech_features  # noqa: F401  (loads Silero + openSMILE at import)
+    from whisper_policy import get_whisper_model
+    get_whisper_model(model_tier)
+
+
+def _process_chunk(audio_file, index, start, end, model_tier, feature_backend=None,
+                   keep_frames=False):
+    from speech_to_text import transcribe_audio
+    from speech_features import analyze_speech
+
+    with AudioReader(audio_file, target_sr=SAMPLE_RATE) as reader:
+        data = reader.read_seconds(start, end)
+
+    fd, chunk_path = tempfile.mkstemp(prefix=f"chunk{index:04d}_", suffix=".wav")
+    os.close(fd)
+    try:
+        sf.write(chunk_path, data, SAMPLE_RATE)
+        del data
+
+        stt = transcribe_audio(chunk_path, model_tier=model_tier)
+        frames = {} if keep_frames else None
+        results, score, label, wpm, pause = analyze_speech(
+            chunk_path, stt["word_segments"], feature_backend=feature_backend, frames=frames
+        )
+    finally:
+        os.remove(chunk_path)
+
+    return {
+        "index": index,
+        "start": start,
+        "end": end,
+        "transcript": stt["transcript"],
+        "word_segments": stt["word_segments"].shift(start),
+        "metrics": results,
+        "confidence_score": score,
+        # VAD segments and LLD frames (recording time) for the timeline
+        "frames": _shift_frames(frames, start) if keep_frames else None
+    }
+
+
+def _shift_frames(frames, start):
+    return {
+        "feature_backend": frames["feature_backend"],
+        "segments": [(s + start, e + start) for s, e in frames["segments"]],
+        "lld": [(t + start, loudness, f0) for t, loudness, f0 in frames["lld"]],
+    }
+
+
+def _merge_frames(chunks, duration):
+    """One compute_timeline `frames` dict from the index-ordered chunks."""
+    return {
+        "duration": duration,
+        "feature_backend": chunks[0]["frames"]["feature_backend"],
+        "segments": [seg for c in chunks for seg in c["frames"]["segments"]],
+        "lld": [lld for c in chunks for lld in c["frames"]["lld"]],
+    }
+
+
+def _summarize_chunk(chunk):
+    """Run the communication agent on one chunk and keep a compact summary."""
+    from agents.communication_agent import communication_agent
+
+    metrics = chunk["metrics"]
+    state = {
+        "transcript": chunk["transcript"],
+        "audio_features": {
+            "speech_rate": metrics.get("speech_rate"),
+            "pitch_variance": metrics.get("Pitch Variance"),
+            "pause_ratio": metrics.get("pause_ratio"),
+            "energy_level": metrics.get("energy_level"),
+        }
+    }
+    analysis = communication_agent(state).get("communication_analysis", {})
+    if not isinstance(analysis, dict):
+        analysis = {}
+
+    return {
+        "span": f"{_fmt_time(chunk['start'])}-{_fmt_time(chunk['end'])}",
+        "speech_rate": metrics.get("speech_rate"),
+        "pause_ratio": metrics.get("pause_ratio"),
+        "energy_level": metrics.get("energy_level"),
+        "communication_score": analysis.get("communication_score"),
+        "speech_pacing": analysis.get("speech_pacing"),
+        "key_observations": analysis.get("key_observations", [])
+    }
+
+
+# ---------------------------
+# Reduce
+# ---------------------------
+def reduce_chunks(chunks):
+    """Combine per-chunk metrics into whole-recording metrics (duration-weighted)."""
+    from speech_features import confidence_label, map_energy_level
+
+    durations = [c["metrics"].get("Speech Duration (sec)", c["end"] - c["start"]) for c in chunks]
+    total = sum(durations) or 1.0
+
+    def weighted(key):
+        return sum(c["metrics"].get(key, 0.0) * d for c, d in zip(chunks, durations)) / total
+
+    total_words = sum(c["metrics"].get("Total Words", 0) for c in chunks)
+    wpm = (total_words / total) * 60
+    loudness = weighted("Energy (Loudness)")
+    score = sum(c["confidence_score"] * d for c, d in zip(chunks, durations)) / total
+
+    results = {
+        "speech_rate": round(wpm),
+        "pause_ratio": round(weighted("pause_ratio"), 2),
+        "energy_level": map_energy_level(loudness),
+        "Energy (Loudness)": round(loudness, 3),
+        "Pitch Mean (semitones)": round(weighted("Pitch Mean (semitones)"), 2),
+        "Pitch Variance": round(weighted("Pitch Variance"), 3),
+        "Jitter": round(weighted("Jitter"), 4),
+        "Shimmer (dB)": round(weighted("Shimmer (dB)"), 4),
+        "Speech Duration (sec)": round(sum(durations), 2),
+        "Total Pause Time (sec)": round(sum(c["metrics"].get("Total Pause Time (sec)", 0.0) for c in chunks), 2),
+        "Total Words": total_words
+    }
+    return results, round(score, 2), confidence_label(score)
+
+
+def _digest(summaries):
+    """Compact transcript stand-in for the global agents: one line per chunk (failures included)."""
+    lines = []
+    for s in summaries:
+        if "error" in s:
+            lines.append(f"[{s['span']}] not analyzed")
+            continue
+        observations = "; ".join(str(o) for o in s["key_observations"][:2])
+        lines.append(
+            f"[{s['span']}] {s['speech_rate']} WPM, pacing {s['speech_pacing']}. {observations}".strip()
+        )
+    return "\n".join(lines)
+
+
+# ---------------------------
+# Entry point
+# ---------------------------
+def run_long_pipeline(audio_file, workers=LONG_AUDIO_WORKERS, model_tier=LONG_AUDIO_TIER,
+                      feature_backend=None, timeline=False):
+    """Map-reduce analysis for long recordings. Same result shape as link.run_pipeline."""
+    from agent import run_agents
+    from rag.rag_pipeline import rag_enhanced_report
+
+    duration = sf.info(audio_file).duration
+    spans = plan_chunks(find_silences(audio_file), duration)
+    print(f"📚 Long-audio mode: {duration / 60:.1f} min in {len(spans)} chunks, {workers} workers")
+
+    chunks, summaries, failures = [], {}, []
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(model_tier,)
+    ) as pool:
+        futures = {
+            pool.submit(_process_chunk, audio_file, i, start, end, model_tier,
+                        feature_backend, timeline): i
+            for i, (start, end) in enumerate(spans)
+        }
+        # Summarize each chunk while the workers keep transcribing the rest.
+        # A failed chunk is recorded and left out of the reduce.
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                chunk = future.result()
+                summaries[index] = _summarize_chunk(chunk)
+            except Exception as e:
+                start, end = spans[index]
+                failures.append({
+                    "index": index,
+                    "span": f"{_fmt_time(start)}-{_fmt_time(end)}",
+                    "error": f"{type(e).__name__}: {e}"
+                })
+                print(f"   ❌ Chunk {index + 1}/{len(spans)} failed: {e}")
+                continue
+            chunks.append(chunk)
+            print(f"   ✅ Chunk {index + 1}/{len(spans)} done")
+
+    if not chunks:
+        raise RuntimeError(f"All {len(spans)} long-audio chunks failed: {failures[0]['error']}")
+
+    chunks.sort(key=lambda c: c["index"])
+    failures.sort(key=lambda f: f["index"])
+    failed = {f["index"]: f for f in failures}
+    ordered_summaries = [summaries[c["index"]] for c in chunks]
+
+    results, score, label = reduce_chunks(chunks)
+
+    pipeline_state = {
+        # The digest is the whole recording, one line per chunk: it goes in
+        # its own field so the agents don't cut it like a transcript
+        "transcript": "",
+        "chunk_digest": _digest([summaries.get(i) or failed[i] for i in range(len(spans))]),
+        "audio_features": {
+            "speech_rate": results["speech_rate"],
+            "pitch_variance": results["Pitch Variance"],
+            "pause_ratio": results["pause_ratio"],
+            "energy_level": results["energy_level"],
+        }
+    }
+
+    agent_results = run_agents(pipeline_state)
+    agent_results["chunk_summaries"] = ordered_summaries
+
+    final_report = rag_enhanced_report(agent_results)
+
+    result = {
+        "transcript": " ".join(c["transcript"] for c in chunks),
+        "stt": {
+            "model_tier": model_tier,
+            "tier_reason": "long_audio",
+            "audio_duration": round(duration, 2)
+        },
+        "long_audio": {
+            "chunks": len(chunks),
+            "workers": workers,
+            "spans": [[round(c["start"], 2), round(c["end"], 2)] for c in chunks],
+            "failed_chunks": failures
+        },
+        "speech_metrics": results,
+        "confidence_score": score,
+        "confidence_label": label,
+        "agent_results": agent_results,
+        "final_report": final_report
+    }
+    if timeline:
+        from feature_timeline import compute_timeline
+        from word_timings import WordTimings
+        words = WordTimings.concat([c["word_segments"] for c in chunks])
+        # With a missing chunk the merged frames have a gap: read the audio instead
+        frames = None if failures else _merge_frames(chunks, duration)
+        result["timeline"] = compute_timeline(audio_file, words, feature_backend, frames=frames)
+    return result
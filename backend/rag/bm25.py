@@ -0,0 +1,110 @@
+# rag/bm25.py
+"""
+BM25 keyword retrieval.
+
+An inverted index built once per retriever: each term maps to the rows
+that contain it and their precomputed BM25 term weights, so a query only
+touches the postings of its own terms (no scan over document text, and
+whole-token matching: "rate" no longer hits "moderate"). One index is kept
+per category plus one over everything, so a category filter is just a
+different index.
+
+Also provides reciprocal rank fusion for hybrid (vector + BM25) retrieval.
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from rag.config import BM25_B, BM25_K1, RRF_K
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the
+this to was were will with may can s t
+""".split())
+
+
+def tokenize(text):
+    return [t for t in _TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+class BM25Index:
+    """BM25 over one set of documents."""
+
+    def __init__(self, documents, k1=BM25_K1, b=BM25_B):
+        self.documents = list(documents)
+        n = len(self.documents)
+        counts = [Counter(tokenize(doc["content"])) for doc in self.documents]
+        lengths = np.array([sum(c.values()) for c in counts], dtype=np.float32)
+        avg_length = float(lengths.mean()) if n and lengths.mean() > 0 else 1.0
+        norm = k1 * (1.0 - b + b * lengths / avg_length)
+
+        rows_by_term = defaultdict(list)
+        for row, c in enumerate(counts):
+            for term, tf in c.items():
+                rows_by_term[term].append((row, tf))
+
+        # term → (rows, BM25 weight of the term in each row)
+        self.postings = {}
+        for term, entries in rows_by_term.items():
+            rows = np.fromiter((r for r, _ in entries), dtype=np.int32, count=len(entries))
+            tf = np.fromiter((t for _, t in entries), dtype=np.float32, count=len(entries))
+            idf = math.log(1.0 + (n - len(entries) + 0.5) / (len(entries) + 0.5))
+            self.postings[term] = (rows, idf * tf * (k1 + 1.0) / (tf + norm[rows]))
+
+    def __len__(self):
+        return len(self.documents)
+
+    def search(self, query, top_k=3):
+        """
+        Best matching documents for a query.
+
+        Returns:
+            List of (document, score) with score > 0, best first
+        """
+        scores = np.zeros(len(self.documents), dtype=np.float32)
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if posting is not None:
+                scores[posting[0]] += posting[1]
+
+        hits = np.flatnonzero(scores)
+        if hits.size == 0:
+            return []
+        if hits.size > top_k:
+            hits = hits[np.argpartition(-scores[hits], top_k - 1)[:top_k]]
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        return [(self.documents[i], float(scores[i])) for i in hits]
+
+
+class KeywordIndex:
+    """BM25 indexes partitioned by category (None = all documents)."""
+
+    def __init__(self, documents):
+        by_category = defaultdict(list)
+        for doc in documents:
+            by_category[doc["category"]].append(doc)
+        self.indexes = {None: BM25Index(documents)}
+        self.indexes.update({cat: BM25Index(docs) for cat, docs in by_category.items()})
+
+    def search(self, query, top_k=3, category=None):
+        index = self.indexes.get(category)
+        return index.search(query, top_k) if index is not None else []
+
+
+def reciprocal_rank_fusion(rankings, k=RRF_K):
+    """
+    Fuse ranked lists of document ids: score(d) = Σ 1 / (k + rank).
+
+    Returns:
+        Ids ordered by fused score
+    """
+    scores = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] += 1.0 / (k + rank)
+    return sorted(scores, key=lambda doc_id: -scores[doc_id])
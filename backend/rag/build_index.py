@@ -1,31 +1,243 @@
+# rag/build_index.py
+"""
+Offline index builds for the RAG system.
+
+    python -m rag.build_index            # runtime index (VECTOR_BACKEND) + context table
+    python -m rag.build_index --force    # re-embed everything, recompute contexts
+
+Indexes KNOWLEDGE_DOCUMENTS and the chunks of rag/documents/*.md
+(rag/ingest.py). Both runtime indexes keep per-chunk content hashes (the
+ChromaDB index in CHROMA_MANIFEST, the NumPy index in its meta.json), so a
+rebuild only re-embeds chunks that are new or changed and drops ones that
+were removed. The precomputed analysis contexts (rag/context_table.py) are
+rebuilt whenever the knowledge base changed.
+
+A running server picks up a rebuilt index through POST /rag/reload
+(rag.retriever.reload_retriever).
+"""
+
+import argparse
+import hashlib
+import json
 import os
-from langchain_community.document_loaders import TextLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.vectorstores import FAISS
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: builds are not serialized across processes
+    fcntl = None
+
+import numpy as np
+
+from rag.config import (
+    CHROMA_MANIFEST,
+    CHROMA_PERSIST_DIR,
+    COLLECTION_NAME,
+    DEFAULT_EMBEDDING_MODEL,
+    EMBEDDING_BACKEND,
+    VECTOR_BACKEND,
+    VECTOR_INDEX_DIR,
+)
+from rag.embeddings import get_embedding_function
+from rag.ingest import embed_documents
+from rag.knowledge_base import KnowledgeBase
+from rag.vector_index import META_FILE, NumpyVectorIndex, current_dir
+
+
+# ---------------------------
+# Manifest
+# ---------------------------
+def document_hash(doc):
+    payload = json.dumps({"content": doc["content"], "category": doc["category"]}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_manifest(path=CHROMA_MANIFEST):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_manifest(manifest, path=CHROMA_MANIFEST):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path)
+
+
+def active_embedding_model():
+    """Model id of the configured embedding backend (Chroma's default if none)."""
+    embed = get_embedding_function(EMBEDDING_BACKEND)
+    return embed.model if embed else DEFAULT_EMBEDDING_MODEL
+
+
+def index_is_current(documents=None, manifest=None):
+    """True when the persisted index matches the knowledge base and encoder exactly."""
+    documents = documents if documents is not None else KnowledgeBase().get_all_documents()
+    manifest = manifest if manifest is not None else load_manifest()
+    if not manifest or manifest.get("embedding_model") != active_embedding_model():
+        return False
+    return manifest.get("documents") == {doc["id"]: document_hash(doc) for doc in documents}
+
+
+@contextmanager
+def _build_lock():
+    """Serialize builds across processes (several API workers starting at once)."""
+    os.makedirs(CHROMA_PERSIST_DIR, exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(CHROMA_PERSIST_DIR, ".build.lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
 
-DOC_PATH = "rag/documents"
-INDEX_PATH = "rag/faiss_index"
+# ---------------------------
+# ChromaDB (runtime index)
+# ---------------------------
+def build_chroma_index(force=False):
+    """
+    Create or update the persistent ChromaDB collection.
 
-def build_index():
-    docs = []
+    Returns:
+        Dict with counts of added / updated / deleted / unchanged documents
+    """
+    import chromadb
 
-    for file in os.listdir(DOC_PATH):
-        if file.endswith(".md"):
-            loader = TextLoader(os.path.join(DOC_PATH, file))
-            docs.extend(loader.load())
+    documents = KnowledgeBase().get_all_documents()
+    hashes = {doc["id"]: document_hash(doc) for doc in documents}
 
-    splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
-    chunks = splitter.split_documents(docs)
+    # The configured backend embeds documents (and queries, in the retriever);
+    # without one, Chroma's default function does both
+    embed = get_embedding_function(EMBEDDING_BACKEND)
+    embedding_model = embed.model if embed else DEFAULT_EMBEDDING_MODEL
 
-    embeddings = HuggingFaceEmbeddings(
-        model_name="sentence-transformers/all-MiniLM-L6-v2"
-    )
+    with _build_lock():
+        client = chromadb.PersistentClient(path=CHROMA_PERSIST_DIR)
+        manifest = load_manifest()
 
-    vectorstore = FAISS.from_documents(chunks, embeddings)
-    vectorstore.save_local(INDEX_PATH)
+        if force or not manifest or manifest.get("embedding_model") != embedding_model:
+            try:
+                client.delete_collection(COLLECTION_NAME)
+            except Exception:
+                pass
+            manifest = {"documents": {}}
+
+        collection = client.get_or_create_collection(
+            name=COLLECTION_NAME,
+            metadata={"description": "Speech analysis knowledge base"}
+        )
+
+        known = manifest.get("documents", {})
+        changed = [doc for doc in documents if known.get(doc["id"]) != hashes[doc["id"]]]
+        removed = [doc_id for doc_id in known if doc_id not in hashes]
+
+        started = time.perf_counter()
+        if changed:
+            # Only these are embedded, in batches across threads
+            collection.upsert(
+                ids=[doc["id"] for doc in changed],
+                documents=[doc["content"] for doc in changed],
+                metadatas=[{"category": doc["category"]} for doc in changed],
+                **({"embeddings": embed_documents(changed, embed).tolist()} if embed else {}),
+            )
+        if removed:
+            collection.delete(ids=removed)
+
+        _write_manifest({
+            "embedding_model": embedding_model,
+            "collection": COLLECTION_NAME,
+            "built": time.time(),
+            "documents": hashes,
+        })
+
+    stats = {
+        "added": sum(1 for doc in changed if doc["id"] not in known),
+        "updated": sum(1 for doc in changed if doc["id"] in known),
+        "deleted": len(removed),
+        "unchanged": len(documents) - len(changed),
+        "embed_time_sec": round(time.perf_counter() - started, 3),
+    }
+    print(f"✅ ChromaDB index at {CHROMA_PERSIST_DIR}: {stats}")
+    return stats
+
+
+# ---------------------------
+# NumPy (runtime index, VECTOR_BACKEND="numpy")
+# ---------------------------
+def numpy_index_is_current(documents=None):
+    return index_is_current(documents, load_manifest(os.path.join(current_dir(), META_FILE)))
+
+
+def build_numpy_index(force=False):
+    """
+    Create or update the memory-mapped NumPy index.
+
+    Returns:
+        Dict with counts of added / updated / deleted / unchanged documents
+    """
+    embed = get_embedding_function(EMBEDDING_BACKEND)
+    if embed is None:
+        raise RuntimeError("No embedding backend available for the NumPy index")
+
+    documents = KnowledgeBase().get_all_documents()
+    hashes = {doc["id"]: document_hash(doc) for doc in documents}
+
+    with _build_lock():
+        index = None if force else NumpyVectorIndex.load()
+        if index is not None and index.meta.get("embedding_model") != embed.model:
+            index = None
+        known = index.meta["documents"] if index is not None else {}
+        reusable = index.vectors_by_id() if index is not None else {}
+
+        changed = [doc for doc in documents if known.get(doc["id"]) != hashes[doc["id"]]]
+        started = time.perf_counter()
+        fresh = dict(zip(
+            (doc["id"] for doc in changed),
+            embed_documents(changed, embed)
+        ))
+        embeddings = np.stack([
+            fresh[doc["id"]] if doc["id"] in fresh else reusable[doc["id"]]
+            for doc in documents
+        ])
+        NumpyVectorIndex.write(embeddings, documents, hashes, embed.model)
+
+    stats = {
+        "added": sum(1 for doc in changed if doc["id"] not in known),
+        "updated": sum(1 for doc in changed if doc["id"] in known),
+        "deleted": sum(1 for doc_id in known if doc_id not in hashes),
+        "unchanged": len(documents) - len(changed),
+        "embed_time_sec": round(time.perf_counter() - started, 3),
+    }
+    print(f"✅ NumPy index at {VECTOR_INDEX_DIR}: {stats}")
+    return stats
+
+
+def build_runtime_index(force=False):
+    """Build the index the retriever reads (VECTOR_BACKEND)."""
+    if VECTOR_BACKEND == "numpy":
+        return build_numpy_index(force=force)
+    return build_chroma_index(force=force)
 
-    print("✅ RAG index built successfully")
 
 if __name__ == "__main__":
-    build_index()
+    parser = argparse.ArgumentParser(description="Build RAG indexes")
+    parser.add_argument("--force", action="store_true", help="Re-embed every document")
+    args = parser.parse_args()
+
+    build_runtime_index(force=args.force)
+
+    # Imported here: the retriever itself imports this module
+    from rag.context_table import build_context_table
+    from rag.retriever import RAGRetriever
+
+    retriever = RAGRetriever()
+    if not retriever._initialized:
+        print("⚠️ Vector index unavailable; context table not built")
+    elif args.force or not retriever.context_table:
+        build_context_table(retriever)
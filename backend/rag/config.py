@@ -7,12 +7,72 @@ import os
 
 # ChromaDB settings
 CHROMA_PERSIST_DIR = os.path.join(os.path.dirname(__file__), "chroma_db")
+CHROMA_MANIFEST = os.path.join(CHROMA_PERSIST_DIR, "manifest.json")  # doc id -> content hash
 COLLECTION_NAME = "speech_analysis_knowledge"
 
+# Precomputed contexts for every bucketed analysis query (rag/context_table.py)
+CONTEXT_TABLE_PATH = os.path.join(CHROMA_PERSIST_DIR, "context_table.json")
+
+# Runtime vector store: "numpy" (in-process index, rag/vector_index.py) or
+# "chroma" (ChromaDB collection)
+VECTOR_BACKEND = os.environ.get("RAG_VECTOR_BACKEND", "numpy")
+VECTOR_INDEX_DIR = os.path.join(os.path.dirname(__file__), "vector_index")
+
+# Embedding backend for both indexes (rag/embeddings.py): "chroma",
+# "sentence-transformers", "onnx" or "onnx-int8"; None = first installed of
+# the fp32 backends
+EMBEDDING_BACKEND = os.environ.get("RAG_EMBEDDING_BACKEND") or None
+
+# ONNX Runtime encoder: fp32 export (ChromaDB's download cache by default),
+# its int8-quantized copy, threads per session and batch size
+ONNX_MODEL_DIR = os.environ.get(
+    "RAG_ONNX_MODEL_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "chroma", "onnx_models", "all-MiniLM-L6-v2", "onnx")
+)
+ONNX_INT8_PATH = os.path.join(os.path.dirname(__file__), "models", "all-MiniLM-L6-v2-int8.onnx")
+ONNX_THREADS = int(os.environ.get("RAG_ONNX_THREADS", str(min(4, os.cpu_count() or 1))))
+ONNX_BATCH_SIZE = 32
+ONNX_MAX_LENGTH = 256
+
+# Query embedding cache (rag/embedding_cache.py): LRU bounded by vector bytes,
+# saved to RAG_EMBEDDING_CACHE_PATH (if set) so restarts start warm
+EMBEDDING_CACHE_MAX_BYTES = int(os.environ.get("RAG_EMBEDDING_CACHE_MB", "64")) * 1024 * 1024
+EMBEDDING_CACHE_PATH = os.environ.get("RAG_EMBEDDING_CACHE_PATH") or None
+
+# Build the persistent index at retriever startup if it is missing or stale.
+# Off by default: run `python -m rag.build_index` at deploy time. Set
+# RAG_BUILD_ON_START=1 in development to build in-process instead.
+RAG_BUILD_ON_START = os.environ.get("RAG_BUILD_ON_START", "0") == "1"
+
+# ChromaDB's default embedding function (recorded in the manifest; changing
+# the embedding model forces a full re-embed)
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
 # Embedding model (using Ollama's embedding capability)
 EMBEDDING_MODEL = "nomic-embed-text"  # Lightweight embedding model for Ollama
 
 # Retrieval settings
 TOP_K_RESULTS = 3
+
+# Context assembly (rag/context_assembler.py): documents retrieved per
+# context, bullets picked by MMR up to a per-prompt token budget
+CONTEXT_CANDIDATES = 6
+CONTEXT_TOKEN_BUDGET = int(os.environ.get("RAG_CONTEXT_TOKENS", "160"))
+MMR_LAMBDA = 0.7          # relevance vs novelty
+DEDUP_THRESHOLD = 0.9     # cosine (or token overlap) above which a bullet is a duplicate
+CHARS_PER_TOKEN = 4       # token estimate for the Ollama models' tokenizers
+
+# Keyword retrieval (rag/bm25.py): BM25 parameters, and optional hybrid
+# retrieval fusing vector + BM25 rankings with reciprocal rank fusion
+BM25_K1 = 1.5
+BM25_B = 0.75
+HYBRID_RETRIEVAL = os.environ.get("RAG_HYBRID", "0") == "1"
+HYBRID_CANDIDATES = 10   # per ranking, before fusion
+RRF_K = 60
+
+# Ingestion (rag/ingest.py): markdown sources, chunking and batched embedding
+DOCUMENTS_DIR = os.path.join(os.path.dirname(__file__), "documents")
 CHUNK_SIZE = 500
 CHUNK_OVERLAP = 50
+EMBED_BATCH_SIZE = 32
+EMBED_WORKERS = int(os.environ.get("RAG_EMBED_WORKERS", "4"))
@@ -0,0 +1,255 @@
+# rag/context_assembler.py
+"""
+Token-budgeted prompt contexts from retrieved documents.
+
+Knowledge documents are headings followed by bullet lines, and the
+documents retrieved for one query often repeat each other (the 120-160 WPM
+range is in both comm_001 and communication_rules.md). Instead of pasting
+whole documents into the prompt, the assembler splits them into bullets,
+ranks the bullets against the query, picks them by maximal marginal
+relevance (MMR) so near-duplicates are dropped, and stops at
+CONTEXT_TOKEN_BUDGET estimated tokens. The chosen bullets are printed under
+their headings.
+
+Also keeps per-stage prompt size and LLM latency counters (`track_prompt`),
+reported by GET /rag/stats.
+"""
+
+import math
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from rag.bm25 import tokenize
+from rag.config import CHARS_PER_TOKEN, CONTEXT_TOKEN_BUDGET, DEDUP_THRESHOLD, MMR_LAMBDA
+
+_BULLET = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text):
+    """Approximate LLM token count (no tokenizer needed for the budget)."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def split_document(content):
+    """
+    Split a document into bullets.
+
+    Lines ending in ":" start a new heading; bullet lines and prose
+    sentences become bullets under the current heading.
+
+    Returns:
+        List of (heading or None, bullet text)
+    """
+    heading = None
+    bullets = []
+    for line in content.splitlines():
+        line = line.strip().lstrip("#").strip()
+        if not line:
+            continue
+        if _BULLET.match(line):
+            bullets.append((heading, _BULLET.sub("", line)))
+        elif line.endswith(":"):
+            heading = line
+        else:
+            bullets.extend((heading, s) for s in _SENTENCE.split(line) if s)
+    return bullets
+
+
+def _token_overlap(a, b):
+    a, b = set(tokenize(a)), set(tokenize(b))
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+class ContextAssembler:
+    """
+    Builds prompt contexts from ranked documents.
+
+    With an embedding function, bullets are ranked by cosine similarity to
+    the query and compared with each other by cosine; without one (keyword
+    fallback) the retrieval order is kept and duplicates are found by token
+    overlap.
+    """
+
+    def __init__(self, embed=None, token_budget=CONTEXT_TOKEN_BUDGET,
+                 mmr_lambda=MMR_LAMBDA, dedup_threshold=DEDUP_THRESHOLD):
+        self.embed = embed
+        self.token_budget = token_budget
+        self.mmr_lambda = mmr_lambda
+        self.dedup_threshold = dedup_threshold
+        # Bullets come from the fixed knowledge base: embed each one once
+        self._vectors = {}
+        self._lock = threading.Lock()
+
+    def assemble(self, analysis_type, query, docs):
+        """
+        Context string for one prompt.
+
+        Args:
+            analysis_type: Used in the section title
+            query: The retrieval query the bullets are ranked against
+            docs: Retrieved documents, best first
+
+        Returns:
+            Bullet text within the token budget ("" if nothing was retrieved)
+        """
+        bullets = []
+        seen = set()
+        for rank, doc in enumerate(docs):
+            for heading, text in split_document(doc["content"]):
+                key = " ".join(text.lower().split())
+                if key not in seen:
+                    seen.add(key)
+                    bullets.append((heading, text, rank))
+        if not bullets:
+            return ""
+
+        relevance, similarity = self._scores(query, bullets)
+        title = f"**Expert Knowledge ({analysis_type.title()}):**"
+        chosen = self._select(bullets, relevance, similarity,
+                              self.token_budget - estimate_tokens(title))
+        return self._format(title, [bullets[i] for i in chosen])
+
+    def _scores(self, query, bullets):
+        """Relevance of each bullet to the query, and bullet-bullet similarity."""
+        if self.embed is None:
+            relevance = np.array([1.0 / (1 + rank) for _, _, rank in bullets])
+            texts = [text for _, text, _ in bullets]
+            similarity = np.array([[_token_overlap(a, b) for b in texts] for a in texts])
+            return relevance, similarity
+
+        # The heading gives short bullets ("Low pause frequency") their meaning
+        texts = [f"{heading} {text}" if heading else text for heading, text, _ in bullets]
+        with self._lock:
+            missing = [t for t in dict.fromkeys(texts) if t not in self._vectors]
+            if missing:
+                self._vectors.update(zip(missing, self.embed(missing)))
+            vectors = np.stack([self._vectors[t] for t in texts])
+        query_vector = self.embed([query])[0]
+        return vectors @ query_vector, vectors @ vectors.T
+
+    def _select(self, bullets, relevance, similarity, budget):
+        """Greedy MMR under the token budget; returns bullet indexes in pick order."""
+        chosen = []
+        headings = set()
+        redundancy = np.zeros(len(bullets))
+        remaining = np.ones(len(bullets), dtype=bool)
+
+        while remaining.any():
+            mmr = self.mmr_lambda * relevance - (1 - self.mmr_lambda) * redundancy
+            i = int(np.argmax(np.where(remaining, mmr, -np.inf)))
+            remaining[i] = False
+            if redundancy[i] >= self.dedup_threshold:
+                continue
+
+            heading, text, _ = bullets[i]
+            cost = estimate_tokens(f"- {text}")
+            if heading and heading not in headings:
+                cost += estimate_tokens(heading)
+            if cost > budget:
+                continue
+
+            chosen.append(i)
+            headings.add(heading)
+            budget -= cost
+            redundancy = np.maximum(redundancy, similarity[i])
+        return chosen
+
+    @staticmethod
+    def _format(title, chosen):
+        """Bullets grouped under their headings, in order of first pick."""
+        groups = {}
+        for heading, text, _ in chosen:
+            groups.setdefault(heading, []).append(text)
+        lines = [title]
+        for heading, texts in groups.items():
+            if heading:
+                lines.append(heading)
+            lines.extend(f"- {text}" for text in texts)
+        return "\n".join(lines) if chosen else ""
+
+
+# ---------------------------
+# Prompt size and latency
+# ---------------------------
+class PromptStats:
+    """Per-stage prompt tokens, context tokens and LLM latency."""
+
+    def __init__(self):
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track(self, stage, prompt, context=""):
+        """Time the LLM call in the `with` block and record the prompt size."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, estimate_tokens(prompt), estimate_tokens(context),
+                        time.perf_counter() - start)
+
+    def track_stream(self, stage, prompt, tokens, context=""):
+        """
+        Yield from a streamed LLM response, timing only the time spent
+        producing tokens (not the consumer's time between them). Recorded
+        when the stream ends or is closed.
+        """
+        seconds = 0.0
+        iterator = iter(tokens)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    token = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    seconds += time.perf_counter() - start
+                yield token
+        finally:
+            self.record(stage, estimate_tokens(prompt), estimate_tokens(context), seconds)
+
+    def record(self, stage, prompt_tokens, context_tokens, seconds):
+        with self._lock:
+            s = self._stages.setdefault(stage, {
+                "calls": 0, "prompt_tokens": 0, "context_tokens": 0,
+                "max_prompt_tokens": 0, "latency_sec": 0.0, "max_latency_sec": 0.0,
+            })
+            s["calls"] += 1
+            s["prompt_tokens"] += prompt_tokens
+            s["context_tokens"] += context_tokens
+            s["max_prompt_tokens"] = max(s["max_prompt_tokens"], prompt_tokens)
+            s["latency_sec"] += seconds
+            s["max_latency_sec"] = max(s["max_latency_sec"], seconds)
+
+    def stats(self):
+        with self._lock:
+            return {
+                stage: {
+                    "calls": s["calls"],
+                    "mean_prompt_tokens": round(s["prompt_tokens"] / s["calls"], 1),
+                    "max_prompt_tokens": s["max_prompt_tokens"],
+                    "mean_context_tokens": round(s["context_tokens"] / s["calls"], 1),
+                    "mean_latency_sec": round(s["latency_sec"] / s["calls"], 3),
+                    "max_latency_sec": round(s["max_latency_sec"], 3),
+                }
+                for stage, s in self._stages.items()
+            }
+
+
+prompt_stats = PromptStats()
+
+
+def track_prompt(stage, prompt, context=""):
+    """`with track_prompt("report", prompt, rag_context): llm.invoke(prompt)`"""
+    return prompt_stats.track(stage, prompt, context)
+
+
+def track_stream(stage, prompt, tokens, context=""):
+    """`for token in track_stream("report", prompt, llm.stream(prompt), rag_context): ...`"""
+    return prompt_stats.track_stream(stage, prompt, tokens, context)
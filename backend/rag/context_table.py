@@ -0,0 +1,230 @@
+# rag/context_table.py
+"""
+Precomputed retrieval contexts for analysis queries.
+
+get_context_for_analysis only looks at a few coarse buckets (speech-rate
+band, pause level, energy level, pitch band, weak areas, ...). Every
+combination is enumerated at index-build time, retrieved once, and stored
+in CONTEXT_TABLE_PATH. At runtime the retriever serves contexts from this
+table in memory; vector search only runs for combinations it has not seen.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+
+from rag.config import (
+    CHARS_PER_TOKEN,
+    CONTEXT_CANDIDATES,
+    CONTEXT_TABLE_PATH,
+    CONTEXT_TOKEN_BUDGET,
+    DEDUP_THRESHOLD,
+    HYBRID_RETRIEVAL,
+    MMR_LAMBDA,
+)
+
+# Weak areas reported by rag_pipeline, in canonical order
+WEAK_AREAS = (
+    "clarity",
+    "fluency",
+    "speech structure",
+    "confidence",
+    "nervousness reduction",
+    "assertiveness",
+)
+# What rag_pipeline asks for when no area is weak
+GENERAL_AREA = "general speaking skills"
+
+# Values the agents' prompts allow; other values fall back to vector search
+ENERGY_LEVELS = ("low", "medium", "medium-high", "high")
+LEVELS = ("low", "medium", "high")
+
+
+# ---------------------------
+# Buckets
+# ---------------------------
+def _number(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _label(value):
+    return str(value).strip().lower() if value else None
+
+
+def analysis_buckets(analysis_type, metrics):
+    """
+    Coarse buckets that determine the retrieval query (no raw numbers).
+
+    Returns:
+        Tuple of (name, value) pairs; None means "not provided"
+    """
+    if analysis_type == "communication":
+        rate = _number(metrics.get("speech_rate")) if metrics.get("speech_rate") else None
+        pause = _number(metrics.get("pause_ratio")) if metrics.get("pause_ratio") else None
+        return (
+            ("rate", None if rate is None else "slow" if rate < 120 else "fast" if rate > 160 else "normal"),
+            ("pause", None if pause is None else "high" if pause > 0.25 else "low"),
+            ("transcript", bool(metrics.get("transcript_preview"))),
+        )
+
+    if analysis_type == "confidence":
+        pitch = _number(metrics.get("pitch_variance")) if metrics.get("pitch_variance") else None
+        pause = _number(metrics.get("pause_ratio")) if metrics.get("pause_ratio") else None
+        return (
+            ("energy", _label(metrics.get("energy_level"))),
+            ("pitch", None if pitch is None else "high" if pitch > 40 else "low" if pitch < 10 else "normal"),
+            ("pause", None if pause is None else "high" if pause > 0.25 else "low"),
+        )
+
+    if analysis_type == "personality":
+        return (
+            ("fluency", _label(metrics.get("fluency_level"))),
+            ("confidence", _label(metrics.get("confidence_level"))),
+            ("emotion", _label(metrics.get("emotion"))),
+        )
+
+    if analysis_type == "improvement":
+        areas = [str(a).strip().lower() for a in metrics.get("weak_areas") or []]
+        known = [a for a in WEAK_AREAS if a in areas]
+        extra = sorted({a for a in areas if a not in WEAK_AREAS})
+        return (("areas", tuple(known + extra)),)
+
+    return ()
+
+
+def context_key(analysis_type, buckets):
+    parts = [analysis_type]
+    for name, value in buckets:
+        if isinstance(value, tuple):
+            value = ",".join(value)
+        parts.append(f"{name}={'' if value is None else value}")
+    return "|".join(parts)
+
+
+def build_query(analysis_type, buckets):
+    """Semantic query text for a bucket combination."""
+    b = dict(buckets)
+    parts = []
+
+    if analysis_type == "communication":
+        parts.append("speech communication clarity fluency vocabulary structure")
+        parts.append({
+            "slow": "slow speech rate thoughtful delivery",
+            "fast": "fast speech rate rapid delivery",
+            "normal": "normal speech rate optimal pacing",
+        }.get(b["rate"], ""))
+        parts.append({
+            "high": "high pause ratio hesitation disfluency",
+            "low": "good fluency smooth delivery",
+        }.get(b["pause"], ""))
+        if b["transcript"]:
+            parts.append("transcript analysis vocabulary assessment")
+
+    elif analysis_type == "confidence":
+        parts.append("confidence vocal delivery emotional tone")
+        if b["energy"]:
+            parts.append(f"{b['energy']} energy level projection")
+        parts.append({
+            "high": "high pitch variance nervous emotional",
+            "low": "low pitch variance monotone",
+            "normal": "normal pitch variance engaged speaking",
+        }.get(b["pitch"], ""))
+        parts.append({
+            "high": "hesitation pauses uncertainty",
+            "low": "confident pauses strategic",
+        }.get(b["pause"], ""))
+
+    elif analysis_type == "personality":
+        parts.append("personality traits communication style behavioral indicators")
+        if b["fluency"]:
+            parts.append(f"{b['fluency']} fluency expressiveness")
+        if b["confidence"]:
+            parts.append(f"{b['confidence']} confidence assertiveness")
+        if b["emotion"]:
+            parts.append(f"{b['emotion']} emotional state")
+
+    elif analysis_type == "improvement":
+        parts.append("improvement tips techniques recommendations")
+        if b["areas"]:
+            parts.extend(f"improve {area}" for area in b["areas"])
+        else:
+            parts.append("speaking skills confidence building clarity enhancement")
+
+    else:
+        parts.append("communication analysis speech evaluation")
+
+    return " ".join(p for p in parts if p)
+
+
+def key_space():
+    """Every (analysis_type, buckets) combination the agents can produce."""
+    for rate, pause, transcript in itertools.product(
+        (None, "slow", "normal", "fast"), (None, "high", "low"), (False, True)
+    ):
+        yield "communication", (("rate", rate), ("pause", pause), ("transcript", transcript))
+
+    for energy, pitch, pause in itertools.product(
+        (None,) + ENERGY_LEVELS, (None, "high", "low", "normal"), (None, "high", "low")
+    ):
+        yield "confidence", (("energy", energy), ("pitch", pitch), ("pause", pause))
+
+    for fluency, confidence in itertools.product((None,) + LEVELS, (None,) + LEVELS):
+        yield "personality", (("fluency", fluency), ("confidence", confidence), ("emotion", None))
+
+    for mask in itertools.product((False, True), repeat=len(WEAK_AREAS)):
+        areas = tuple(a for a, keep in zip(WEAK_AREAS, mask) if keep)
+        yield "improvement", (("areas", areas or (GENERAL_AREA,)),)
+    yield "improvement", (("areas", ()),)
+
+
+# ---------------------------
+# Table on disk
+# ---------------------------
+def knowledge_fingerprint(documents, embedding_model):
+    payload = json.dumps({
+        "embedding_model": embedding_model,
+        "hybrid": HYBRID_RETRIEVAL,
+        "assembly": [CONTEXT_CANDIDATES, CONTEXT_TOKEN_BUDGET, MMR_LAMBDA,
+                     DEDUP_THRESHOLD, CHARS_PER_TOKEN],
+        "documents": [[d["id"], d["category"], d["content"]] for d in documents],
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_context_table(documents, embedding_model, path=CONTEXT_TABLE_PATH):
+    """Contexts for the current knowledge base and encoder, or {} if missing / stale."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        table = json.load(f)
+    if table.get("knowledge") != knowledge_fingerprint(documents, embedding_model):
+        return {}
+    return table.get("contexts", {})
+
+
+def build_context_table(retriever, path=CONTEXT_TABLE_PATH):
+    """Retrieve every bucket combination once and save the table."""
+    combinations = list(key_space())
+    results = retriever.search_contexts([
+        (analysis_type, build_query(analysis_type, buckets))
+        for analysis_type, buckets in combinations
+    ])
+    contexts = {
+        context_key(analysis_type, buckets): context
+        for (analysis_type, buckets), context in zip(combinations, results)
+    }
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({
+            "knowledge": knowledge_fingerprint(
+                retriever.knowledge_base.get_all_documents(), retriever.embedding_model
+            ),
+            "contexts": contexts,
+        }, f, indent=2)
+    os.replace(tmp, path)
+
+    print(f"✅ Precomputed {len(contexts)} retrieval contexts")
+    return contexts
@@ -0,0 +1,154 @@
+# rag/embedding_cache.py
+"""
+LRU cache for query embeddings.
+
+Retrieval queries come from a small phrase vocabulary, so the same text is
+embedded over and over. The cache is keyed on (embedding model, normalized
+query text), bounded by the bytes of the vectors it holds, shared by every
+retriever instance in the process (it survives /rag/reload) and optionally
+saved to EMBEDDING_CACHE_PATH so a restarted server starts warm.
+"""
+
+import atexit
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from rag.config import EMBEDDING_CACHE_MAX_BYTES, EMBEDDING_CACHE_PATH
+
+
+def normalize_query(text):
+    # MiniLM's tokenizer is uncased and ignores runs of whitespace
+    return " ".join(text.lower().split())
+
+
+class EmbeddingCache:
+    """Thread-safe LRU of float32 vectors, bounded by total bytes."""
+
+    def __init__(self, max_bytes=EMBEDDING_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, key, vector):
+        vector = np.array(vector, dtype=np.float32)
+        if vector.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            self._entries[key] = vector
+            self.nbytes += vector.nbytes
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+    # ---------------------------
+    # Disk persistence
+    # ---------------------------
+    def save(self, path=EMBEDDING_CACHE_PATH):
+        """Write entries (least recently used first) to an .npz file."""
+        if not path:
+            return
+        with self._lock:
+            keys = list(self._entries)
+            vectors = list(self._entries.values())
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, keys=np.array(json.dumps(keys)),
+                 vectors=np.stack(vectors) if vectors else np.zeros((0, 0), np.float32))
+        os.replace(tmp, path)
+
+    def load(self, path=EMBEDDING_CACHE_PATH):
+        """Add entries saved by `save`; missing or unreadable files are ignored."""
+        if not path or not os.path.exists(path):
+            return 0
+        try:
+            with np.load(path) as data:
+                keys = json.loads(str(data["keys"]))
+                vectors = data["vectors"]
+        except Exception as e:
+            print(f"⚠️ Could not read embedding cache {path}: {e}")
+            return 0
+        for key, vector in zip(keys, vectors):
+            self.put(tuple(key), vector)
+        return len(keys)
+
+
+class CachedEmbeddingFunction:
+    """Wraps an EmbeddingFunction; only texts not in the cache are embedded."""
+
+    def __init__(self, embed, cache):
+        self.embed = embed
+        self.cache = cache
+        self.name = embed.name
+        self.model = embed.model
+
+    def __call__(self, texts):
+        # Backends can differ numerically (e.g. quantized), so both go in the key
+        model_id = f"{self.name}/{self.model}"
+        keys = [(model_id, normalize_query(text)) for text in texts]
+        vectors = [self.cache.get(key) for key in keys]
+
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            # Embed each distinct missing text once, in one batch
+            unique = list(dict.fromkeys(keys[i] for i in missing))
+            fresh = dict(zip(unique, self.embed([text for _, text in unique])))
+            for key, vector in fresh.items():
+                self.cache.put(key, vector)
+            for i in missing:
+                vectors[i] = fresh[keys[i]]
+
+        if not vectors:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack(vectors)
+
+
+_query_cache = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_cache():
+    """Process-wide query embedding cache (loaded from disk on first use)."""
+    global _query_cache
+    with _query_cache_lock:
+        if _query_cache is None:
+            _query_cache = EmbeddingCache()
+            loaded = _query_cache.load()
+            if loaded:
+                print(f"✅ Loaded {loaded} cached query embeddings")
+            if EMBEDDING_CACHE_PATH:
+                atexit.register(_query_cache.save)
+        return _query_cache
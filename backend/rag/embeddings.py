@@ -0,0 +1,199 @@
+# rag/embeddings.py
+"""
+Pluggable embedding backends for the RAG indexes.
+
+Every backend produces all-MiniLM-L6-v2 sentence embeddings, the model
+ChromaDB embeds with by default, so indexes rank documents the same way:
+
+- "chroma": ChromaDB's bundled ONNX function (fp32)
+- "sentence-transformers": the original PyTorch model
+- "onnx": our ONNX Runtime runner on the fp32 export, with ONNX_THREADS
+  threads and batches of ONNX_BATCH_SIZE
+- "onnx-int8": the same runner on an int8 dynamically quantized copy
+  (quantized once on first use into ONNX_INT8_PATH)
+
+The index build and query paths both call get_embedding_function with
+EMBEDDING_BACKEND, and each backend's `model` id is recorded in the index
+metadata, so switching backends re-embeds instead of mixing vector spaces.
+
+Embeddings are returned as L2-normalized float32 rows, so cosine
+similarity is a dot product.
+"""
+
+import os
+
+import numpy as np
+
+from rag.config import (
+    DEFAULT_EMBEDDING_MODEL,
+    ONNX_BATCH_SIZE,
+    ONNX_INT8_PATH,
+    ONNX_MAX_LENGTH,
+    ONNX_MODEL_DIR,
+    ONNX_THREADS,
+)
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class EmbeddingFunction:
+    """Callable: list of texts → (n, dim) float32 array of unit vectors."""
+
+    def __init__(self, name, encode, model=DEFAULT_EMBEDDING_MODEL):
+        self.name = name
+        self.model = model
+        self._encode = encode
+
+    def __call__(self, texts):
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        return _normalize(self._encode(list(texts)))
+
+
+def _chroma_backend():
+    from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+    model = ONNXMiniLM_L6_V2()
+    return EmbeddingFunction("chroma", model)
+
+
+def _sentence_transformers_backend():
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer(f"sentence-transformers/{DEFAULT_EMBEDDING_MODEL}")
+    return EmbeddingFunction(
+        "sentence-transformers",
+        lambda texts: model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
+    )
+
+
+# ---------------------------
+# ONNX Runtime (fp32 / int8)
+# ---------------------------
+class OnnxEncoder:
+    """MiniLM ONNX model + tokenizer: tokenize, run in batches, mean-pool."""
+
+    def __init__(self, model_path, tokenizer_path, threads=ONNX_THREADS,
+                 batch_size=ONNX_BATCH_SIZE, max_length=ONNX_MAX_LENGTH):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+        self.batch_size = batch_size
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            model_path, options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _run(self, texts):
+        encoded = self.tokenizer.encode_batch(texts)
+        ids = np.array([e.ids for e in encoded], dtype=np.int64)
+        mask = np.array([e.attention_mask for e in encoded], dtype=np.int64)
+        feeds = {"input_ids": ids, "attention_mask": mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(ids)
+
+        hidden = self.session.run(None, feeds)[0]
+        weights = mask[:, :, None].astype(np.float32)
+        return (hidden * weights).sum(axis=1) / np.maximum(weights.sum(axis=1), 1e-9)
+
+    def __call__(self, texts):
+        return np.concatenate([
+            self._run(texts[i:i + self.batch_size])
+            for i in range(0, len(texts), self.batch_size)
+        ])
+
+
+def _onnx_files():
+    """fp32 model + tokenizer, fetched through ChromaDB's downloader if missing."""
+    model_path = os.path.join(ONNX_MODEL_DIR, "model.onnx")
+    tokenizer_path = os.path.join(ONNX_MODEL_DIR, "tokenizer.json")
+    if not os.path.exists(model_path):
+        try:
+            from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+            ONNXMiniLM_L6_V2()(["warmup"])
+        except ImportError:
+            pass
+        except Exception as e:
+            # Offline, proxy, checksum...: the backend is just unavailable
+            print(f"⚠️ MiniLM ONNX download failed: {e}")
+    if not (os.path.exists(model_path) and os.path.exists(tokenizer_path)):
+        raise FileNotFoundError(f"MiniLM ONNX model not found in {ONNX_MODEL_DIR}")
+    return model_path, tokenizer_path
+
+
+def quantize_model(model_path, output_path=ONNX_INT8_PATH):
+    """int8 dynamic quantization of the fp32 export (weights only)."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    tmp = output_path + ".tmp"
+    quantize_dynamic(model_path, tmp, weight_type=QuantType.QInt8)
+    os.replace(tmp, output_path)
+    print(f"✅ Quantized embedding model written to {output_path}")
+    return output_path
+
+
+def _onnx_backend():
+    model_path, tokenizer_path = _onnx_files()
+    return EmbeddingFunction("onnx", OnnxEncoder(model_path, tokenizer_path))
+
+
+def _onnx_int8_backend():
+    model_path, tokenizer_path = _onnx_files()
+    if not os.path.exists(ONNX_INT8_PATH):
+        quantize_model(model_path, ONNX_INT8_PATH)
+    return EmbeddingFunction(
+        "onnx-int8",
+        OnnxEncoder(ONNX_INT8_PATH, tokenizer_path),
+        model=f"{DEFAULT_EMBEDDING_MODEL}-int8"
+    )
+
+
+BACKENDS = {
+    "chroma": _chroma_backend,
+    "sentence-transformers": _sentence_transformers_backend,
+    "onnx": _onnx_backend,
+    "onnx-int8": _onnx_int8_backend,
+}
+
+# Tried in this order when no backend is configured (fp32 only: int8 has its
+# own model id and quantizes on first use, so it must be chosen explicitly)
+AUTO_BACKENDS = ("chroma", "sentence-transformers", "onnx")
+
+_cache = {}
+
+
+def get_embedding_function(backend=None):
+    """
+    Shared embedding function, loaded on first use.
+
+    Args:
+        backend: A BACKENDS key; None tries AUTO_BACKENDS in order
+
+    Returns:
+        EmbeddingFunction, or None if no backend is installed
+    """
+    key = backend or "auto"
+    if key not in _cache:
+        _cache[key] = None
+        for name in [backend] if backend else AUTO_BACKENDS:
+            try:
+                _cache[key] = BACKENDS[name]()
+                break
+            except (ImportError, FileNotFoundError):
+                continue
+        if _cache[key] is None:
+            print("⚠️ No embedding backend installed (pip install chromadb)")
+    return _cache[key]
@@ -0,0 +1,138 @@
+# rag/ingest.py
+"""
+Document ingestion for the runtime index.
+
+Two sources feed the same index:
+- KNOWLEDGE_DOCUMENTS in knowledge_base.py (one chunk each, ids kept)
+- rag/documents/*.md, split into CHUNK_SIZE-character chunks
+
+Markdown chunk ids are derived from their content hash, so adding or
+editing a file only produces new ids for the chunks that actually changed;
+build_index re-embeds those and keeps every other vector. The category of
+a markdown file is its name up to the first underscore
+(`confidence_psychology.md` → "confidence").
+
+Embedding runs in batches of EMBED_BATCH_SIZE across EMBED_WORKERS threads
+(the ONNX / torch runtimes release the GIL while they compute).
+"""
+
+import hashlib
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from rag.config import (
+    CHUNK_OVERLAP,
+    CHUNK_SIZE,
+    DOCUMENTS_DIR,
+    EMBED_BATCH_SIZE,
+    EMBED_WORKERS,
+)
+
+CATEGORIES = ("communication", "confidence", "personality", "improvement")
+
+
+# ---------------------------
+# Chunking
+# ---------------------------
+def _split_long(paragraph, size):
+    """Break a paragraph longer than `size` on word boundaries."""
+    pieces, current = [], ""
+    for word in paragraph.split(" "):
+        if current and len(current) + 1 + len(word) > size:
+            pieces.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _tail(text, overlap):
+    """Last `overlap` characters of a chunk, starting at a word boundary."""
+    if overlap <= 0 or len(text) <= overlap:
+        return ""
+    tail = text[-overlap:]
+    return tail[tail.find(" ") + 1:] if " " in tail else tail
+
+
+def chunk_text(text, size=CHUNK_SIZE, overlap=CHUNK_OVERLAP):
+    """
+    Split text into chunks of at most ~`size` characters.
+
+    Paragraphs (blank-line separated) are kept whole where they fit; each
+    chunk after the first starts with the last `overlap` characters of the
+    previous one.
+    """
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+    pieces = [piece for p in paragraphs for piece in (_split_long(p, size) if len(p) > size else [p])]
+
+    chunks, current = [], ""
+    for piece in pieces:
+        if current and len(current) + 2 + len(piece) > size:
+            chunks.append(current)
+            tail = _tail(current, overlap)
+            current = f"{tail}\n\n{piece}" if tail else piece
+        else:
+            current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _category(filename):
+    prefix = os.path.splitext(filename)[0].split("_")[0].lower()
+    return prefix if prefix in CATEGORIES else "general"
+
+
+def load_markdown_documents(doc_dir=DOCUMENTS_DIR):
+    """Chunks of every markdown file in `doc_dir`, as knowledge documents."""
+    if not os.path.isdir(doc_dir):
+        return []
+
+    documents = []
+    for filename in sorted(os.listdir(doc_dir)):
+        if not filename.endswith(".md"):
+            continue
+        with open(os.path.join(doc_dir, filename), encoding="utf-8") as f:
+            text = f.read()
+
+        stem = os.path.splitext(filename)[0]
+        seen = set()
+        for chunk in chunk_text(text):
+            digest = hashlib.sha256(chunk.encode("utf-8")).hexdigest()[:12]
+            doc_id = f"md:{stem}:{digest}"
+            if doc_id in seen:  # same chunk twice in one file
+                continue
+            seen.add(doc_id)
+            documents.append({
+                "id": doc_id,
+                "category": _category(filename),
+                "content": chunk,
+                "source": filename,
+            })
+    return documents
+
+
+# ---------------------------
+# Embedding
+# ---------------------------
+def embed_documents(documents, embed, batch_size=EMBED_BATCH_SIZE, workers=EMBED_WORKERS):
+    """
+    Embed document contents in batches across worker threads.
+
+    Returns:
+        (len(documents), dim) float32 array, in document order
+    """
+    texts = [doc["content"] for doc in documents]
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    if len(batches) == 1 or workers <= 1:
+        return np.concatenate([embed(batch) for batch in batches])
+    with ThreadPoolExecutor(max_workers=min(workers, len(batches))) as pool:
+        return np.concatenate(list(pool.map(embed, batches)))
@@ -4,6 +4,9 @@ Knowledge Base for Speech Analysis RAG System
 Contains expert knowledge about communication, confidence, and personality analysis
 """
 
+from rag.config import DOCUMENTS_DIR
+from rag.ingest import load_markdown_documents
+
 # Expert knowledge documents for RAG retrieval
 KNOWLEDGE_DOCUMENTS = [
     # Communication Analysis Knowledge
@@ -145,8 +148,10 @@ KNOWLEDGE_DOCUMENTS = [
 class KnowledgeBase:
     """Manages the knowledge documents for RAG retrieval"""
     
-    def __init__(self):
-        self.documents = KNOWLEDGE_DOCUMENTS
+    def __init__(self, doc_dir=DOCUMENTS_DIR):
+        # Built-in documents plus chunks of rag/documents/*.md (re-read on
+        # every construction, so a new KnowledgeBase picks up edited files)
+        self.documents = KNOWLEDGE_DOCUMENTS + load_markdown_documents(doc_dir)
     
     def get_all_documents(self):
         """Return all knowledge documents"""
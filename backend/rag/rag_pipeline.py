@@ -1,23 +1,21 @@
 from rag.retriever import get_retriever
+from rag.context_assembler import track_prompt, track_stream
 from llm1.local_llm import get_llm
 from llm1.prompt_templates import REPORT_PROMPT
 
 # Import GuardrailsAI for report validation
 try:
-    from guardrails_config import validate_final_report
+    from guardrails_config import validate_final_report, validate_report_stream
     GUARDRAILS_AVAILABLE = True
 except ImportError:
     GUARDRAILS_AVAILABLE = False
     def validate_final_report(x): return x
+    def validate_report_stream(tokens): return tokens
 
 
-def rag_enhanced_report(agent_outputs: dict) -> str:
-    """
-    Generate a RAG-enhanced report using retrieved knowledge.
-    Uses the custom RAGRetriever API (not LangChain's invoke).
-    """
+def _report_prompt(agent_outputs: dict):
+    """Report prompt with targeted improvement knowledge; returns (prompt, rag_context)."""
     retriever = get_retriever()
-    llm = get_llm()
     
     # Extract analysis results to identify weak areas for targeted improvements
     comm = agent_outputs.get("communication_analysis", {})
@@ -59,10 +57,39 @@ def rag_enhanced_report(agent_outputs: dict) -> str:
         rag_context=rag_context if rag_context else "No specific recommendations available.",
         agent_outputs=agent_outputs
     )
+    return prompt, rag_context
+
+
+def rag_enhanced_report(agent_outputs: dict) -> str:
+    """
+    Generate a RAG-enhanced report using retrieved knowledge.
+    Uses the custom RAGRetriever API (not LangChain's invoke).
+    """
+    prompt, rag_context = _report_prompt(agent_outputs)
+    llm = get_llm()
 
-    report = llm.invoke(prompt)
+    with track_prompt("report", prompt, rag_context):
+        report = llm.invoke(prompt)
     
     # Validate final report with guardrails
     validated_report = validate_final_report(report)
     
     return validated_report
+
+
+def stream_rag_enhanced_report(agent_outputs: dict):
+    """
+    Same report as `rag_enhanced_report`, yielded as it is generated.
+    Each sentence is checked by the guardrails before it is yielded.
+    """
+    prompt, rag_context = _report_prompt(agent_outputs)
+    llm = get_llm()
+
+    # LangChain LLMs stream text chunks; the stub LLM only has invoke.
+    # Only generation is timed, not the time the client takes to read.
+    if hasattr(llm, "stream"):
+        tokens = track_stream("report", prompt, llm.stream(prompt), rag_context)
+    else:
+        with track_prompt("report", prompt, rag_context):
+            tokens = [llm.invoke(prompt)]
+    yield from validate_report_stream(tokens)
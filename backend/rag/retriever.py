@@ -1,11 +1,15 @@
 # rag/retriever.py
 """
-RAG Retriever - Uses ChromaDB for retrieval
-ChromaDB uses its own built-in embeddings (all-MiniLM-L6-v2) for fast local retrieval
+RAG Retriever - In-process NumPy index (default) or ChromaDB for retrieval
+Both embed with all-MiniLM-L6-v2. The NumPy index (VECTOR_INDEX_DIR) is a
+memory-mapped matrix searched in-process; the ChromaDB index is persisted in
+CHROMA_PERSIST_DIR. Either is only rebuilt when documents change.
 """
 
 import os
-from typing import List, Dict, Optional
+import threading
+import time
+from typing import List, Dict, Optional, Tuple
 
 try:
     import chromadb
@@ -17,72 +21,131 @@ except ImportError:
 from rag.config import (
     CHROMA_PERSIST_DIR, 
     COLLECTION_NAME, 
-    TOP_K_RESULTS
+    CONTEXT_CANDIDATES,
+    DEFAULT_EMBEDDING_MODEL,
+    EMBEDDING_BACKEND,
+    HYBRID_CANDIDATES,
+    HYBRID_RETRIEVAL,
+    RAG_BUILD_ON_START,
+    TOP_K_RESULTS,
+    VECTOR_BACKEND
 )
 from rag.knowledge_base import KnowledgeBase
+from rag.bm25 import KeywordIndex, reciprocal_rank_fusion
+from rag.build_index import (
+    build_chroma_index,
+    build_numpy_index,
+    build_runtime_index,
+    index_is_current,
+    numpy_index_is_current,
+)
+from rag.embeddings import get_embedding_function
+from rag.embedding_cache import CachedEmbeddingFunction, get_query_cache
+from rag.vector_index import NumpyVectorIndex
+from rag.context_assembler import ContextAssembler, prompt_stats
+from rag.context_table import (
+    analysis_buckets,
+    build_context_table,
+    build_query,
+    context_key,
+    load_context_table,
+)
 
 
 class RAGRetriever:
     """
     Retrieval Augmented Generation system using:
-    - ChromaDB for vector storage (uses built-in all-MiniLM-L6-v2 embeddings)
+    - NumPy vector index (VECTOR_BACKEND="numpy") or ChromaDB for vector storage
+    - BM25 keyword index (fallback, or fused with vector results when RAG_HYBRID=1)
     - Local knowledge base
     """
     
     def __init__(self):
         self.knowledge_base = KnowledgeBase()
+        self.keyword_index = KeywordIndex(self.knowledge_base.get_all_documents())
         self.collection = None
+        self.vector_index = None
+        self.embed = None
+        self.query_cache = get_query_cache()
         self._initialized = False
+        self.startup_time = None
+        self.context_table = {}
+        self.context_misses = 0
         
         # Initialize vector store
         self._setup_vector_store()
+        self.assembler = ContextAssembler(self.embed)
+        self._load_context_table()
     
     def _setup_vector_store(self):
-        """Setup ChromaDB vector store with built-in embeddings"""
+        """Open the runtime index (built by `python -m rag.build_index`)"""
+        if VECTOR_BACKEND == "numpy":
+            self._setup_numpy_index()
+            return
+        
         if not CHROMA_AVAILABLE:
             print("⚠️ ChromaDB not available, using fallback retrieval")
             return
         
+        started = time.perf_counter()
         try:
-            # Use in-memory client for speed and simplicity
-            self.client = chromadb.Client()
-            
-            # Get or create collection (uses default embedding function)
-            self.collection = self.client.get_or_create_collection(
-                name=COLLECTION_NAME,
-                metadata={"description": "Speech analysis knowledge base"}
-            )
+            # Re-embed only when the knowledge base changed since the last build
+            if not index_is_current(self.knowledge_base.get_all_documents()):
+                if not RAG_BUILD_ON_START:
+                    print("⚠️ ChromaDB index missing or stale; run `python -m rag.build_index` "
+                          "(or set RAG_BUILD_ON_START=1)")
+                    return
+                build_chroma_index()
             
-            # Index documents if collection is empty
-            if self.collection.count() == 0:
-                self._index_documents()
+            self.client = chromadb.PersistentClient(path=CHROMA_PERSIST_DIR)
+            self.collection = self.client.get_collection(name=COLLECTION_NAME)
+            self.embed = self._cached_embedding_function()
             
             self._initialized = True
-            print(f"✅ ChromaDB initialized with {self.collection.count()} documents")
+            self.startup_time = time.perf_counter() - started
+            print(f"✅ ChromaDB opened with {self.collection.count()} documents "
+                  f"in {self.startup_time * 1000:.0f} ms")
             
         except Exception as e:
             print(f"⚠️ ChromaDB setup failed: {e}")
             self._initialized = False
     
-    def _index_documents(self):
-        """Index knowledge base documents into ChromaDB"""
-        if self.collection is None:
+    @property
+    def embedding_model(self) -> str:
+        """Model id query vectors come from (Chroma's default without a backend)"""
+        return self.embed.model if self.embed else DEFAULT_EMBEDDING_MODEL
+    
+    def _cached_embedding_function(self):
+        """Query embedding function behind the LRU cache (None if no backend)"""
+        embed = get_embedding_function(EMBEDDING_BACKEND)
+        return CachedEmbeddingFunction(embed, self.query_cache) if embed else None
+    
+    def _setup_numpy_index(self):
+        """Open the memory-mapped NumPy index"""
+        self.embed = self._cached_embedding_function()
+        if self.embed is None:
+            print("⚠️ No embedding backend, using fallback retrieval")
             return
         
-        documents = self.knowledge_base.get_all_documents()
-        
-        texts = [doc["content"] for doc in documents]
-        ids = [doc["id"] for doc in documents]
-        metadatas = [{"category": doc["category"]} for doc in documents]
-        
-        # Use ChromaDB's default embedding (all-MiniLM-L6-v2)
-        self.collection.add(
-            documents=texts,
-            ids=ids,
-            metadatas=metadatas
-        )
-        
-        print(f"📚 Indexed {len(documents)} knowledge documents")
+        started = time.perf_counter()
+        try:
+            if not numpy_index_is_current(self.knowledge_base.get_all_documents()):
+                if not RAG_BUILD_ON_START:
+                    print("⚠️ Vector index missing or stale; run `python -m rag.build_index` "
+                          "(or set RAG_BUILD_ON_START=1)")
+                    return
+                build_numpy_index()
+            
+            self.vector_index = NumpyVectorIndex.load()
+            
+            self._initialized = True
+            self.startup_time = time.perf_counter() - started
+            print(f"✅ Vector index opened with {len(self.vector_index)} documents "
+                  f"in {self.startup_time * 1000:.0f} ms")
+            
+        except Exception as e:
+            print(f"⚠️ Vector index setup failed: {e}")
+            self._initialized = False
     
     def retrieve(self, query: str, top_k: int = TOP_K_RESULTS, 
                  category_filter: Optional[str] = None) -> List[Dict]:
@@ -97,60 +160,108 @@ class RAGRetriever:
         Returns:
             List of relevant document dictionaries
         """
+        return self.retrieve_batch([query], top_k, [category_filter])[0]
+    
+    def retrieve_batch(self, queries: List[str], top_k: int = TOP_K_RESULTS,
+                       category_filters: Optional[List[Optional[str]]] = None) -> List[List[Dict]]:
+        """
+        Retrieve for several queries at once: one embedding pass for all of
+        them, and one vector-store query per category.
+        
+        Args:
+            queries: Search queries
+            top_k: Number of results per query
+            category_filters: Optional category per query (None = unfiltered)
+            
+        Returns:
+            One list of document dictionaries per query
+        """
+        category_filters = category_filters or [None] * len(queries)
+        if not HYBRID_RETRIEVAL or not self._initialized:
+            return self._vector_batch(queries, top_k, category_filters)
+        
+        # Hybrid: fuse vector and BM25 rankings over a wider candidate pool
+        candidates = max(top_k, HYBRID_CANDIDATES)
+        fused_docs = []
+        vector_results = self._vector_batch(queries, candidates, category_filters)
+        for query, category, vector_docs in zip(queries, category_filters, vector_results):
+            keyword_docs = self._fallback_retrieve(query, candidates, category)
+            by_id = {doc["id"]: doc for doc in keyword_docs + vector_docs}
+            fused = reciprocal_rank_fusion([
+                [doc["id"] for doc in vector_docs],
+                [doc["id"] for doc in keyword_docs],
+            ])
+            fused_docs.append([by_id[doc_id] for doc_id in fused[:top_k]])
+        return fused_docs
+    
+    def _vector_batch(self, queries: List[str], top_k: int,
+                      category_filters: List[Optional[str]]) -> List[List[Dict]]:
+        """Vector search on the active backend (keyword fallback if unavailable)"""
+        if self.vector_index is not None:
+            return self._numpy_batch(queries, top_k, category_filters)
+        
         if not self._initialized or self.collection is None:
             # Fallback: keyword-based retrieval
-            return self._fallback_retrieve(query, top_k, category_filter)
+            return [self._fallback_retrieve(q, top_k, c) for q, c in zip(queries, category_filters)]
         
         try:
-            # Build query parameters
-            where_filter = {"category": category_filter} if category_filter else None
+            retrieved = [[] for _ in queries]
             
-            # Use ChromaDB's built-in text query (uses default embeddings)
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=top_k,
-                where=where_filter
-            )
+            # Embed every query once (through the cache) when we have the
+            # embedding function; otherwise ChromaDB embeds the texts itself
+            vectors = self.embed(queries).tolist() if self.embed else None
             
-            # Format results
-            retrieved_docs = []
-            if results and results['documents']:
-                for i, doc in enumerate(results['documents'][0]):
-                    retrieved_docs.append({
-                        "content": doc,
-                        "id": results['ids'][0][i] if results['ids'] else None,
-                        "category": results['metadatas'][0][i].get('category') if results['metadatas'] else None,
-                        "distance": results['distances'][0][i] if results.get('distances') else None
-                    })
+            # One ChromaDB query per category, with every query of that category
+            groups = {}
+            for i, category in enumerate(category_filters):
+                groups.setdefault(category, []).append(i)
+            
+            for category, rows in groups.items():
+                query = (
+                    {"query_embeddings": [vectors[i] for i in rows]} if vectors
+                    else {"query_texts": [queries[i] for i in rows]}
+                )
+                results = self.collection.query(
+                    n_results=top_k,
+                    where={"category": category} if category else None,
+                    **query
+                )
+                
+                # Format results
+                if not results or not results['documents']:
+                    continue
+                for j, i in enumerate(rows):
+                    for k, doc in enumerate(results['documents'][j]):
+                        retrieved[i].append({
+                            "content": doc,
+                            "id": results['ids'][j][k] if results['ids'] else None,
+                            "category": results['metadatas'][j][k].get('category') if results['metadatas'] else None,
+                            "distance": results['distances'][j][k] if results.get('distances') else None
+                        })
             
-            return retrieved_docs
+            return retrieved
             
         except Exception as e:
             print(f"⚠️ Retrieval error: {e}")
-            return self._fallback_retrieve(query, top_k, category_filter)
+            return [self._fallback_retrieve(q, top_k, c) for q, c in zip(queries, category_filters)]
+    
+    def _numpy_batch(self, queries: List[str], top_k: int,
+                     category_filters: List[Optional[str]]) -> List[List[Dict]]:
+        """Brute-force cosine search over the in-process NumPy index"""
+        try:
+            query_vectors = self.embed(queries)
+            return [
+                [self.vector_index.document(row, score)
+                 for row, score in self.vector_index.search(vector, top_k, category)]
+                for vector, category in zip(query_vectors, category_filters)
+            ]
+        except Exception as e:
+            print(f"⚠️ Retrieval error: {e}")
+            return [self._fallback_retrieve(q, top_k, c) for q, c in zip(queries, category_filters)]
     
     def _fallback_retrieve(self, query: str, top_k: int, 
                            category_filter: Optional[str] = None) -> List[Dict]:
-        """Fallback keyword-based retrieval when vector store unavailable"""
-        documents = self.knowledge_base.get_all_documents()
-        
-        # Filter by category if specified
-        if category_filter:
-            documents = [d for d in documents if d["category"] == category_filter]
-        
-        # Simple keyword matching
-        query_words = query.lower().split()
-        scored_docs = []
-        
-        for doc in documents:
-            content_lower = doc["content"].lower()
-            score = sum(1 for word in query_words if word in content_lower)
-            if score > 0:
-                scored_docs.append((score, doc))
-        
-        # Sort by score and return top_k
-        scored_docs.sort(key=lambda x: x[0], reverse=True)
-        
+        """BM25 keyword retrieval (used when the vector store is unavailable)"""
         return [
             {
                 "content": doc["content"],
@@ -158,7 +269,7 @@ class RAGRetriever:
                 "category": doc["category"],
                 "distance": None
             }
-            for score, doc in scored_docs[:top_k]
+            for doc, score in self.keyword_index.search(query, top_k, category_filter)
         ]
     
     def get_context_for_analysis(self, analysis_type: str, metrics: Dict) -> str:
@@ -172,97 +283,91 @@ class RAGRetriever:
         Returns:
             Formatted context string for LLM prompt augmentation
         """
-        # Build rich semantic query based on analysis type and ALL metrics
-        query_parts = []
+        return self.retrieve_many({analysis_type: (analysis_type, metrics)})[analysis_type]
+    
+    def retrieve_many(self, requests: Dict[str, Tuple[str, Dict]]) -> Dict[str, str]:
+        """
+        Contexts for several analyses in one call (e.g. all agents of a request)
         
-        if analysis_type == "communication":
-            query_parts.append("speech communication clarity fluency vocabulary structure")
-            if metrics.get('speech_rate'):
-                rate = metrics['speech_rate']
-                # Add context based on rate range
-                if isinstance(rate, (int, float)):
-                    if rate < 120:
-                        query_parts.append("slow speech rate thoughtful delivery")
-                    elif rate > 160:
-                        query_parts.append("fast speech rate rapid delivery")
-                    else:
-                        query_parts.append("normal speech rate optimal pacing")
-                query_parts.append(f"{rate} words per minute WPM")
-            if metrics.get('pause_ratio'):
-                pause = metrics['pause_ratio']
-                if isinstance(pause, (int, float)):
-                    if pause > 0.25:
-                        query_parts.append("high pause ratio hesitation disfluency")
-                    else:
-                        query_parts.append("good fluency smooth delivery")
-            if metrics.get('transcript_preview'):
-                query_parts.append("transcript analysis vocabulary assessment")
-                
-        elif analysis_type == "confidence":
-            query_parts.append("confidence vocal delivery emotional tone")
-            if metrics.get('energy_level'):
-                energy = str(metrics['energy_level']).lower()
-                query_parts.append(f"{energy} energy level projection")
-            if metrics.get('pitch_variance'):
-                pitch = metrics['pitch_variance']
-                if isinstance(pitch, (int, float)):
-                    if pitch > 40:
-                        query_parts.append("high pitch variance nervous emotional")
-                    elif pitch < 10:
-                        query_parts.append("low pitch variance monotone")
-                    else:
-                        query_parts.append("normal pitch variance engaged speaking")
-            if metrics.get('pause_ratio'):
-                pause = metrics['pause_ratio']
-                if isinstance(pause, (int, float)):
-                    if pause > 0.25:
-                        query_parts.append("hesitation pauses uncertainty")
-                    else:
-                        query_parts.append("confident pauses strategic")
-                        
-        elif analysis_type == "personality":
-            query_parts.append("personality traits communication style behavioral indicators")
-            if metrics.get('fluency_level'):
-                query_parts.append(f"{metrics['fluency_level']} fluency expressiveness")
-            if metrics.get('confidence_level'):
-                query_parts.append(f"{metrics['confidence_level']} confidence assertiveness")
-            if metrics.get('emotion'):
-                query_parts.append(f"{metrics['emotion']} emotional state")
-                
-        elif analysis_type == "improvement":
-            query_parts.append("improvement tips techniques recommendations")
-            # Add specific improvement areas based on metrics
-            if metrics.get('weak_areas'):
-                for area in metrics['weak_areas']:
-                    query_parts.append(f"improve {area}")
-            else:
-                query_parts.append("speaking skills confidence building clarity enhancement")
-        else:
-            query_parts.append("communication analysis speech evaluation")
+        Args:
+            requests: {name: (analysis_type, metrics)}
+            
+        Returns:
+            {name: formatted context string}
+        """
+        # The query only depends on coarse buckets of the metrics, so every
+        # known combination is served from the precomputed table
+        keys = {}
+        misses = {}
+        for name, (analysis_type, metrics) in requests.items():
+            buckets = analysis_buckets(analysis_type, metrics)
+            keys[name] = context_key(analysis_type, buckets)
+            if keys[name] not in self.context_table:
+                misses[keys[name]] = (analysis_type, build_query(analysis_type, buckets))
+        
+        if misses:
+            # Unseen combinations (e.g. an unexpected label): search them in
+            # one batch and remember the results
+            self.context_misses += len(misses)
+            contexts = self.search_contexts(list(misses.values()))
+            self.context_table.update(zip(misses, contexts))
+        
+        return {name: self.context_table[key] for name, key in keys.items()}
+    
+    def search_context(self, analysis_type: str, query: str) -> str:
+        """Retrieve and format the context for one query (vector search)"""
+        return self.search_contexts([(analysis_type, query)])[0]
+    
+    def search_contexts(self, items: List[Tuple[str, str]]) -> List[str]:
+        """
+        Retrieve and assemble contexts for (analysis_type, query) pairs, batched
         
-        query = " ".join(query_parts)
+        Returns:
+            One context string per item (deduplicated bullets within the
+            token budget, see rag/context_assembler.py)
+        """
+        queries = [query for _, query in items]
         
-        # Retrieve relevant documents
-        docs = self.retrieve(query, top_k=TOP_K_RESULTS, category_filter=analysis_type)
+        # Retrieve candidate documents; the assembler picks their best bullets
+        docs = self.retrieve_batch(queries, CONTEXT_CANDIDATES, [t for t, _ in items])
         
-        if not docs:
-            # Try without category filter for broader results
-            docs = self.retrieve(query, top_k=TOP_K_RESULTS)
+        # Try without category filter for broader results
+        empty = [i for i, found in enumerate(docs) if not found]
+        if empty:
+            broader = self.retrieve_batch([queries[i] for i in empty], TOP_K_RESULTS)
+            for i, found in zip(empty, broader):
+                docs[i] = found
         
-        # Format as context string with clear structure
-        if docs:
-            context_parts = [f"**Expert Knowledge ({analysis_type.title()}):**\n"]
-            for i, doc in enumerate(docs, 1):
-                # Clean up the content for better LLM consumption
-                content = doc['content'].strip()
-                context_parts.append(f"{i}. {content}\n")
-            return "\n".join(context_parts)
+        return [
+            self.assembler.assemble(t, query, found)
+            for (t, query), found in zip(items, docs)
+        ]
+    
+    def stats(self) -> Dict:
+        """Query embedding cache, context table and prompt size counters"""
+        return {
+            "vector_backend": VECTOR_BACKEND if self._initialized else "keyword",
+            "query_cache": self.query_cache.stats(),
+            "context_table": len(self.context_table),
+            "context_misses": self.context_misses,
+            "prompts": prompt_stats.stats(),
+        }
+    
+    def _load_context_table(self):
+        """Load the precomputed contexts; build them if missing and allowed"""
+        documents = self.knowledge_base.get_all_documents()
+        self.context_table = load_context_table(documents, self.embedding_model)
         
-        return ""
+        # Only build from the vector index; keyword fallback results are not stored
+        if not self.context_table and RAG_BUILD_ON_START and self._initialized:
+            self.context_table = build_context_table(self)
+        if self.context_table:
+            print(f"✅ Loaded {len(self.context_table)} precomputed retrieval contexts")
 
 
 # Singleton instance for easy access
 _retriever_instance = None
+_reload_lock = threading.Lock()
 
 def get_retriever() -> RAGRetriever:
     """Get or create the RAG retriever instance"""
@@ -270,3 +375,31 @@ def get_retriever() -> RAGRetriever:
     if _retriever_instance is None:
         _retriever_instance = RAGRetriever()
     return _retriever_instance
+
+
+def reload_retriever() -> Dict:
+    """
+    Re-ingest the knowledge base and swap in a fresh retriever (hot reload).
+    
+    Only new or edited chunks are embedded. Requests that already hold the
+    old retriever finish on it; later get_retriever() calls get the new one.
+    
+    Returns:
+        Index build stats, document / context counts and reload time
+    """
+    global _retriever_instance
+    started = time.perf_counter()
+    with _reload_lock:
+        stats = build_runtime_index()
+        retriever = RAGRetriever()
+        if retriever._initialized and not retriever.context_table:
+            retriever.context_table = build_context_table(retriever)
+        _retriever_instance = retriever
+        retriever.query_cache.save()
+    
+    return {
+        "index": stats,
+        "documents": len(retriever.knowledge_base.get_all_documents()),
+        "contexts": len(retriever.context_table),
+        "reload_time_sec": round(time.perf_counter() - started, 3)
+    }
@@ -0,0 +1,158 @@
+# rag/vector_index.py
+"""
+Minimal in-process vector index.
+
+The knowledge base is a few dozen documents, so brute-force cosine search
+over a float32 matrix beats any ANN structure or client round trip. Rows
+are stored sorted by category, which turns the category filter into a
+slice of the matrix (no copy, no per-row check).
+
+Layout (VECTOR_INDEX_DIR):
+    CURRENT                  name of the live version directory
+    v<ns>/embeddings.npy     (n, dim) float32 unit vectors, opened with mmap
+    v<ns>/meta.json          ids / categories / contents per row, the document
+                             hashes and embedding model (same shape as the
+                             ChromaDB manifest, so index_is_current works on it)
+
+Each write goes to a new version directory and then replaces CURRENT, so a
+reader never pairs the embeddings of one build with the metadata of another.
+"""
+
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from rag.config import VECTOR_INDEX_DIR
+
+EMBEDDINGS_FILE = "embeddings.npy"
+META_FILE = "meta.json"
+CURRENT_FILE = "CURRENT"
+
+
+def current_dir(path=VECTOR_INDEX_DIR):
+    """Directory of the live index version (`path` itself for the old flat layout)."""
+    pointer = os.path.join(path, CURRENT_FILE)
+    if not os.path.exists(pointer):
+        return path
+    with open(pointer, encoding="utf-8") as f:
+        return os.path.join(path, f.read().strip())
+
+
+class NumpyVectorIndex:
+    """Cosine top-k over memory-mapped embeddings, partitioned by category."""
+
+    def __init__(self, embeddings, meta):
+        self.embeddings = embeddings
+        self.ids = meta["ids"]
+        self.categories = meta["categories"]
+        self.contents = meta["contents"]
+        self.meta = meta
+
+        # Rows are grouped by category: category → contiguous row slice
+        self.partitions = {}
+        for row, category in enumerate(self.categories):
+            start = self.partitions.get(category, slice(row, row)).start
+            self.partitions[category] = slice(start, row + 1)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def load(cls, path=VECTOR_INDEX_DIR):
+        """Open an index written by `write`, or None if there is none (or it is inconsistent)."""
+        version = current_dir(path)
+        meta_path = os.path.join(version, META_FILE)
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        embeddings = np.load(os.path.join(version, EMBEDDINGS_FILE), mmap_mode="r")
+        if embeddings.shape[0] != len(meta["ids"]):
+            print(f"⚠️ Vector index at {version} has {embeddings.shape[0]} rows "
+                  f"for {len(meta['ids'])} documents; ignoring it")
+            return None
+        return cls(embeddings, meta)
+
+    @staticmethod
+    def write(embeddings, documents, hashes, embedding_model, path=VECTOR_INDEX_DIR):
+        """
+        Save an index (rows reordered by category).
+
+        Args:
+            embeddings: (n, dim) unit vectors, one per document
+            documents: Dicts with id / category / content
+            hashes: {doc_id: content hash}
+            embedding_model: Model name recorded for staleness checks
+        """
+        order = sorted(range(len(documents)), key=lambda i: (documents[i]["category"], i))
+        previous = os.path.basename(current_dir(path))
+        version = f"v{time.time_ns()}"
+        os.makedirs(os.path.join(path, version))
+
+        with open(os.path.join(path, version, EMBEDDINGS_FILE), "wb") as f:
+            np.save(f, np.ascontiguousarray(np.asarray(embeddings, dtype=np.float32)[order]))
+
+        meta = {
+            "embedding_model": embedding_model,
+            "built": time.time(),
+            "ids": [documents[i]["id"] for i in order],
+            "categories": [documents[i]["category"] for i in order],
+            "contents": [documents[i]["content"] for i in order],
+            "documents": hashes,
+        }
+        with open(os.path.join(path, version, META_FILE), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+        # The swap: one rename switches readers to the complete new version
+        pointer = os.path.join(path, CURRENT_FILE)
+        with open(pointer + ".tmp", "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(pointer + ".tmp", pointer)
+
+        # Keep the previous version (a running server may still have it mapped)
+        for name in os.listdir(path):
+            if name.startswith("v") and name not in (version, previous):
+                shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+        for name in (EMBEDDINGS_FILE, META_FILE):   # old flat layout
+            try:
+                os.remove(os.path.join(path, name))
+            except FileNotFoundError:
+                pass
+
+    def vectors_by_id(self):
+        """{doc_id: embedding row} (used to reuse unchanged rows on rebuild)."""
+        return {doc_id: self.embeddings[row] for row, doc_id in enumerate(self.ids)}
+
+    def search(self, query_vector, top_k=3, category=None):
+        """
+        Nearest documents to one unit query vector.
+
+        Returns:
+            List of (row, cosine similarity), best first
+        """
+        if category is not None:
+            rows = self.partitions.get(category)
+            if rows is None:
+                return []
+        else:
+            rows = slice(0, len(self))
+
+        scores = self.embeddings[rows] @ np.asarray(query_vector, dtype=np.float32).ravel()
+        k = min(top_k, len(scores))
+        if k <= 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [(rows.start + int(i), float(scores[i])) for i in best]
+
+    def document(self, row, similarity=None):
+        """Row as the retriever's document dict."""
+        return {
+            "content": self.contents[row],
+            "id": self.ids[row],
+            "category": self.categories[row],
+            "distance": None if similarity is None else 1.0 - similarity,
+        }
@@ -0,0 +1,94 @@
+# backend/reanalyze.py
+"""
+Regenerate agent analyses and reports from stored artifacts.
+
+Uses the transcripts and speech features saved by link.run_pipeline, so
+Whisper and feature extraction never rerun. Agents and the report are
+reused when their prompts / weights / knowledge are unchanged and
+recomputed otherwise.
+
+Usage:
+    python reanalyze.py                  # every stored recording
+    python reanalyze.py <audio_hash> ... --out reports.json
+"""
+
+import argparse
+import json
+
+from artifact_store import ArtifactStore, StageRunner
+from link import run_report_stages, stage_configs
+
+# Recordings per POST /reanalyze call (the CLI has no limit)
+REANALYZE_MAX_HASHES = 20
+
+
+def reanalyze(audio_hash, store=None):
+    """Rerun agents + report for one stored recording."""
+    store = store or ArtifactStore()
+    decode = store.latest(audio_hash, "decode")
+    transcript = store.latest(audio_hash, "transcript")
+    features = store.latest(audio_hash, "features")
+    if transcript is None or features is None:
+        raise LookupError(f"No stored transcript/features for {audio_hash}")
+
+    quality = decode["output"] if decode else {"status": "ok", "issues": []}
+    results, score, label, wpm, _ = features["output"]
+
+    # Agent / report keys chain from the stored features artifact, using the
+    # same configs the features were computed with
+    configs = stage_configs(
+        cascade=transcript["config"].get("cascade", False),
+        feature_backend=features["config"].get("feature_backend"),
+    )
+    runner = StageRunner(store, audio_hash, configs, parent_key=features["key"])
+
+    agent_results, final_report = run_report_stages(
+        runner, transcript["output"]["transcript"], results, wpm, quality
+    )
+
+    return {
+        "status": "reduced" if quality["status"] == "reduced" else "ok",
+        "audio_quality": quality,
+        "transcript": transcript["output"]["transcript"],
+        "stt": transcript["output"]["stt"],
+        "speech_metrics": results,
+        "confidence_score": score,
+        "confidence_label": label,
+        "agent_results": agent_results,
+        "final_report": final_report,
+        "artifacts": runner.summary()
+    }
+
+
+def reanalyze_all(audio_hashes=None, store=None):
+    """
+    Rerun agents + report for many recordings.
+
+    Returns:
+        {audio_hash: result, ...}; recordings that fail map to {"error": ...}
+    """
+    store = store or ArtifactStore()
+    outputs = {}
+    for audio_hash in audio_hashes or store.audio_hashes():
+        try:
+            outputs[audio_hash] = reanalyze(audio_hash, store)
+            summary = outputs[audio_hash]["artifacts"]
+            print(f"✅ {audio_hash[:12]}: recomputed {summary['computed'] or 'nothing'}")
+        except Exception as e:
+            outputs[audio_hash] = {"error": str(e), "status": "failed"}
+            print(f"❌ {audio_hash[:12]}: {e}")
+    return outputs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rerun agents and reports from stored artifacts")
+    parser.add_argument("audio_hashes", nargs="*", help="Recordings to reanalyze (default: all)")
+    parser.add_argument("--out", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    outputs = reanalyze_all(args.audio_hashes or None)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(outputs, f, indent=2, default=str)
+        print(f"\n📄 Results written to {args.out}")
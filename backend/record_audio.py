@@ -8,11 +8,11 @@ RAW_AUDIO = "raw_audio.wav"
 TEMP_AUDIO = "temp_audio.webm"
 SAMPLE_RATE = 16000
 
-def record_audio(file: UploadFile):
+def record_audio(file: UploadFile, raw_path=RAW_AUDIO, temp_path=TEMP_AUDIO):
     print("🎙 Receiving audio from frontend...")
 
     # Save raw uploaded file
-    with open(TEMP_AUDIO, "wb") as buffer:
+    with open(temp_path, "wb") as buffer:
         shutil.copyfileobj(file.file, buffer)
 
     # Convert to WAV using ffmpeg
@@ -20,16 +20,16 @@ def record_audio(file: UploadFile):
         [
             "ffmpeg",
             "-y",
-            "-i", TEMP_AUDIO,
+            "-i", temp_path,
             "-ac", "1",
             "-ar", str(SAMPLE_RATE),
-            RAW_AUDIO
+            raw_path
         ],
         stdout=subprocess.DEVNULL,
         stderr=subprocess.DEVNULL,
         check=True
     )
 
-    print("✅ Recording saved as raw_audio.wav")
+    print(f"✅ Recording saved as {raw_path}")
 
-    return RAW_AUDIO
+    return raw_path
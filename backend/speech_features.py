@@ -1,25 +1,57 @@
-import librosa
-import opensmile
+import numpy as np
 import torch
 
+from audio_io import BLOCK_SEC, AudioReader, iter_blocks
+from lite_features import lite_functionals
+from utils.feature_scoring import map_energy_level
+
+try:
+    import opensmile
+    OPENSMILE_AVAILABLE = True
+except ImportError:
+    OPENSMILE_AVAILABLE = False
+    print("⚠️ openSMILE not installed, using the lite NumPy feature backend")
+
+# Feature backends: "opensmile" (eGeMAPSv02) or "lite" (lite_features.py)
+FEATURE_BACKENDS = ("opensmile", "lite")
+DEFAULT_FEATURE_BACKEND = "opensmile" if OPENSMILE_AVAILABLE else "lite"
+
 # ---------------------------
 # LOAD MODELS ONCE
 # ---------------------------
 
-# openSMILE feature extractor (standardized acoustic features)
-smile = opensmile.Smile(
-    feature_set=opensmile.FeatureSet.eGeMAPSv02,
-    feature_level=opensmile.FeatureLevel.Functionals,
-)
+smile = None
+smile_lld = None
+if OPENSMILE_AVAILABLE:
+    # openSMILE feature extractor (standardized acoustic features)
+    smile = opensmile.Smile(
+        feature_set=opensmile.FeatureSet.eGeMAPSv02,
+        feature_level=opensmile.FeatureLevel.Functionals,
+    )
+
+    # Frame-level descriptors, for block-wise extraction on long inputs
+    smile_lld = opensmile.Smile(
+        feature_set=opensmile.FeatureSet.eGeMAPSv02,
+        feature_level=opensmile.FeatureLevel.LowLevelDescriptors,
+    )
 
 # ---------------------------
 # Silero VAD (Offline, Stable)
 # ---------------------------
-vad_model, vad_utils = torch.hub.load(
-    repo_or_dir="snakers4/silero-vad",
-    model="silero_vad",
-    trust_repo=True
-)
+def load_silero_vad():
+    """Load a Silero VAD model and its utils.
+
+    The model keeps recurrent state between calls, so streaming callers
+    (one VADIterator per live session) need their own instance.
+    """
+    return torch.hub.load(
+        repo_or_dir="snakers4/silero-vad",
+        model="silero_vad",
+        trust_repo=True
+    )
+
+
+vad_model, vad_utils = load_silero_vad()
 
 (
     get_speech_timestamps,
@@ -30,59 +62,185 @@ vad_model, vad_utils = torch.hub.load(
 ) = vad_utils
 
 
-def compute_pause_ratio(audio_path, sampling_rate=16000):
+def speech_segments(source, sampling_rate=16000):
+    """
+    Speech regions from Silero VAD, run one block at a time.
+
+    `source` is an audio path, an AudioReader or an iterator of mono
+    float32 blocks.
+
+    Returns:
+        Tuple of ([(start_sec, end_sec), ...], total_duration_sec)
+    """
+    segments = []
+    offset = 0
+
+    for block in iter_blocks(source, target_sr=sampling_rate):
+        speech_timestamps = get_speech_timestamps(
+            torch.from_numpy(block), vad_model, sampling_rate=sampling_rate
+        )
+        segments.extend(
+            ((offset + seg["start"]) / sampling_rate, (offset + seg["end"]) / sampling_rate)
+            for seg in speech_timestamps
+        )
+        offset += len(block)
+
+    return segments, offset / sampling_rate
+
+
+def compute_pause_ratio(source, sampling_rate=16000):
     """
     Computes pause ratio using Silero VAD
     pause_ratio = non-speech duration / total duration
     """
-    wav = read_audio(audio_path, sampling_rate=sampling_rate)
+    return pause_stats(*speech_segments(source, sampling_rate))
 
-    speech_timestamps = get_speech_timestamps(
-        wav, vad_model, sampling_rate=sampling_rate
-    )
 
-    if not speech_timestamps:
+def pause_stats(segments, total_duration):
+    """(pause_ratio, pause_time) from speech_segments output."""
+    if not segments:
         return 1.0, 0.0  # all pause
 
-    speech_time = sum(
-        (seg["end"] - seg["start"]) / sampling_rate
-        for seg in speech_timestamps
-    )
-
-    total_duration = len(wav) / sampling_rate
+    speech_time = sum(end - start for start, end in segments)
     pause_time = max(total_duration - speech_time, 0)
 
     pause_ratio = pause_time / total_duration if total_duration > 0 else 0
     return round(pause_ratio, 2), round(pause_time, 2)
 
 
+def lld_frames(lld, base=0.0):
+    """(time_sec, loudness, f0_semitone) arrays from an openSMILE LLD frame."""
+    times = lld.index.get_level_values("start").total_seconds().to_numpy()
+    return (
+        base + times,
+        lld["Loudness_sma3"].to_numpy(),
+        lld["F0semitoneFrom27.5Hz_sma3nz"].to_numpy(),
+    )
+
+
+def extract_lld_functionals(source, sampling_rate=16000, frames=None):
+    """
+    Block-wise equivalent of the eGeMAPS functionals used by analyze_speech.
+
+    Runs openSMILE LLD extraction per block and keeps running sums, so
+    memory is bounded by the block size. Returns a dict keyed by the
+    functional names read from `smile.process_file`. If `frames` is a list,
+    each block's `lld_frames` are appended to it.
+    """
+    loud_sum = loud_n = 0.0
+    f0_sum = f0_sq = f0_n = 0.0
+    jit_sum = jit_n = shim_sum = shim_n = 0.0
+    offset = 0
+
+    for block in iter_blocks(source, target_sr=sampling_rate):
+        if len(block) == 0:
+            continue
+        lld = smile_lld.process_signal(block, sampling_rate)
+        if frames is not None:
+            frames.append(lld_frames(lld, offset / sampling_rate))
+        offset += len(block)
+
+        loud = lld["Loudness_sma3"].to_numpy()
+        loud_sum += loud.sum()
+        loud_n += len(loud)
+
+        # "nz" descriptors are only defined on voiced frames (0 elsewhere)
+        f0 = lld["F0semitoneFrom27.5Hz_sma3nz"].to_numpy()
+        f0 = f0[f0 > 0]
+        f0_sum += f0.sum()
+        f0_sq += np.square(f0).sum()
+        f0_n += len(f0)
+
+        jit = lld["jitterLocal_sma3nz"].to_numpy()
+        jit = jit[jit > 0]
+        jit_sum += jit.sum()
+        jit_n += len(jit)
+
+        shim = lld["shimmerLocaldB_sma3nz"].to_numpy()
+        shim = shim[shim > 0]
+        shim_sum += shim.sum()
+        shim_n += len(shim)
+
+    f0_mean = f0_sum / f0_n if f0_n else 0.0
+    f0_std = np.sqrt(max(f0_sq / f0_n - f0_mean ** 2, 0.0)) if f0_n else 0.0
+
+    return {
+        "loudness_sma3_amean": loud_sum / loud_n if loud_n else 0.0,
+        "F0semitoneFrom27.5Hz_sma3nz_amean": f0_mean,
+        "F0semitoneFrom27.5Hz_sma3nz_stddevNorm": f0_std / f0_mean if f0_mean else 0.0,
+        "jitterLocal_sma3nz_amean": jit_sum / jit_n if jit_n else 0.0,
+        "shimmerLocaldB_sma3nz_amean": shim_sum / shim_n if shim_n else 0.0,
+    }
+
+
+def confidence_label(confidence_score):
+    return (
+        "High Confidence" if confidence_score >= 75 else
+        "Moderate Confidence" if confidence_score >= 50 else
+        "Low Confidence"
+    )
+
+
 # ---------------------------
 # MAIN FUNCTION
 # ---------------------------
-def analyze_speech(audio_file, word_segments):
-    # Load audio
-    y, sr = librosa.load(audio_file, sr=16000)
-    duration_sec = librosa.get_duration(y=y, sr=sr)
+def analyze_speech(audio_file, word_segments, feature_backend=None, frames=None):
+    """
+    Whole-clip speech metrics.
 
-    # -----------------------
-    # Speech Rate (WPM)
-    # -----------------------
-    total_words = len(word_segments)
-    wpm = round((total_words / duration_sec) * 60, 2) if duration_sec > 0 else 0
+    If `frames` is a dict, it is filled with the intermediate data
+    feature_timeline.compute_timeline needs ("duration", "feature_backend",
+    VAD "segments" and "lld" frame arrays), so a timeline reuses this pass.
+    """
+    lld = [] if frames is not None else None
 
-    # -----------------------
-    # Pause Analysis (Silero VAD)
-    # -----------------------
-    pause_ratio, total_pause_time = compute_pause_ratio(audio_file)
+    # Open audio (memory-mapped for PCM WAV; decoded window by window otherwise)
+    with AudioReader(audio_file) as reader:
+        duration_sec = reader.duration
 
-    # -----------------------
-    # Acoustic Features (openSMILE)
-    # -----------------------
-    features = smile.process_file(audio_file)
+        # -----------------------
+        # Speech Rate (WPM)
+        # -----------------------
+        total_words = len(word_segments)
+        wpm = round((total_words / duration_sec) * 60, 2) if duration_sec > 0 else 0
+
+        # -----------------------
+        # Pause Analysis (Silero VAD)
+        # -----------------------
+        segments, vad_duration = speech_segments(reader)
+        pause_ratio, total_pause_time = pause_stats(segments, vad_duration)
+
+        # -----------------------
+        # Acoustic Features (openSMILE or lite NumPy backend)
+        # -----------------------
+        feature_backend = feature_backend or DEFAULT_FEATURE_BACKEND
+        if feature_backend not in FEATURE_BACKENDS:
+            raise ValueError(f"Unknown feature backend: {feature_backend}")
+        if feature_backend == "opensmile" and not OPENSMILE_AVAILABLE:
+            feature_backend = "lite"
+
+        if feature_backend == "lite":
+            features = lite_functionals(reader, frames=lld)
+        elif duration_sec <= BLOCK_SEC:
+            # Clips that fit in one block get the exact functionals; longer
+            # inputs aggregate frame-level descriptors block by block.
+            signal = reader.read(0, reader.frames)
+            features = smile.process_signal(signal, reader.target_sr)
+            if lld is not None:
+                lld.append(lld_frames(smile_lld.process_signal(signal, reader.target_sr)))
+        else:
+            features = extract_lld_functionals(reader, frames=lld)
+
+    if frames is not None:
+        frames.update(duration=duration_sec, feature_backend=feature_backend,
+                      segments=segments, lld=lld)
 
     def get_feature(df, name_candidates, default=0.0):
         for name in name_candidates:
-            if name in df.columns:
+            if isinstance(df, dict):
+                if name in df:
+                    return float(df[name])
+            elif name in df.columns:
                 return float(df[name].iloc[0])
         return default
 
@@ -115,14 +273,7 @@ def analyze_speech(audio_file, word_segments):
     # -----------------------
     # Energy Level Mapping
     # -----------------------
-    if loudness >= 0.8:
-        energy_level = "high"
-    elif loudness >= 0.5:
-        energy_level = "medium-high"
-    elif loudness >= 0.3:
-        energy_level = "medium"
-    else:
-        energy_level = "low"
+    energy_level = map_energy_level(loudness)
 
     # -----------------------
     # Confidence Score
@@ -134,11 +285,7 @@ def analyze_speech(audio_file, word_segments):
         2
     )
 
-    label = (
-        "High Confidence" if confidence_score >= 75 else
-        "Moderate Confidence" if confidence_score >= 50 else
-        "Low Confidence"
-    )
+    label = confidence_label(confidence_score)
 
     # -----------------------
     # RESULTS
@@ -154,7 +301,8 @@ def analyze_speech(audio_file, word_segments):
         "Shimmer (dB)": round(shimmer, 4),
         "Speech Duration (sec)": round(duration_sec, 2),
         "Total Pause Time (sec)": total_pause_time,
-        "Total Words": total_words
+        "Total Words": total_words,
+        "Feature Backend": feature_backend
     }
 
     return results, confidence_score, label, wpm, total_pause_time
@@ -1,52 +1,166 @@
-from faster_whisper import WhisperModel
+import time
+
+from whisper_policy import (
+    CASCADE_FAST_TIER,
+    CASCADE_LOGPROB_THRESHOLD,
+    CASCADE_MIN_MEASURED_SEC,
+    CASCADE_NO_SPEECH_THRESHOLD,
+    CASCADE_SLOW_TIER,
+    TIER_RTF,
+    audio_duration,
+    get_whisper_model,
+    other_requests,
+    select_model_tier,
+)
+from word_timings import WordTimings
 
 AUDIO_FILE = "clean_audio.wav"
+SAMPLE_RATE = 16000
+
 
-def transcribe_audio(audio_file):
-    model = WhisperModel(
-        "small",
-        device="cpu",
-        compute_type="int8"
+def _needs_redecode(seg):
+    return (
+        seg.avg_logprob < CASCADE_LOGPROB_THRESHOLD or
+        seg.no_speech_prob > CASCADE_NO_SPEECH_THRESHOLD
     )
 
-    print("🎧 Transcribing...")
-    segments, info = model.transcribe(audio_file, language="en")
 
-    full_text = ""
-    segment_data = []
-    word_segments = []
+def _flagged_spans(segments):
+    """Group consecutive low-confidence segments into (first, last) index spans."""
+    spans = []
+    for i, seg in enumerate(segments):
+        if not _needs_redecode(seg):
+            continue
+        if spans and spans[-1][1] == i - 1:
+            spans[-1][1] = i
+        else:
+            spans.append([i, i])
+    return spans
 
-    for seg in segments:
-        full_text += seg.text + " "
 
-        segment_data.append({
-            "text": seg.text,
-            "start": seg.start,
-            "end": seg.end
-        })
+def _transcribe_cascade(audio_file, fast_tier=CASCADE_FAST_TIER, slow_tier=CASCADE_SLOW_TIER):
+    """
+    Transcribe with the fast tier, then re-decode low-confidence spans with
+    the slow tier and splice the corrected segments back in.
 
-        # ---- Word-level estimation ----
-        words = seg.text.strip().split()
-        if not words:
-            continue
+    Returns:
+        Tuple of (segment_data, cascade_stats)
+    """
+    from faster_whisper.audio import decode_audio
+
+    audio = decode_audio(audio_file, sampling_rate=SAMPLE_RATE)
+    total_sec = len(audio) / SAMPLE_RATE
 
-        duration = seg.end - seg.start
-        avg_word_time = duration / len(words)
+    started = time.perf_counter()
+    fast_segments, _ = get_whisper_model(fast_tier).transcribe(audio, language="en")
+    fast_segments = list(fast_segments)
+    fast_time = time.perf_counter() - started
 
-        for i, word in enumerate(words):
-            word_start = seg.start + i * avg_word_time
-            word_end = word_start + avg_word_time
+    spans = _flagged_spans(fast_segments)
+    slow_model = get_whisper_model(slow_tier) if spans else None
 
-            word_segments.append({
-                "word": word,
-                "start": round(word_start, 2),
-                "end": round(word_end, 2)
+    segment_data = []
+    redecoded_sec = 0.0
+    slow_time = 0.0
+    cursor = 0
+
+    for first, last in spans:
+        for seg in fast_segments[cursor:first]:
+            segment_data.append({"text": seg.text, "start": seg.start, "end": seg.end})
+
+        span_start = fast_segments[first].start
+        span_end = fast_segments[last].end
+        clip = audio[int(span_start * SAMPLE_RATE):int(span_end * SAMPLE_RATE)]
+
+        started = time.perf_counter()
+        slow_segments, _ = slow_model.transcribe(clip, language="en")
+        slow_segments = list(slow_segments)
+        slow_time += time.perf_counter() - started
+        redecoded_sec += span_end - span_start
+
+        if not slow_segments:
+            # Slow tier heard nothing: keep the fast-pass text for this span
+            for seg in fast_segments[first:last + 1]:
+                segment_data.append({"text": seg.text, "start": seg.start, "end": seg.end})
+        for seg in slow_segments:
+            segment_data.append({
+                "text": seg.text,
+                "start": round(span_start + seg.start, 2),
+                "end": round(min(span_start + seg.end, span_end), 2),
+                "redecoded": True
             })
+        cursor = last + 1
+
+    for seg in fast_segments[cursor:]:
+        segment_data.append({"text": seg.text, "start": seg.start, "end": seg.end})
+
+    # Cost of running the slow tier on everything, from its measured speed
+    # when enough audio went through it, otherwise from the configured RTF
+    if redecoded_sec >= CASCADE_MIN_MEASURED_SEC:
+        slow_rtf = slow_time / redecoded_sec
+    else:
+        slow_rtf = TIER_RTF[slow_tier]
+    full_slow_time = total_sec * slow_rtf
+
+    stats = {
+        "fast_tier": fast_tier,
+        "slow_tier": slow_tier,
+        "segments_redecoded": sum(last - first + 1 for first, last in spans),
+        "segments_total": len(fast_segments),
+        "redecoded_fraction": round(redecoded_sec / total_sec, 3) if total_sec else 0.0,
+        "fast_pass_time": round(fast_time, 2),
+        "slow_pass_time": round(slow_time, 2),
+        "estimated_full_slow_time": round(full_slow_time, 2),
+        "time_saved": round(full_slow_time - (fast_time + slow_time), 2)
+    }
+    return segment_data, stats
+
+
+def transcribe_audio(audio_file, model_tier=None, latency_target=None, cascade=False,
+                     tier_reason="requested"):
+    audio_sec = audio_duration(audio_file)
+    started = time.perf_counter()
+    cascade_stats = None
+    depth = other_requests()
+
+    if cascade:
+        model_tier, tier_reason = CASCADE_FAST_TIER, "cascade"
+        print(f"🎧 Transcribing with cascade '{CASCADE_FAST_TIER}' → '{CASCADE_SLOW_TIER}'...")
+        segment_data, cascade_stats = _transcribe_cascade(audio_file)
+    else:
+        if model_tier is None:
+            model_tier, tier_reason = select_model_tier(
+                audio_sec, depth=depth, latency_target=latency_target
+            )
+
+        model = get_whisper_model(model_tier)
+
+        print(f"🎧 Transcribing with Whisper '{model_tier}' ({tier_reason})...")
+        segments, info = model.transcribe(audio_file, language="en")
+
+        segment_data = [
+            {"text": seg.text, "start": seg.start, "end": seg.end}
+            for seg in segments
+        ]
+
+    full_text = " ".join(seg["text"] for seg in segment_data)
+
+    stt = {
+        "model_tier": model_tier,
+        "tier_reason": tier_reason,
+        "queue_depth": depth,      # other requests in flight when the tier was picked
+        "latency_target": latency_target,
+        "audio_duration": round(audio_sec, 2),
+        "transcription_time": round(time.perf_counter() - started, 2)
+    }
+    if cascade_stats is not None:
+        stt["cascade"] = cascade_stats
 
     return {
         "transcript": full_text.strip(),
         "segments": segment_data,
-        "word_segments": word_segments
+        "word_segments": WordTimings.from_segments(segment_data),
+        "stt": stt
     }
 
 
@@ -54,4 +168,4 @@ def transcribe_audio(audio_file):
 if __name__ == "__main__":
     data = transcribe_audio(AUDIO_FILE)
     print("\n📝 Transcript:\n")
-    print(data["transcript"]) 
+    print(data["transcript"])
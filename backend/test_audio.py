@@ -0,0 +1,248 @@
+# test_audio.py
+"""
+Test script for the audio utilities (no Whisper / Silero / LLM needed)
+Tests windowed audio reading, the lite feature backend and timeline
+downsampling on synthetic audio
+"""
+
+import os
+import tempfile
+
+SAMPLE_RATE = 16000
+
+
+def _tone(freq, seconds, amplitude=0.3):
+    import numpy as np
+
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def test_audio_reader():
+    """Test memory-mapped and decoded windows match the written signal"""
+    print("\n" + "="*50)
+    print("🧪 TEST 1: AudioReader")
+    print("="*50)
+
+    import numpy as np
+    import soundfile as sf
+    from audio_io import AudioReader
+
+    signal = _tone(220, 3)
+    ok = True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, subtype in (("pcm16.wav", "PCM_16"), ("float.wav", "FLOAT"), ("pcm24.wav", "PCM_24")):
+            path = os.path.join(tmp, name)
+            sf.write(path, signal, SAMPLE_RATE, subtype=subtype)
+
+            with AudioReader(path) as reader:
+                window = reader.read(1000, 2000)
+                blocks = [block for _, block in reader.blocks(block_sec=1)]
+                error = float(np.max(np.abs(window - signal[1000:2000])))
+                total = sum(len(b) for b in blocks)
+
+            print(f"✅ {name}: mmap={reader.memory_mapped} blocks={len(blocks)} max_err={error:.1e}")
+            ok = ok and error < 1e-3 and total == len(signal)
+
+    return ok
+
+
+def test_lite_pitch():
+    """Test the YIN tracker recovers the pitch of pure tones"""
+    print("\n" + "="*50)
+    print("🧪 TEST 2: Lite F0 Tracker")
+    print("="*50)
+
+    import numpy as np
+    from lite_features import yin_f0
+
+    ok = True
+    for freq in (100, 180, 260):
+        f0, _ = yin_f0(_tone(freq, 1), SAMPLE_RATE)
+        voiced = f0[f0 > 0]
+        estimate = float(np.median(voiced)) if len(voiced) else 0.0
+        print(f"✅ {freq} Hz → {estimate:.1f} Hz ({len(voiced)}/{len(f0)} voiced)")
+        ok = ok and abs(estimate - freq) < 2
+
+    silent, _ = yin_f0(np.zeros(SAMPLE_RATE, dtype=np.float32), SAMPLE_RATE)
+    print(f"✅ Silence voiced frames: {int((silent > 0).sum())}")
+    return ok and not (silent > 0).any()
+
+
+def test_lite_functionals():
+    """Test lite functionals on a tone split across blocks"""
+    print("\n" + "="*50)
+    print("🧪 TEST 3: Lite Functionals")
+    print("="*50)
+
+    import numpy as np
+    from lite_features import lite_functionals
+
+    signal = _tone(150, 4)
+    features = lite_functionals([signal[:SAMPLE_RATE * 2], signal[SAMPLE_RATE * 2:]])
+    for name, value in features.items():
+        print(f"   {name}: {value:.4f}")
+
+    expected_semitone = 12 * np.log2(150 / 27.5)
+    return abs(features["F0semitoneFrom27.5Hz_sma3nz_amean"] - expected_semitone) < 0.2
+
+
+def test_lite_energy_labels():
+    """Test lite loudness gives openSMILE's energy label on speech-like audio"""
+    print("\n" + "="*50)
+    print("🧪 TEST 4: Lite Energy Labels")
+    print("="*50)
+
+    try:
+        import opensmile
+    except ImportError:
+        print("⚠️ opensmile not installed, skipped")
+        return True
+
+    from benchmarks import synthetic_speech
+    from lite_features import lite_functionals
+    from utils.feature_scoring import map_energy_level
+
+    smile = opensmile.Smile(
+        feature_set=opensmile.FeatureSet.eGeMAPSv02,
+        feature_level=opensmile.FeatureLevel.Functionals,
+    )
+    # One level inside each label's band (a clip's loudness depends on its
+    # pauses and vowels, so the seed is fixed)
+    for amplitude in (0.01, 0.045, 0.09, 0.2):
+        signal = synthetic_speech(4, amplitude, f0=140, seed=7)
+        reference = float(smile.process_signal(signal, SAMPLE_RATE)["loudness_sma3_amean"].iloc[0])
+        lite = lite_functionals([signal])["loudness_sma3_amean"]
+        labels = map_energy_level(reference), map_energy_level(lite)
+        print(f"{'✅' if labels[0] == labels[1] else '❌'} rms {amplitude}: "
+              f"openSMILE {reference:.3f} ({labels[0]}), lite {lite:.3f} ({labels[1]})")
+        assert labels[0] == labels[1], (amplitude, reference, lite)
+
+    return True
+
+
+def test_lttb():
+    """Test LTTB keeps the point budget, the endpoints and a lone spike"""
+    print("\n" + "="*50)
+    print("🧪 TEST 5: LTTB Downsampling")
+    print("="*50)
+
+    import numpy as np
+    from feature_timeline import lttb
+
+    x = np.arange(7200, dtype=float)
+    y = np.sin(x / 300)
+    y[3600] = 5.0
+    y[100] = np.nan
+
+    tx, ty = lttb(x, y, 200)
+    print(f"✅ {len(x)} points → {len(tx)} (max={ty.max():.1f})")
+
+    return (
+        len(tx) == 200
+        and tx[0] == 0 and tx[-1] == x[-1]
+        and ty.max() == 5.0
+        and np.all(np.isfinite(ty))
+    )
+
+
+def test_word_timings():
+    """Test compact word timings against per-word dicts"""
+    print("\n" + "="*50)
+    print("🧪 TEST 6: Word Timings")
+    print("="*50)
+
+    from word_timings import WordTimings
+
+    segments = [
+        {"text": " so today we talk", "start": 0.0, "end": 2.0},
+        {"text": " ", "start": 2.0, "end": 2.5},
+        {"text": "about today", "start": 4.0, "end": 5.0},
+    ]
+    words = WordTimings.from_segments(segments)
+    listed = words.to_list()
+    print(f"✅ {words}: {listed[-1]}")
+
+    gaps = words.gap_stats()
+    wpm = words.per_window_wpm(window_sec=2.5)
+    print(f"✅ Gaps: {gaps}")
+    print(f"✅ WPM per 2.5 s: {wpm.tolist()}")
+
+    return (
+        len(words) == 6
+        and len(words.vocab) == 5
+        and listed[4] == {"word": "about", "start": 4.0, "end": 4.5}
+        and list(words) == listed
+        and gaps["max"] == 2.0
+        and wpm.tolist() == [96.0, 48.0]
+    )
+
+
+def test_quality_gate():
+    """Test the quality gate verdicts on silent, short, clipped and normal audio"""
+    print("\n" + "="*50)
+    print("🧪 TEST 7: Audio Quality Gate")
+    print("="*50)
+
+    import numpy as np
+    import soundfile as sf
+    from audio_quality import assess_audio
+
+    # Tone bursts: 1 s on, 1 s off
+    speech = _tone(200, 6) * np.repeat([1, 0, 1, 0, 1, 0], SAMPLE_RATE).astype(np.float32)
+    cases = {
+        "silent": (np.zeros(SAMPLE_RATE * 3, dtype=np.float32), "insufficient"),
+        "short": (speech[:SAMPLE_RATE // 2], "insufficient"),
+        "clipped": (np.clip(speech * 10, -1, 1), "reduced"),
+        "normal": (speech, "ok"),
+    }
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, (signal, expected) in cases.items():
+            path = os.path.join(tmp, f"{name}.wav")
+            sf.write(path, signal, SAMPLE_RATE)
+            quality = assess_audio(path)
+            codes = [issue["code"] for issue in quality["issues"]]
+            print(f"✅ {name}: {quality['status']} speech={quality['speech_fraction']} {codes}")
+            ok = ok and quality["status"] == expected
+
+    return ok
+
+
+def main():
+    """Run all audio tests"""
+    print("\n" + "="*60)
+    print("🚀 AUDIO UTILITIES TEST SUITE")
+    print("="*60)
+
+    results = {}
+    for name, test in (
+        ("Audio Reader", test_audio_reader),
+        ("Lite Pitch", test_lite_pitch),
+        ("Lite Functionals", test_lite_functionals),
+        ("Lite Energy Labels", test_lite_energy_labels),
+        ("LTTB", test_lttb),
+        ("Word Timings", test_word_timings),
+        ("Quality Gate", test_quality_gate),
+    ):
+        try:
+            results[name] = test()
+        except Exception as e:
+            print(f"❌ {name} test failed: {e}")
+            results[name] = False
+
+    print("\n" + "="*60)
+    print("📊 TEST SUMMARY")
+    print("="*60)
+    for name, passed in results.items():
+        print(f"   {'✅' if passed else '❌'} {name}: {'PASSED' if passed else 'FAILED'}")
+
+    passed_count = sum(1 for v in results.values() if v)
+    print(f"\n   Total: {passed_count}/{len(results)} tests passed")
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# test_feature_scoring.py
+"""
+Test script for feature scoring (no models needed)
+Tests the scalar and batch scores against the original hand-written
+formulas, edge inputs included
+
+Checks use assert, so the file also runs under pytest.
+"""
+
+import math
+
+import numpy as np
+
+from utils.feature_scoring import (
+    communication_score,
+    communication_scores,
+    confidence_score,
+    confidence_scores,
+)
+
+ENERGY_LEVELS = {"low": 0.3, "medium": 0.6, "medium-high": 0.8, "high": 1.0}
+
+# Values for one numeric feature; each is tried in every numeric slot
+EDGE_VALUES = (
+    math.nan, math.inf, -math.inf, None, "fast", -5, 0, 0.05, 0.2, 0.4, 1.5,
+    80, 120, 180, 500, True, np.float32(0.3), np.int64(150),
+)
+
+
+def _normalize(value, min_val, max_val):
+    try:
+        return max(0.0, min(1.0, (value - min_val) / (max_val - min_val)))
+    except Exception:
+        return 0.0
+
+
+def _reference_communication(features):
+    """The formula feature_scoring implemented before weights were configurable."""
+    speech_rate = _normalize(features.get("speech_rate", 120), 80, 180)
+    pause_ratio = _normalize(features.get("pause_ratio", 0.2), 0.05, 0.4)
+    return round((0.6 * speech_rate + 0.4 * (1 - pause_ratio) + 0.1) * 100, 2)
+
+
+def _reference_confidence(features):
+    pitch_var = _normalize(features.get("pitch_variance", 20), 5, 40)
+    energy = ENERGY_LEVELS.get(features.get("energy_level", "medium"), 0.6)
+    pause_ratio = _normalize(features.get("pause_ratio", 0.2), 0.05, 0.4)
+    return round((0.4 * pitch_var + 0.4 * energy + 0.2 * (1 - pause_ratio) + 0.1) * 100, 2)
+
+
+def _cases():
+    cases = [{}, {"energy_level": "loud"}, {"energy_level": None}]
+    for name in ("speech_rate", "pause_ratio", "pitch_variance"):
+        cases.extend({name: value} for value in EDGE_VALUES)
+    for level in ENERGY_LEVELS:
+        cases.append({"energy_level": level, "pause_ratio": math.nan, "pitch_variance": 12})
+    return cases
+
+
+def test_scalar_matches_reference():
+    """Test communication_score / confidence_score on every edge case"""
+    for features in _cases():
+        for score, reference in (
+            (communication_score, _reference_communication),
+            (confidence_score, _reference_confidence),
+        ):
+            expected = reference(features)
+            assert score(features) == expected, (score.__name__, features, score(features), expected)
+    print(f"✅ scalar scores match on {len(_cases())} inputs")
+
+
+def test_batch_matches_reference():
+    """Test the batch scores on the same inputs, mixed into shared columns"""
+    cases = _cases()
+    names = ("speech_rate", "pause_ratio", "pitch_variance", "energy_level")
+    defaults = {"speech_rate": 120, "pause_ratio": 0.2, "pitch_variance": 20, "energy_level": "medium"}
+    columns = {name: [case.get(name, defaults[name]) for case in cases] for name in names}
+
+    for scores, reference in (
+        (communication_scores, _reference_communication),
+        (confidence_scores, _reference_confidence),
+    ):
+        got = scores(columns)
+        expected = [reference({name: columns[name][i] for name in names}) for i in range(len(cases))]
+        # float32 inputs keep the reference formula in float32
+        mismatched = [
+            (cases[i], got[i], expected[i])
+            for i in range(len(cases)) if abs(got[i] - expected[i]) > 1e-4
+        ]
+        assert not mismatched, (scores.__name__, mismatched)
+
+    # An all-float column takes the fast path; NaN must score like the scalar
+    nan_column = {"pause_ratio": np.array([math.nan, 0.1])}
+    assert list(communication_scores(nan_column)) == [
+        _reference_communication({"pause_ratio": math.nan}),
+        _reference_communication({"pause_ratio": 0.1}),
+    ]
+    print(f"✅ batch scores match on {len(cases)} rows")
+
+
+def main():
+    """Run all feature scoring tests"""
+    print("\n" + "="*60)
+    print("🚀 FEATURE SCORING TEST SUITE")
+    print("="*60)
+
+    results = {}
+    for name, test in (
+        ("Scalar Scores", test_scalar_matches_reference),
+        ("Batch Scores", test_batch_matches_reference),
+    ):
+        try:
+            test()
+            results[name] = True
+        except Exception as e:
+            print(f"❌ {name} test failed: {e!r}")
+            results[name] = False
+
+    print("\n" + "="*60)
+    print("📊 TEST SUMMARY")
+    print("="*60)
+    for name, passed in results.items():
+        print(f"   {'✅' if passed else '❌'} {name}: {'PASSED' if passed else 'FAILED'}")
+
+    passed_count = sum(1 for v in results.values() if v)
+    print(f"\n   Total: {passed_count}/{len(results)} tests passed")
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -31,7 +31,11 @@ def test_knowledge_base():
     print(f"   - Personality docs: {len(pers_docs)}")
     print(f"   - Improvement docs: {len(improve_docs)}")
     
-    return True
+    # rag/documents/*.md are ingested alongside the built-in documents
+    md_docs = [d for d in docs if d["id"].startswith("md:")]
+    print(f"   - Markdown chunks: {len(md_docs)}")
+    
+    return len(md_docs) > 0
 
 
 def test_retriever():
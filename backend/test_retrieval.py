@@ -0,0 +1,190 @@
+# test_retrieval.py
+"""
+Test script for the retrieval building blocks (no ChromaDB / Ollama needed)
+Tests BM25 whole-token matching, category partitions and rank fusion, and
+that every query the pipeline makes is covered by the precomputed context
+table
+
+Checks use assert, so the file also runs under pytest.
+"""
+
+import itertools
+
+
+class _RecordingRetriever:
+    """Stands in for RAGRetriever; records the (analysis_type, metrics) it is asked for."""
+
+    def __init__(self):
+        self.queries = []
+
+    def retrieve_many(self, requests):
+        self.queries.extend(requests.values())
+        return {name: "" for name in requests}
+
+    def get_context_for_analysis(self, analysis_type, metrics):
+        self.queries.append((analysis_type, metrics))
+        return ""
+
+
+DOCS = [
+    {"id": "pace", "category": "communication", "content": "Speech rate: aim for 130 words per minute."},
+    {"id": "moderate", "category": "confidence", "content": "A moderate tone sounds calm and assured."},
+    {"id": "pauses", "category": "communication", "content": "Pauses let key points land. Pause before a point."},
+    {"id": "posture", "category": "confidence", "content": "Open posture projects confidence."},
+]
+
+
+def test_bm25_whole_tokens():
+    """Test BM25 matches whole tokens only (no substrings, prefixes or stopwords)"""
+    from rag.bm25 import BM25Index, tokenize
+
+    index = BM25Index(DOCS)
+    assert tokenize("The Speech-rate is 130!") == ["speech", "rate", "130"]
+
+    hits = [doc["id"] for doc, _ in index.search("rate")]
+    assert hits == ["pace"], hits                       # not "moderate"
+    assert index.search("mod") == []                    # no prefix matches
+    assert index.search("the and of") == []             # stopwords only
+
+    hits = index.search("pause point", top_k=3)
+    assert hits[0][0]["id"] == "pauses" and all(score > 0 for _, score in hits), hits
+    assert len(index.search("confidence calm rate pause", top_k=2)) == 2
+    print("✅ BM25 whole-token matching")
+
+
+def test_bm25_categories():
+    """Test a category filter only searches that category's documents"""
+    from rag.bm25 import KeywordIndex
+
+    index = KeywordIndex(DOCS)
+    query = "rate tone posture pauses"
+    assert {doc["id"] for doc, _ in index.search(query, top_k=10)} == {d["id"] for d in DOCS}
+    for category in ("communication", "confidence"):
+        hits = index.search(query, top_k=10, category=category)
+        assert hits and {doc["category"] for doc, _ in hits} == {category}, (category, hits)
+    assert index.search(query, category="personality") == []
+    print("✅ BM25 category partitions")
+
+
+def test_rank_fusion():
+    """Test reciprocal rank fusion rewards documents ranked well in both lists"""
+    from rag.bm25 import reciprocal_rank_fusion
+
+    vector = ["a", "b", "c"]
+    keyword = ["b", "d", "a"]
+    fused = reciprocal_rank_fusion([vector, keyword], k=60)
+    # b: 1/62 + 1/61, a: 1/61 + 1/63, then the single-list hits by rank
+    assert fused == ["b", "a", "d", "c"], fused
+    assert reciprocal_rank_fusion([["x", "y"]]) == ["x", "y"]
+    assert reciprocal_rank_fusion([]) == []
+    print("✅ reciprocal rank fusion")
+
+
+def _speech_metrics():
+    """speech_features.analyze_speech results across the ranges it produces."""
+    from utils.feature_scoring import map_energy_level
+
+    for rate, pause, loudness, pitch in itertools.product(
+        (0, 60, 119, 120, 140, 160, 161, 240),
+        (0, 0.05, 0.25, 0.26, 0.9),
+        (0.1, 0.35, 0.6, 1.2),
+        (0.0, 5.2, 10, 25.0, 40, 41.5),
+    ):
+        yield {
+            "speech_rate": rate,
+            "pause_ratio": pause,
+            "energy_level": map_energy_level(loudness),
+            "Pitch Variance": pitch,
+        }
+
+
+def _agent_outputs():
+    """Agent outputs covering every branch rag_pipeline derives weak areas from."""
+    for clarity, fluency, structure, confidence, nervousness, assertiveness in itertools.product(
+        (55, 85), ("poor", "average", "good"), ("disorganized", "basic", "clear"),
+        ("low", "medium", "high"), ("high", "medium", "low"), ("low", "high"),
+    ):
+        yield {
+            "communication_analysis": {
+                "clarity_score": clarity, "fluency_level": fluency, "speech_structure": structure,
+            },
+            "confidence_emotion_analysis": {"confidence_level": confidence, "nervousness": nervousness},
+            "personality_analysis": {"assertiveness": assertiveness},
+        }
+    yield {}
+    yield {"communication_analysis": "unparsed", "confidence_emotion_analysis": None}
+
+
+def test_context_table_coverage():
+    """Test every prefetch / report query maps to a key in key_space()"""
+    import rag.rag_pipeline
+    import rag.retriever
+    from agent import prefetch_contexts
+    from rag.context_table import analysis_buckets, context_key, key_space
+
+    recorder = _RecordingRetriever()
+    originals = rag.retriever.get_retriever, rag.rag_pipeline.get_retriever
+    rag.retriever.get_retriever = rag.rag_pipeline.get_retriever = lambda: recorder
+    try:
+        for results in _speech_metrics():
+            # The state link.run_report_stages hands the agents
+            prefetch_contexts({
+                "transcript": "Hello everyone.",
+                "audio_features": {
+                    "speech_rate": results["speech_rate"],
+                    "pitch_variance": results["Pitch Variance"],
+                    "pause_ratio": results["pause_ratio"],
+                    "energy_level": results["energy_level"],
+                },
+            })
+        for outputs in _agent_outputs():
+            rag.rag_pipeline._report_prompt(outputs)
+    finally:
+        rag.retriever.get_retriever, rag.rag_pipeline.get_retriever = originals
+
+    table = {context_key(analysis_type, buckets) for analysis_type, buckets in key_space()}
+    keys = {
+        context_key(analysis_type, analysis_buckets(analysis_type, metrics))
+        for analysis_type, metrics in recorder.queries
+    }
+    missing = sorted(keys - table)
+    types = sorted({analysis_type for analysis_type, _ in recorder.queries})
+    print(f"{'✅' if not missing else '❌'} {len(keys)} distinct keys from "
+          f"{len(recorder.queries)} queries ({', '.join(types)})")
+    assert types == ["communication", "confidence", "improvement"], types
+    assert not missing, missing[:10]
+
+
+def main():
+    """Run all retrieval tests"""
+    print("\n" + "="*60)
+    print("🚀 RETRIEVAL TEST SUITE")
+    print("="*60)
+
+    results = {}
+    for name, test in (
+        ("BM25 Whole Tokens", test_bm25_whole_tokens),
+        ("BM25 Categories", test_bm25_categories),
+        ("Rank Fusion", test_rank_fusion),
+        ("Context Table Coverage", test_context_table_coverage),
+    ):
+        try:
+            test()
+            results[name] = True
+        except Exception as e:
+            print(f"❌ {name} test failed: {e!r}")
+            results[name] = False
+
+    print("\n" + "="*60)
+    print("📊 TEST SUMMARY")
+    print("="*60)
+    for name, passed in results.items():
+        print(f"   {'✅' if passed else '❌'} {name}: {'PASSED' if passed else 'FAILED'}")
+
+    passed_count = sum(1 for v in results.values() if v)
+    print(f"\n   Total: {passed_count}/{len(results)} tests passed")
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
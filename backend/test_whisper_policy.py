@@ -0,0 +1,139 @@
+# test_whisper_policy.py
+"""
+Test script for the Whisper tier policy (no Whisper model needed)
+Tests select_model_tier on the default path, the queue-depth caps, latency
+targets and short clips under load, and that the transcript's cache key
+follows the tier
+
+Checks use assert, so the file also runs under pytest.
+"""
+
+import tempfile
+
+import whisper_policy
+from artifact_store import ArtifactStore, StageRunner
+from whisper_policy import (
+    DEFAULT_TIER,
+    QUEUE_CRITICAL_DEPTH,
+    QUEUE_CRITICAL_TIER,
+    QUEUE_DOWNSHIFT_DEPTH,
+    QUEUE_DOWNSHIFT_TIER,
+    WHISPER_TIERS,
+    select_model_tier,
+    transcript_config,
+)
+
+AUDIO_HASH = "ab" * 32
+
+
+def test_default_tier():
+    """Test an idle server uses the default tier for short and long clips"""
+    for duration in (5, 60, 600):
+        assert select_model_tier(duration, depth=0) == (DEFAULT_TIER, "default")
+    print(f"✅ idle: {DEFAULT_TIER}")
+
+
+def test_queue_caps():
+    """Test the queue-depth caps, short clips included"""
+    cases = (
+        (10, QUEUE_DOWNSHIFT_DEPTH - 1, (DEFAULT_TIER, "default")),
+        (10, QUEUE_DOWNSHIFT_DEPTH, (QUEUE_DOWNSHIFT_TIER, "queue_depth")),
+        (60, QUEUE_DOWNSHIFT_DEPTH, (QUEUE_DOWNSHIFT_TIER, "queue_depth")),
+        (10, QUEUE_CRITICAL_DEPTH, (QUEUE_CRITICAL_TIER, "queue_depth")),
+        (10, 8, (QUEUE_CRITICAL_TIER, "queue_depth")),
+    )
+    for duration, depth, expected in cases:
+        result = select_model_tier(duration, depth=depth)
+        print(f"{'✅' if result == expected else '❌'} {duration}s at depth {depth}: {result}")
+        assert result == expected
+
+
+def test_latency_target():
+    """Test targets pick the largest tier that fits, or the smallest if none does"""
+    tier, reason = select_model_tier(10, depth=0, latency_target=60)
+    assert reason == "latency_target" and tier == "medium", (tier, reason)
+
+    tier, reason = select_model_tier(10, depth=0, latency_target=1)
+    assert reason == "latency_target" and tier == "base", (tier, reason)
+
+    tier, reason = select_model_tier(600, depth=0, latency_target=0.1)
+    assert (tier, reason) == (WHISPER_TIERS[0], "latency_target_unreachable"), (tier, reason)
+
+    # A target that fits "medium" is still capped on a deep queue
+    tier, reason = select_model_tier(1, depth=QUEUE_CRITICAL_DEPTH, latency_target=1000)
+    assert (tier, reason) == (QUEUE_CRITICAL_TIER, "queue_depth"), (tier, reason)
+    print("✅ latency targets")
+
+
+def test_transcript_key():
+    """Test a stored transcript is reused only for the same tier and policy"""
+    calls = []
+
+    def transcribe(tier):
+        calls.append(tier)
+        return {"transcript": f"decoded with {tier}"}
+
+    def run(store, tier, cascade=False):
+        runner = StageRunner(store, AUDIO_HASH, {"transcript": transcript_config(tier, cascade)})
+        return runner.run("transcript", transcribe, tier), runner.summary()
+
+    with tempfile.TemporaryDirectory() as root:
+        store = ArtifactStore(root)
+        run(store, DEFAULT_TIER)
+        data, summary = run(store, DEFAULT_TIER)
+        assert summary["resumed"] == ["transcript"] and len(calls) == 1, (summary, calls)
+
+        # A downshifted tier misses the default tier's transcript
+        data, summary = run(store, QUEUE_DOWNSHIFT_TIER)
+        assert summary["computed"] == ["transcript"], summary
+        assert data["transcript"] == f"decoded with {QUEUE_DOWNSHIFT_TIER}"
+
+        data, summary = run(store, None, cascade=True)
+        assert summary["computed"] == ["transcript"], summary
+
+        # So does the same tier once the policy changes
+        original = whisper_policy.QUEUE_DOWNSHIFT_DEPTH
+        whisper_policy.QUEUE_DOWNSHIFT_DEPTH = original + 1
+        try:
+            data, summary = run(store, DEFAULT_TIER)
+        finally:
+            whisper_policy.QUEUE_DOWNSHIFT_DEPTH = original
+        assert summary["computed"] == ["transcript"], summary
+
+    assert calls == [DEFAULT_TIER, QUEUE_DOWNSHIFT_TIER, None, DEFAULT_TIER], calls
+    print("✅ transcript key follows the tier and policy")
+
+
+def main():
+    """Run all Whisper policy tests"""
+    print("\n" + "="*60)
+    print("🚀 WHISPER POLICY TEST SUITE")
+    print("="*60)
+
+    results = {}
+    for name, test in (
+        ("Default Tier", test_default_tier),
+        ("Queue Caps", test_queue_caps),
+        ("Latency Target", test_latency_target),
+        ("Transcript Key", test_transcript_key),
+    ):
+        try:
+            test()
+            results[name] = True
+        except Exception as e:
+            print(f"❌ {name} test failed: {e!r}")
+            results[name] = False
+
+    print("\n" + "="*60)
+    print("📊 TEST SUMMARY")
+    print("="*60)
+    for name, passed in results.items():
+        print(f"   {'✅' if passed else '❌'} {name}: {'PASSED' if passed else 'FAILED'}")
+
+    passed_count = sum(1 for v in results.values() if v)
+    print(f"\n   Total: {passed_count}/{len(results)} tests passed")
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
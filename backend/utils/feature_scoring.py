@@ -1,3 +1,75 @@
+import copy
+import json
+import numbers
+import os
+
+import numpy as np
+
+# Scoring weights. Each model is a weighted sum of normalized terms plus a
+# bias; override any part with a JSON file of the same shape, loaded from
+# $FEATURE_SCORING_WEIGHTS or via load_weights(path).
+DEFAULT_WEIGHTS = {
+    "communication": {
+        "bias": 0.1,
+        "terms": {
+            "speech_rate": {"weight": 0.6, "min": 80, "max": 180, "default": 120},
+            "pause_ratio": {"weight": 0.4, "min": 0.05, "max": 0.4, "default": 0.2, "invert": True},
+        }
+    },
+    "confidence": {
+        "bias": 0.1,
+        "terms": {
+            "pitch_variance": {"weight": 0.4, "min": 5, "max": 40, "default": 20},
+            "energy_level": {
+                "weight": 0.4,
+                "levels": {"low": 0.3, "medium": 0.6, "medium-high": 0.8, "high": 1.0},
+                "default": "medium",
+                "fallback": 0.6
+            },
+            "pause_ratio": {"weight": 0.2, "min": 0.05, "max": 0.4, "default": 0.2, "invert": True},
+        }
+    }
+}
+
+WEIGHTS_ENV = "FEATURE_SCORING_WEIGHTS"
+
+
+def map_energy_level(loudness):
+    """Map openSMILE mean loudness to a coarse energy label."""
+    if loudness >= 0.8:
+        return "high"
+    elif loudness >= 0.5:
+        return "medium-high"
+    elif loudness >= 0.3:
+        return "medium"
+    return "low"
+
+
+def load_weights(path=None):
+    """
+    Scoring weights, with a JSON file (`path` or $FEATURE_SCORING_WEIGHTS)
+    merged over DEFAULT_WEIGHTS term by term.
+    """
+    weights = copy.deepcopy(DEFAULT_WEIGHTS)
+    path = path or os.environ.get(WEIGHTS_ENV)
+    if not path:
+        return weights
+
+    with open(path, encoding="utf-8") as f:
+        overrides = json.load(f)
+
+    for model, config in overrides.items():
+        target = weights.setdefault(model, {"bias": 0.0, "terms": {}})
+        if "bias" in config:
+            target["bias"] = config["bias"]
+        for name, term in config.get("terms", {}).items():
+            target["terms"].setdefault(name, {}).update(term)
+    return weights
+
+
+WEIGHTS = load_weights()
+
+
 def normalize(value, min_val, max_val):
     try:
         return max(0.0, min(1.0, (value - min_val) / (max_val - min_val)))
@@ -5,33 +77,107 @@ def normalize(value, min_val, max_val):
         return 0.0
 
 
-def communication_score(features):
-    speech_rate = normalize(features.get("speech_rate", 120), 80, 180)
-    pause_ratio = normalize(features.get("pause_ratio", 0.2), 0.05, 0.4)
+# ---------------------------
+# Batch scoring (NumPy)
+# ---------------------------
+def _column(columns, name, default, n):
+    """One input column as an array; missing columns are filled with `default`."""
+    if name not in columns:
+        return np.full(n, default, dtype=object if isinstance(default, str) else np.float64)
+    values = columns[name]
+    return values.to_numpy() if hasattr(values, "to_numpy") else np.asarray(values)
 
-    w_speech = 0.6
-    w_pause = 0.4
-    bias = 0.1
 
-    score = (w_speech * speech_rate) + (w_pause * (1 - pause_ratio)) + bias
-    return round(score * 100, 2)
+def _num_rows(columns):
+    if hasattr(columns, "index"):
+        return len(columns.index)
+    for values in columns.values():
+        return len(values)
+    return 0
 
 
-def confidence_score(features):
-    pitch_var = normalize(features.get("pitch_variance", 20), 5, 40)
-    energy_map = {
-        "low": 0.3,
-        "medium": 0.6,
-        "medium-high": 0.8,
-        "high": 1.0
-    }
-    energy = energy_map.get(features.get("energy_level", "medium"), 0.6)
-    pause_ratio = normalize(features.get("pause_ratio", 0.2), 0.05, 0.4)
+def _as_float(values):
+    """
+    Numeric view of a column and a mask of the entries that are numbers
+    (None / non-numeric entries become NaN in the view).
+    """
+    if values.dtype.kind in "biuf":
+        return values.astype(np.float64), np.ones(len(values), dtype=bool)
+    numeric = np.array([isinstance(v, numbers.Real) for v in values], dtype=bool)
+    return np.array(
+        [v if ok else np.nan for v, ok in zip(values, numeric)],
+        dtype=np.float64
+    ), numeric
+
+
+def _term_values(columns, term, name, n):
+    if "levels" in term:
+        labels = _column(columns, name, term["default"], n).astype(str)
+        values = np.full(n, term["fallback"], dtype=np.float64)
+        for label, value in term["levels"].items():
+            values[labels == label] = value
+        return values
+
+    values, numeric = _as_float(_column(columns, name, term["default"], n))
+    if term["max"] == term["min"]:
+        norm = np.zeros(n)
+    else:
+        with np.errstate(invalid="ignore"):
+            norm = np.clip((values - term["min"]) / (term["max"] - term["min"]), 0.0, 1.0)
+    # Same as normalize(): NaN comes out of min(1.0, nan) as 1.0, while
+    # non-numbers and an empty range raise there and score 0
+    norm = np.where(numeric, np.nan_to_num(norm, nan=1.0), 0.0)
+    return 1 - norm if term.get("invert") else norm
+
+
+def _raw_scores(columns, model, weights=None, n=None):
+    config = (weights or WEIGHTS)[model]
+    n = _num_rows(columns) if n is None else n
+
+    score = None
+    for name, term in config["terms"].items():
+        part = term["weight"] * _term_values(columns, term, name, n)
+        score = part if score is None else score + part
+    if score is None:
+        score = np.zeros(n)
+    return (score + config["bias"]) * 100
+
+
+def score_batch(columns, model, weights=None, decimals=2):
+    """
+    Vectorized scores for many rows at once.
+
+    Args:
+        columns: dict of equal-length arrays / lists, or a pandas DataFrame
+        model: "communication" or "confidence" (any key of the weights config)
+        weights: weights config (defaults to WEIGHTS)
+
+    Returns:
+        float64 array of scores, rounded like the scalar functions
+    """
+    scores = _raw_scores(columns, model, weights)
+    return np.round(scores, decimals) if decimals is not None else scores
+
+
+def communication_scores(columns, weights=None):
+    return score_batch(columns, "communication", weights)
+
+
+def confidence_scores(columns, weights=None):
+    return score_batch(columns, "confidence", weights)
+
+
+# ---------------------------
+# Scalar API (one feature dict)
+# ---------------------------
+def _score_one(features, model, weights=None):
+    columns = {k: [v] for k, v in features.items()}
+    return round(float(_raw_scores(columns, model, weights, n=1)[0]), 2)
+
+
+def communication_score(features, weights=None):
+    return _score_one(features, "communication", weights)
 
-    w_pitch = 0.4
-    w_energy = 0.4
-    w_pause = 0.2
-    bias = 0.1
 
-    score = (w_pitch * pitch_var) + (w_energy * energy) + (w_pause * (1 - pause_ratio)) + bias
-    return round(score * 100, 2)
+def confidence_score(features, weights=None):
+    return _score_one(features, "confidence", weights)
@@ -0,0 +1,192 @@
+# backend/whisper_policy.py
+"""
+Whisper model tier selection.
+
+Picks tiny / base / small / medium per request from the clip duration, the
+number of requests currently in flight and an optional latency target, and
+keeps one loaded WhisperModel per tier so repeated requests don't reload
+weights.
+"""
+
+import threading
+from contextlib import contextmanager
+
+import soundfile as sf
+
+# ---------------------------
+# Policy configuration
+# ---------------------------
+
+# Smallest → largest. Selection never goes outside this list.
+WHISPER_TIERS = ["tiny", "base", "small", "medium"]
+
+DEFAULT_TIER = "small"      # Used when no latency target is given
+MAX_TIER = "medium"         # Upper bound when a latency target allows it
+DEVICE = "cpu"
+COMPUTE_TYPE = "int8"
+
+# Approximate real-time factor (processing sec / audio sec) per tier on CPU int8.
+# Tune these from `python -m benchmarks.bench_whisper_tiers`.
+TIER_RTF = {
+    "tiny": 0.04,
+    "base": 0.08,
+    "small": 0.25,
+    "medium": 0.70,
+}
+
+# Queue depth at which the default tier is capped
+QUEUE_DOWNSHIFT_DEPTH = 2          # cap at "base"
+QUEUE_DOWNSHIFT_TIER = "base"
+QUEUE_CRITICAL_DEPTH = 6           # cap at "tiny"
+QUEUE_CRITICAL_TIER = "tiny"
+
+
+# ---------------------------
+# In-flight request tracking
+# ---------------------------
+_inflight = 0
+_inflight_lock = threading.Lock()
+
+
+def queue_depth() -> int:
+    """Number of transcription requests currently in flight."""
+    return _inflight
+
+
+def other_requests() -> int:
+    """Requests in flight besides the caller's own (the depth tiers are picked with)."""
+    return max(queue_depth() - 1, 0)
+
+
+@contextmanager
+def track_request():
+    """Count a request as in flight for the duration of the block."""
+    global _inflight
+    with _inflight_lock:
+        _inflight += 1
+    try:
+        yield
+    finally:
+        with _inflight_lock:
+            _inflight -= 1
+
+
+# ---------------------------
+# Tier selection
+# ---------------------------
+def _cap(tier, ceiling):
+    return WHISPER_TIERS[min(WHISPER_TIERS.index(tier), WHISPER_TIERS.index(ceiling))]
+
+
+def predicted_latency(tier, duration_sec, depth=0):
+    """Estimated wall time for one request, assuming in-flight work shares the CPU."""
+    return duration_sec * TIER_RTF[tier] * (1 + depth)
+
+
+def select_model_tier(duration_sec, depth=None, latency_target=None):
+    """
+    Choose a Whisper tier for a clip.
+
+    Args:
+        duration_sec: Audio duration in seconds
+        depth: Requests in flight (excluding this one); defaults to the live count
+        latency_target: Optional per-request transcription budget in seconds
+
+    Returns:
+        Tuple of (tier, reason)
+    """
+    if depth is None:
+        depth = other_requests()
+
+    if latency_target is None:
+        tier, reason = DEFAULT_TIER, "default"
+    else:
+        # Largest tier whose predicted latency fits the target
+        candidates = WHISPER_TIERS[:WHISPER_TIERS.index(MAX_TIER) + 1]
+        tier, reason = candidates[0], "latency_target_unreachable"
+        for candidate in reversed(candidates):
+            if predicted_latency(candidate, duration_sec, depth) <= latency_target:
+                tier, reason = candidate, "latency_target"
+                break
+
+    if depth >= QUEUE_CRITICAL_DEPTH:
+        capped = _cap(tier, QUEUE_CRITICAL_TIER)
+    elif depth >= QUEUE_DOWNSHIFT_DEPTH:
+        capped = _cap(tier, QUEUE_DOWNSHIFT_TIER)
+    else:
+        capped = tier
+
+    if capped != tier:
+        return capped, "queue_depth"
+    return tier, reason
+
+
+def transcript_config(model_tier=None, cascade=False):
+    """
+    What a transcript depends on: the tier it was decoded with (or the
+    cascade) and the policy constants that pick tiers, so a transcript made
+    on a downshifted tier, or under an older policy, is not reused.
+    """
+    return {
+        "model_tier": None if cascade else model_tier,
+        "cascade": cascade,
+        "policy": {
+            "tiers": WHISPER_TIERS,
+            "default": DEFAULT_TIER,
+            "max": MAX_TIER,
+            "rtf": TIER_RTF,
+            "queue_caps": [
+                [QUEUE_DOWNSHIFT_DEPTH, QUEUE_DOWNSHIFT_TIER],
+                [QUEUE_CRITICAL_DEPTH, QUEUE_CRITICAL_TIER],
+            ],
+            "compute_type": COMPUTE_TYPE,
+            "cascade": [
+                CASCADE_FAST_TIER, CASCADE_SLOW_TIER,
+                CASCADE_LOGPROB_THRESHOLD, CASCADE_NO_SPEECH_THRESHOLD,
+            ] if cascade else None,
+        },
+    }
+
+
+def audio_duration(audio_file) -> float:
+    """Read the clip duration from the file header without decoding it."""
+    try:
+        return float(sf.info(audio_file).duration)
+    except Exception:
+        return 0.0
+
+
+# ---------------------------
+# Model cache (one per tier)
+# ---------------------------
+_models = {}
+_models_lock = threading.Lock()
+
+
+def get_whisper_model(tier=DEFAULT_TIER):
+    """Load a WhisperModel for `tier` once and reuse it."""
+    if tier not in WHISPER_TIERS:
+        raise ValueError(f"Unknown Whisper tier: {tier}")
+
+    with _models_lock:
+        if tier not in _models:
+            from faster_whisper import WhisperModel
+            _models[tier] = WhisperModel(
+                tier,
+                device=DEVICE,
+                compute_type=COMPUTE_TYPE
+            )
+        return _models[tier]
+
+
+# ---------------------------
+# Cascade decoding
+# ---------------------------
+
+# First pass runs the fast tier; low-confidence segments are re-decoded
+# with the slow tier and spliced back in.
+CASCADE_FAST_TIER = "base"
+CASCADE_SLOW_TIER = "medium"
+CASCADE_LOGPROB_THRESHOLD = -0.7     # re-decode if avg_logprob is below this
+CASCADE_NO_SPEECH_THRESHOLD = 0.5    # ...or no_speech_prob is above this
+CASCADE_MIN_MEASURED_SEC = 5.0       # below this, estimate slow-tier RTF from TIER_RTF
@@ -0,0 +1,189 @@
+# backend/word_timings.py
+"""
+Compact word timings.
+
+A transcript's words are stored as three parallel NumPy arrays (word id,
+start, end) plus one shared string table, instead of one dict per word.
+Iterating, indexing or calling to_list() still gives the familiar
+{"word", "start", "end"} dicts for JSON output, while rate and gap
+statistics run vectorized over the arrays.
+"""
+
+import numpy as np
+
+
+class WordTimings:
+    """
+    Usage:
+        words = WordTimings.from_segments(segment_data)
+        len(words), words[0], words.to_list()
+        words.per_window_wpm(window_sec=10)
+        words.gap_stats()
+    """
+
+    __slots__ = ("vocab", "word_ids", "start", "end")
+
+    def __init__(self, vocab=None, word_ids=None, start=None, end=None):
+        self.vocab = list(vocab or [])
+        self.word_ids = np.asarray(word_ids if word_ids is not None else [], dtype=np.int32)
+        self.start = np.asarray(start if start is not None else [], dtype=np.float32)
+        self.end = np.asarray(end if end is not None else [], dtype=np.float32)
+
+    # ---------------------------
+    # Construction
+    # ---------------------------
+    @classmethod
+    def from_segments(cls, segment_data):
+        """Spread each segment's duration evenly over its words."""
+        vocab, lookup = [], {}
+        ids, counts, seg_start, seg_end = [], [], [], []
+
+        for seg in segment_data:
+            tokens = seg["text"].strip().split()
+            if not tokens:
+                continue
+            for token in tokens:
+                idx = lookup.get(token)
+                if idx is None:
+                    idx = lookup[token] = len(vocab)
+                    vocab.append(token)
+                ids.append(idx)
+            counts.append(len(tokens))
+            seg_start.append(seg["start"])
+            seg_end.append(seg["end"])
+
+        if not counts:
+            return cls()
+
+        counts = np.asarray(counts)
+        seg_start = np.asarray(seg_start, dtype=np.float64)
+        avg = (np.asarray(seg_end, dtype=np.float64) - seg_start) / counts
+
+        # Position of every word inside its segment: 0, 1, ..., n-1 per segment
+        first = np.repeat(np.cumsum(counts) - counts, counts)
+        position = np.arange(counts.sum()) - first
+
+        start = np.repeat(seg_start, counts) + position * np.repeat(avg, counts)
+        end = start + np.repeat(avg, counts)
+        return cls(vocab, ids, np.round(start, 2), np.round(end, 2))
+
+    @classmethod
+    def from_list(cls, words):
+        """Build from {"word", "start", "end"} dicts (or another WordTimings)."""
+        if isinstance(words, cls):
+            return words
+        vocab, lookup, ids = [], {}, []
+        for w in words:
+            idx = lookup.get(w["word"])
+            if idx is None:
+                idx = lookup[w["word"]] = len(vocab)
+                vocab.append(w["word"])
+            ids.append(idx)
+        return cls(
+            vocab, ids,
+            [w["start"] for w in words],
+            [w["end"] for w in words],
+        )
+
+    @classmethod
+    def concat(cls, parts):
+        """Join several timings (e.g. per-chunk) into one, merging string tables."""
+        vocab, lookup = [], {}
+        ids, starts, ends = [], [], []
+        for part in parts:
+            remap = np.empty(len(part.vocab), dtype=np.int32)
+            for i, token in enumerate(part.vocab):
+                idx = lookup.get(token)
+                if idx is None:
+                    idx = lookup[token] = len(vocab)
+                    vocab.append(token)
+                remap[i] = idx
+            ids.append(remap[part.word_ids] if len(part.word_ids) else part.word_ids)
+            starts.append(part.start)
+            ends.append(part.end)
+        if not ids:
+            return cls()
+        return cls(vocab, np.concatenate(ids), np.concatenate(starts), np.concatenate(ends))
+
+    def shift(self, offset):
+        """Same words with every timestamp moved by `offset` seconds."""
+        return WordTimings(self.vocab, self.word_ids, self.start + offset, self.end + offset)
+
+    # ---------------------------
+    # Dict-compatible view
+    # ---------------------------
+    def __len__(self):
+        return len(self.word_ids)
+
+    def _entry(self, i):
+        return {
+            "word": self.vocab[self.word_ids[i]],
+            "start": round(float(self.start[i]), 2),
+            "end": round(float(self.end[i]), 2),
+        }
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return WordTimings(self.vocab, self.word_ids[key], self.start[key], self.end[key])
+        return self._entry(key)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._entry(i)
+
+    def to_list(self):
+        """JSON-ready list of {"word", "start", "end"} dicts."""
+        words = [self.vocab[i] for i in self.word_ids.tolist()]
+        starts = np.round(self.start.astype(np.float64), 2).tolist()
+        ends = np.round(self.end.astype(np.float64), 2).tolist()
+        return [
+            {"word": w, "start": s, "end": e}
+            for w, s, e in zip(words, starts, ends)
+        ]
+
+    @property
+    def words(self):
+        return [self.vocab[i] for i in self.word_ids.tolist()]
+
+    # ---------------------------
+    # Vectorized statistics
+    # ---------------------------
+    def midpoints(self):
+        return (self.start.astype(np.float64) + self.end) / 2
+
+    def window_counts(self, window_sec, n_windows=None):
+        """Words per fixed window, binned by word midpoint."""
+        if n_windows is None:
+            n_windows = int(np.ceil(float(self.end.max()) / window_sec)) if len(self) else 0
+        n_windows = max(1, n_windows)
+        if not len(self):
+            return np.zeros(n_windows)
+        bins = np.clip((self.midpoints() / window_sec).astype(int), 0, n_windows - 1)
+        return np.bincount(bins, minlength=n_windows).astype(np.float64)
+
+    def per_window_wpm(self, window_sec=10.0, n_windows=None):
+        """Speaking rate (words per minute) in consecutive windows."""
+        return self.window_counts(window_sec, n_windows) * (60.0 / window_sec)
+
+    def gaps(self):
+        """Silence between consecutive words (sec, never negative)."""
+        if len(self) < 2:
+            return np.zeros(0)
+        return np.maximum(self.start[1:].astype(np.float64) - self.end[:-1], 0.0)
+
+    def gap_stats(self, long_gap_sec=1.0):
+        """Summary of inter-word gaps; `long_gaps` counts gaps of at least `long_gap_sec`."""
+        gaps = self.gaps()
+        if not len(gaps):
+            return {"count": 0, "mean": 0.0, "median": 0.0, "p90": 0.0, "max": 0.0, "long_gaps": 0}
+        return {
+            "count": int(len(gaps)),
+            "mean": round(float(gaps.mean()), 3),
+            "median": round(float(np.median(gaps)), 3),
+            "p90": round(float(np.percentile(gaps, 90)), 3),
+            "max": round(float(gaps.max()), 3),
+            "long_gaps": int((gaps >= long_gap_sec).sum()),
+        }
+
+    def __repr__(self):
+        return f"WordTimings({len(self)} words, {len(self.vocab)} unique)"